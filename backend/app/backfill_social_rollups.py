@@ -0,0 +1,32 @@
+"""
+Rebuild social_post_rollups from social_posts
+
+Usage (from backend/):
+    python -m app.backfill_social_rollups            # everything
+    python -m app.backfill_social_rollups --days 30  # only the last 30 days
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from .database import engine, Base
+from .models.social import SocialRollup
+from .services.social_rollup import social_rollups
+
+
+def run_backfill(days: int = None):
+    Base.metadata.create_all(bind=engine, tables=[SocialRollup.__table__])
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        rows = social_rollups.backfill(conn, since)
+    print(f"Wrote {rows} rollup rows in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild hourly social post rollups")
+    parser.add_argument("--days", type=int, default=None, help="Only rebuild this many recent days")
+    args = parser.parse_args()
+    run_backfill(args.days)
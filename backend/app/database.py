@@ -1,4 +1,6 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
@@ -32,12 +34,100 @@ SessionLocal = None
 if engine:
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+
+def async_database_url(url: str) -> str:
+    """Map a sync database URL onto its async driver (asyncpg / aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+asyncpg")
+        # asyncpg takes ssl=<mode> rather than libpq's sslmode=<mode>
+        if "sslmode" in parsed.query:
+            query = dict(parsed.query)
+            query["ssl"] = query.pop("sslmode")
+            parsed = parsed.set(query=query)
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+
+# Create async engine when DATABASE_ASYNC is enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.database_async:
+    try:
+        async_url = async_database_url(settings.database_url)
+        connect_args = {"timeout": 10} if async_url.startswith("postgresql") else {}
+        async_engine = create_async_engine(
+            async_url,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            connect_args=connect_args
+        )
+        # Keep attributes loaded after commit; expired attributes cannot lazy-load under asyncio
+        AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+        logger.info("Async database engine created successfully")
+    except Exception as e:
+        logger.error(f"Failed to create async database engine: {e}")
+
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session"""
+class SyncSessionAdapter:
+    """Exposes a sync Session through the AsyncSession methods the routers use.
+
+    Queries still run on the event loop thread, exactly as before the async
+    port; this keeps the sync path selectable with DATABASE_ASYNC=false.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    async def execute(self, statement, params=None, **kwargs):
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return self.sync_session.scalar(statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        return self.sync_session.scalars(statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return self.sync_session.get(entity, ident, **kwargs)
+
+    async def refresh(self, instance, attribute_names=None):
+        self.sync_session.refresh(instance, attribute_names)
+
+    async def flush(self):
+        self.sync_session.flush()
+
+    async def commit(self):
+        self.sync_session.commit()
+
+    async def rollback(self):
+        self.sync_session.rollback()
+
+    async def close(self):
+        self.sync_session.close()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return fn(self.sync_session, *args, **kwargs)
+
+
+def get_sync_db():
+    """Plain sync Session generator, for scripts and background jobs"""
     if engine is None:
         raise Exception("Database not initialized. Check DATABASE_URL environment variable.")
     db = SessionLocal()
@@ -47,3 +137,33 @@ def get_db():
         db.close()
 
 
+async def get_db():
+    """Dependency to get database session (AsyncSession, or sync Session behind an adapter)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    if engine is None:
+        raise Exception("Database not initialized. Check DATABASE_URL environment variable.")
+    db = SessionLocal()
+    try:
+        yield SyncSessionAdapter(db)
+    finally:
+        db.close()
+
+
+def dialect_insert(db, model):
+    """Dialect insert() with ON CONFLICT support (PostgreSQL/SQLite), else None.
+
+    db may be a Session, AsyncSession or Connection.
+    """
+    bind = db.get_bind() if hasattr(db, "get_bind") else db
+    dialect = bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
@@ -13,6 +13,14 @@ except ImportError as e:
     logger.error(f"Failed to import routers: {e}")
     raise
 
+from .services.signature_counter import signature_counter
+from .services.representative_stats import representative_stats
+from .services.search_service import search_service
+from .services.http_client import http_clients
+from .services.password_service import password_service
+from .services.html_parser import html_parser
+from .services.page_cache import page_cache
+
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
@@ -56,6 +64,24 @@ except Exception as e:
     raise
 
 
+@app.on_event("startup")
+async def start_background_workers():
+    await http_clients.start()
+    await signature_counter.start()
+    await representative_stats.start()
+    await search_service.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await signature_counter.stop()
+    await representative_stats.stop()
+    await password_service.stop()
+    await html_parser.stop()
+    await http_clients.close()
+    page_cache.close()
+
+
 @app.get("/")
 async def root():
     return {
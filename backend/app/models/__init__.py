@@ -1,7 +1,7 @@
 from .user import User
 from .representative import Representative, ContactInfo, State, Lga
-from .petition import Petition, Signature, PetitionTimeline, PetitionResponse
-from .social import SocialPost, SocialDigest
+from .petition import Petition, Signature, PetitionTimeline, PetitionResponse, PetitionCounterShard
+from .social import SocialPost, SocialDigest, SocialRollup, SocialPollCheckpoint, SocialDigestPost
 from .legal_document import LegalDocument
 
 __all__ = [
@@ -14,8 +14,12 @@ __all__ = [
     "Signature",
     "PetitionTimeline",
     "PetitionResponse",
+    "PetitionCounterShard",
     "SocialPost",
     "SocialDigest",
+    "SocialRollup",
+    "SocialPollCheckpoint",
+    "SocialDigestPost",
     "LegalDocument"
 ]
 
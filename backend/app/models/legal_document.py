@@ -1,10 +1,30 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ARRAY
+from sqlalchemy import Column, Integer, String, Text, DateTime, ARRAY, Computed, Index, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from ..database import Base
 
 
+# array_to_string is only STABLE, so generated columns need an IMMUTABLE wrapper
+LEGAL_TAGS_TEXT_FUNCTION = DDL(
+    "CREATE OR REPLACE FUNCTION legal_tags_text(tags varchar[]) RETURNS text "
+    "LANGUAGE sql IMMUTABLE AS $$ SELECT coalesce(array_to_string(tags, ' '), '') $$"
+)
+
+# Heading outranks tags and section labels, which outrank body text
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(heading, '')), 'A') || "
+    "setweight(to_tsvector('english', legal_tags_text(tags)), 'B') || "
+    "setweight(to_tsvector('english', coalesce(chapter, '') || ' ' || coalesce(section, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'C')"
+)
+
+
 class LegalDocument(Base):
     __tablename__ = "legal_documents"
+    __table_args__ = (
+        Index("ix_legal_documents_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -13,9 +33,15 @@ class LegalDocument(Base):
     heading = Column(String(255), nullable=True)
     content = Column(Text, nullable=False)
     tags = Column(ARRAY(String(50)), nullable=True)
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     def __repr__(self):
         return f"<LegalDocument {self.title} - {self.chapter} {self.section}>"
 
 
+event.listen(
+    LegalDocument.__table__,
+    "before_create",
+    LEGAL_TAGS_TEXT_FUNCTION.execute_if(dialect="postgresql")
+)
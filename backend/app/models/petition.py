@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -41,6 +41,10 @@ class TimelineEventType(str, enum.Enum):
 
 class Petition(Base):
     __tablename__ = "petitions"
+    __table_args__ = (
+        # Keyset pagination on (created_at, id)
+        Index("ix_petitions_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -82,6 +86,11 @@ class Petition(Base):
 
 class Signature(Base):
     __tablename__ = "signatures"
+    __table_args__ = (
+        # One signature per user per petition, enforced by the database so
+        # concurrent sign requests cannot double count.
+        UniqueConstraint("petition_id", "user_id", name="uq_signatures_petition_user"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     petition_id = Column(Integer, ForeignKey("petitions.id"), nullable=False)
@@ -138,3 +147,15 @@ class PetitionResponse(Base):
     def __repr__(self):
         return f"<PetitionResponse petition={self.petition_id}>"
 
+
+
+class PetitionCounterShard(Base):
+    """Pending signature increments spread across slots to avoid a hot row"""
+    __tablename__ = "petition_counter_shards"
+
+    petition_id = Column(Integer, ForeignKey("petitions.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<PetitionCounterShard petition={self.petition_id} shard={self.shard} count={self.count}>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -57,6 +57,10 @@ class Lga(Base):
 
 class Representative(Base):
     __tablename__ = "representatives"
+    __table_args__ = (
+        # Keyset pagination on (name, id)
+        Index("ix_representatives_name_id", "name", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
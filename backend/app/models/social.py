@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Float, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, Text, ForeignKey, Float, Index, PrimaryKeyConstraint, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -20,6 +20,12 @@ class Sentiment(str, enum.Enum):
 
 class SocialPost(Base):
     __tablename__ = "social_posts"
+    __table_args__ = (
+        # Keyset pagination on (posted_at, id)
+        Index("ix_social_posts_posted_at_id", "posted_at", "id"),
+        # One representative's posts in a period, in (posted_at, id) order (digests)
+        Index("ix_social_posts_rep_posted_at_id", "representative_id", "posted_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -60,6 +66,45 @@ class SocialPost(Base):
         return f"<SocialPost {self.platform.value} {self.platform_id}>"
 
 
+class SocialRollup(Base):
+    """Hourly post counts, maintained incrementally by services/social_rollup.py"""
+    __tablename__ = "social_post_rollups"
+    __table_args__ = (
+        PrimaryKeyConstraint("hour", "representative_id", "platform", "sentiment"),
+        # Per-representative windows scan only that representative's hours
+        Index("ix_social_post_rollups_rep_hour", "representative_id", "hour"),
+    )
+
+    hour = Column(DateTime(timezone=True), nullable=False)
+    # 0 = no representative identified (key columns cannot be NULL)
+    representative_id = Column(Integer, nullable=False, default=0)
+    platform = Column(SQLEnum(Platform), nullable=False)
+    # Sentiment value, or "NONE" until the post has been analysed
+    sentiment = Column(String(20), nullable=False)
+    post_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<SocialRollup {self.hour} rep={self.representative_id} {self.platform.value} {self.sentiment}>"
+
+
+class SocialPollCheckpoint(Base):
+    """Highest tweet id stored per search query / handle; the next poll asks for since_id"""
+    __tablename__ = "social_poll_checkpoints"
+    __table_args__ = (
+        PrimaryKeyConstraint("kind", "key"),
+    )
+
+    kind = Column(String(20), nullable=False)  # "query" or "handle"
+    key = Column(String(512), nullable=False)  # search query, or lowercased handle
+    since_id = Column(BigInteger, nullable=True)
+    # Resolved account id for handles, so polls skip the username lookup
+    user_id = Column(String(32), nullable=True)
+    last_polled_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<SocialPollCheckpoint {self.kind} {self.key} since={self.since_id}>"
+
+
 class SocialDigest(Base):
     __tablename__ = "social_digests"
 
@@ -88,3 +133,15 @@ class SocialDigest(Base):
         return f"<SocialDigest rep={self.representative_id} {self.period_start.date()}>"
 
 
+class SocialDigestPost(Base):
+    """Membership of a post in a digest, written when the digest is built"""
+    __tablename__ = "social_digest_posts"
+    __table_args__ = (
+        PrimaryKeyConstraint("digest_id", "post_id"),
+    )
+
+    digest_id = Column(Integer, ForeignKey("social_digests.id", ondelete="CASCADE"), nullable=False)
+    post_id = Column(Integer, ForeignKey("social_posts.id", ondelete="CASCADE"), nullable=False)
+
+    def __repr__(self):
+        return f"<SocialDigestPost digest={self.digest_id} post={self.post_id}>"
@@ -28,6 +28,8 @@ class User(Base):
     role = Column(SQLEnum(UserRole), default=UserRole.CITIZEN)
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
+    # Bumped to revoke issued tokens (deactivation, role change, password reset)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
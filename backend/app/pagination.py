@@ -0,0 +1,92 @@
+"""
+Keyset (cursor) pagination helpers for Voice2Gov list endpoints
+- Opaque cursors encoding the sort key of the last row on a page
+- Seek predicates on (sort column, id) instead of OFFSET
+- Planner row estimates in place of exact COUNT(*)
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from sqlalchemy import DateTime, Select, select, func, tuple_, text
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode sort-key values as an opaque URL-safe cursor"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError("Invalid cursor")
+
+    decoded = []
+    for column, value in zip(columns, values):
+        if value is not None and isinstance(column.type, DateTime):
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+        decoded.append(value)
+    return decoded
+
+
+def keyset_filter(
+    stmt: Select,
+    columns: List[Any],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True
+) -> Select:
+    """Seek past cursor and order by columns, fetching one extra row.
+
+    columns must end in a unique column (the primary key) so the ordering is
+    total. Raises ValueError for a malformed cursor.
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        if descending:
+            stmt = stmt.where(tuple_(*columns) < tuple_(*values))
+        else:
+            stmt = stmt.where(tuple_(*columns) > tuple_(*values))
+
+    order = [c.desc() for c in columns] if descending else [c.asc() for c in columns]
+    return stmt.order_by(*order).limit(limit + 1)
+
+
+def keyset_result(rows: List[Any], columns: List[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the extra row fetched by keyset_filter and build the next cursor"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, c.key) for c in columns])
+    return rows, next_cursor
+
+
+async def count_rows(db, stmt: Select) -> int:
+    """Exact COUNT(*) of a select's rows"""
+    return await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+
+async def estimated_count(db, table_name: str) -> Optional[int]:
+    """Planner row estimate for a whole table (PostgreSQL only)"""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    estimate = await db.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table_name}
+    )
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
@@ -1,20 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from ..database import get_db
 from ..config import settings
 from ..models.user import User, UserRole
+from ..services.password_service import password_service, PasswordServiceOverloaded
+from ..services.principal_cache import principal_cache, Principal
 
 router = APIRouter()
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = password_service.context
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
 
@@ -61,6 +63,14 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def overloaded_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=15))
@@ -70,8 +80,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> Principal:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,23 +90,38 @@ async def get_current_user(
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
         email: str = payload.get("sub")
+        user_id: Optional[int] = payload.get("uid")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    if user_id is None:
+        # Tokens issued before uid/ver were added: look up by email until they expire
+        user = await db.scalar(select(User).where(User.email == email))
+        if user is None or not user.is_active:
+            raise credentials_exception
+        return Principal.from_user(user)
+    
+    principal = await principal_cache.get(user_id)
+    if principal is None:
+        user = await db.get(User, user_id)
+        if user is None:
+            raise credentials_exception
+        principal = Principal.from_user(user)
+        await principal_cache.set(principal)
+    
+    if principal.token_version != payload.get("ver", 0) or not principal.is_active:
         raise credentials_exception
-    return user
+    return principal
 
 
 # Routes
 @router.post("/signup", response_model=UserResponse)
-async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """Register a new user"""
     # Check if email exists
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User.id).where(User.email == user_data.email)):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
@@ -104,16 +129,24 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     
     # Check if phone exists (if provided)
     if user_data.phone:
-        if db.query(User).filter(User.phone == user_data.phone).first():
+        if await db.scalar(select(User.id).where(User.phone == user_data.phone)):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Phone number already registered"
             )
     
+    # Release the pooled connection while bcrypt runs
+    await db.rollback()
+    
+    try:
+        password_hash = await password_service.hash(user_data.password)
+    except PasswordServiceOverloaded:
+        raise overloaded_exception()
+    
     # Create user
     user = User(
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=password_hash,
         name=user_data.name,
         phone=user_data.phone,
         state=user_data.state,
@@ -121,8 +154,8 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     
     return user
 
@@ -130,12 +163,25 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Login and get access token"""
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = (await db.execute(
+        select(User.id, User.email, User.password_hash, User.is_active, User.token_version)
+        .where(User.email == form_data.username)
+    )).first()
+    
+    # Release the pooled connection while bcrypt runs
+    await db.rollback()
+    
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await password_service.verify(form_data.password, user.password_hash)
+        except PasswordServiceOverloaded:
+            raise overloaded_exception()
     
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -148,12 +194,15 @@ async def login(
             detail="User account is disabled"
         )
     
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
+    # Update last login, upgrading the stored hash if the bcrypt cost changed
+    values = {"last_login": datetime.utcnow()}
+    if new_hash:
+        values["password_hash"] = new_hash
+    await db.execute(update(User).where(User.id == user.id).values(**values))
+    await db.commit()
     
     access_token = create_access_token(
-        data={"sub": user.email},
+        data={"sub": user.email, "uid": user.id, "ver": user.token_version},
         expires_delta=timedelta(minutes=settings.access_token_expire_minutes)
     )
     
@@ -161,7 +210,7 @@ async def login(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: Principal = Depends(get_current_user)):
     """Get current user information"""
     return current_user
 
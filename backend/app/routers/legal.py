@@ -1,11 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from ..database import get_db
 from ..models.legal_document import LegalDocument
-from ..services.openai_service import openai_service
+from ..models.user import UserRole
+from ..routers.auth import get_current_user
+from ..services.principal_cache import Principal
+from ..services.openai_service import openai_service, CONSTITUTION_FALLBACK_ANSWER
+from ..services.answer_cache import answer_cache
 
 router = APIRouter(tags=["Constitution"])
 
@@ -15,25 +19,24 @@ class ConstitutionQuery(BaseModel):
 
 
 @router.post("/constitution")
-async def constitution_lookup(payload: ConstitutionQuery, db: Session = Depends(get_db)):
+async def constitution_lookup(payload: ConstitutionQuery, db: AsyncSession = Depends(get_db)):
     question = payload.question.strip()
     if not question:
         raise HTTPException(status_code=400, detail="Question cannot be empty")
 
+    # search_vector is a stored, weighted tsvector backed by a GIN index
     ts_query = func.plainto_tsquery("english", question)
-    docs = (
-        db.query(LegalDocument)
-        .filter(
-            func.to_tsvector("english", LegalDocument.content).match(ts_query)
-            | func.to_tsvector("english", LegalDocument.heading).match(ts_query)
-        )
+    rank = func.ts_rank_cd(LegalDocument.search_vector, ts_query)
+    docs = (await db.scalars(
+        select(LegalDocument)
+        .where(LegalDocument.search_vector.op("@@")(ts_query))
+        .order_by(rank.desc(), LegalDocument.id)
         .limit(5)
-        .all()
-    )
+    )).all()
 
     if not docs:
         # fallback to retrieving some chapters
-        docs = db.query(LegalDocument).limit(3).all()
+        docs = (await db.scalars(select(LegalDocument).limit(3))).all()
 
     sections = [
         {
@@ -48,12 +51,27 @@ async def constitution_lookup(payload: ConstitutionQuery, db: Session = Depends(
         for doc in docs
     ]
 
-    answer = await openai_service.summarize_constitution(question, sections)
+    section_ids = [section["id"] for section in sections]
+    answer = await answer_cache.get(question, section_ids)
+    cached = answer is not None
+    if not cached:
+        answer = await openai_service.summarize_constitution(question, sections)
+        if answer != CONSTITUTION_FALLBACK_ANSWER:
+            await answer_cache.set(question, section_ids, answer)
 
     return {
         "question": question,
         "answer": answer,
         "sections": sections,
+        "cached": cached,
     }
 
 
+@router.get("/constitution/cache")
+async def constitution_cache_stats(current_user: Principal = Depends(get_current_user)):
+    """Answer cache hit/miss counters (admins only)"""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return await answer_cache.stats()
+
+
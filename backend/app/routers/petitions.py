@@ -1,13 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
 from ..database import get_db
-from ..models.petition import Petition, Signature, PetitionTimeline, PetitionResponse, PetitionStatus, PetitionCategory, TimelineEventType
-from ..models.user import User
+from ..pagination import keyset_filter, keyset_result, count_rows, estimated_count
+from ..models.petition import Petition, PetitionTimeline, PetitionResponse, PetitionStatus, PetitionCategory, TimelineEventType
 from ..routers.auth import get_current_user
+from ..services.principal_cache import Principal
+from ..services.signing_service import signing_service
+from ..services.signature_counter import signature_counter
+from ..services.search_service import search_service
 
 router = APIRouter()
 
@@ -98,8 +104,8 @@ class PetitionDetail(BaseModel):
 @router.post("/", response_model=dict)
 async def create_petition(
     petition_data: PetitionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new petition"""
     
@@ -113,19 +119,20 @@ async def create_petition(
     )
     
     db.add(petition)
-    db.commit()
-    db.refresh(petition)
+    await db.commit()
+    await db.refresh(petition)
+    petition_id = petition.id
     
     # Add creation event to timeline
     timeline_event = PetitionTimeline(
-        petition_id=petition.id,
+        petition_id=petition_id,
         event_type=TimelineEventType.CREATED,
         description="Petition created"
     )
     db.add(timeline_event)
-    db.commit()
+    await db.commit()
     
-    return {"id": petition.id, "message": "Petition created successfully"}
+    return {"id": petition_id, "message": "Petition created successfully"}
 
 
 @router.get("/", response_model=dict)
@@ -135,31 +142,59 @@ async def list_petitions(
     search: Optional[str] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass empty for the first page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """List petitions with filtering and pagination"""
     
-    query = db.query(Petition).options(
-        joinedload(Petition.target_representative),
-        joinedload(Petition.creator)
-    )
+    stmt = select(Petition)
     
     # Apply filters
     if category:
-        query = query.filter(Petition.category == category)
+        stmt = stmt.where(Petition.category == category)
     
     if status:
-        query = query.filter(Petition.status == status)
+        stmt = stmt.where(Petition.status == status)
     
+    rank = None
     if search:
-        query = query.filter(Petition.title.ilike(f"%{search}%"))
+        stmt, rank = await search_service.filter_petitions(db, stmt, search)
     
-    # Get total
-    total = query.count()
+    options = (joinedload(Petition.target_representative), joinedload(Petition.creator))
     
-    # Paginate
-    offset = (page - 1) * limit
-    petitions = query.order_by(Petition.created_at.desc()).offset(offset).limit(limit).all()
+    if cursor is not None:
+        # Keyset mode: seek on (created_at, id), no exact count
+        columns = [Petition.created_at, Petition.id]
+        try:
+            page_stmt = keyset_filter(stmt.options(*options), columns, cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        petitions, next_cursor = keyset_result((await db.scalars(page_stmt)).all(), columns, limit)
+        filtered = bool(category or status or search)
+        pagination = {
+            "limit": limit,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None,
+            "estimatedTotal": None if filtered else await estimated_count(db, Petition.__tablename__)
+        }
+    else:
+        # Get total
+        total = await count_rows(db, stmt)
+        
+        # Paginate
+        offset = (page - 1) * limit
+        order = [Petition.created_at.desc()] if rank is None else [rank.desc(), Petition.created_at.desc()]
+        page_stmt = stmt.options(*options).order_by(*order).offset(offset).limit(limit)
+        petitions = (await db.scalars(page_stmt)).all()
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": (total + limit - 1) // limit
+        }
+    
+    # Include increments not yet folded in by a sharded/buffered counter
+    pending = await db.run_sync(signature_counter.pending_counts, [p.id for p in petitions])
     
     petition_list = []
     for p in petitions:
@@ -168,7 +203,7 @@ async def list_petitions(
             "title": p.title,
             "category": p.category,
             "status": p.status,
-            "signatureCount": p.signature_count,
+            "signatureCount": (p.signature_count or 0) + pending.get(p.id, 0),
             "signatureGoal": p.signature_goal,
             "targetRepresentativeName": p.target_representative.name if p.target_representative else "Unknown",
             "creatorName": p.creator.name if p.creator else "Anonymous",
@@ -177,36 +212,34 @@ async def list_petitions(
     
     return {
         "petitions": petition_list,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
+        "pagination": pagination
     }
 
 
 @router.get("/{petition_id}")
-async def get_petition(petition_id: int, db: Session = Depends(get_db)):
+async def get_petition(petition_id: int, db: AsyncSession = Depends(get_db)):
     """Get petition details"""
     
-    petition = db.query(Petition).options(
+    result = await db.execute(select(Petition).options(
         joinedload(Petition.target_representative),
         joinedload(Petition.creator),
         joinedload(Petition.timeline),
         joinedload(Petition.responses)
-    ).filter(Petition.id == petition_id).first()
+    ).where(Petition.id == petition_id))
+    petition = result.unique().scalars().first()
     
     if not petition:
         raise HTTPException(status_code=404, detail="Petition not found")
     
+    pending = await db.run_sync(signature_counter.pending_counts, [petition.id])
+    
     return {
         "id": petition.id,
         "title": petition.title,
         "description": petition.description,
         "category": petition.category,
         "status": petition.status,
-        "signatureCount": petition.signature_count,
+        "signatureCount": (petition.signature_count or 0) + pending.get(petition.id, 0),
         "signatureGoal": petition.signature_goal,
         "targetRepresentativeId": petition.target_representative_id,
         "targetRepresentativeName": petition.target_representative.name if petition.target_representative else "Unknown",
@@ -245,60 +278,22 @@ async def get_petition(petition_id: int, db: Session = Depends(get_db)):
 async def sign_petition(
     petition_id: int,
     signature_data: SignatureCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """Sign a petition"""
     
-    petition = db.query(Petition).filter(Petition.id == petition_id).first()
-    if not petition:
-        raise HTTPException(status_code=404, detail="Petition not found")
-    
-    # Check if already signed
-    existing = db.query(Signature).filter(
-        Signature.petition_id == petition_id,
-        Signature.user_id == current_user.id
-    ).first()
-    
-    if existing:
-        raise HTTPException(status_code=400, detail="You have already signed this petition")
-    
-    # Create signature
-    signature = Signature(
+    result = await db.run_sync(
+        signing_service.sign,
         petition_id=petition_id,
         user_id=current_user.id,
         comment=signature_data.comment,
         is_anonymous=signature_data.is_anonymous
     )
     
-    db.add(signature)
-    
-    # Update signature count
-    petition.signature_count += 1
-    
-    # Check milestones
-    milestones = [100, 500, 1000, 5000, 10000]
-    for milestone in milestones:
-        if petition.signature_count == milestone:
-            timeline_event = PetitionTimeline(
-                petition_id=petition_id,
-                event_type=TimelineEventType.SIGNATURE_MILESTONE,
-                description=f"Petition reached {milestone} signatures!"
-            )
-            db.add(timeline_event)
-    
-    # Check if threshold reached
-    if petition.signature_count >= petition.signature_goal and petition.status == PetitionStatus.ACTIVE:
-        petition.status = PetitionStatus.THRESHOLD_REACHED
-        timeline_event = PetitionTimeline(
-            petition_id=petition_id,
-            event_type=TimelineEventType.THRESHOLD_REACHED,
-            description=f"Petition reached {petition.signature_goal} signatures! Ready to be sent."
-        )
-        db.add(timeline_event)
-    
-    db.commit()
+    if not result["signed"]:
+        if result["reason"] == "already_signed":
+            raise HTTPException(status_code=400, detail="You have already signed this petition")
+        raise HTTPException(status_code=404, detail="Petition not found")
     
-    return {"message": "Petition signed successfully", "signatureCount": petition.signature_count}
-
-
+    return {"message": "Petition signed successfully", "signatureCount": result["signature_count"]}
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
 
 from ..database import get_db
+from ..pagination import keyset_filter, keyset_result, count_rows
 from ..models.representative import Representative, ContactInfo, State, Lga, Chamber, ContactType
+from ..services.representative_stats import representative_stats
+from ..services.search_service import search_service
 
 router = APIRouter()
 
@@ -211,53 +215,64 @@ async def list_representatives(
     search: Optional[str] = Query(None, description="Search by name or constituency"),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass empty for the first page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """List representatives with filtering and pagination"""
     
-    query = db.query(Representative).filter(Representative.is_active == True)
-    query = query.options(joinedload(Representative.state), joinedload(Representative.lga))
+    stmt = select(Representative).where(Representative.is_active == True)
     
     # Apply filters
     if state:
-        query = query.join(State).filter(State.name.ilike(f"%{state}%"))
+        stmt = stmt.join(State).where(State.name.ilike(f"%{state}%"))
     
     if lga:
-        query = query.join(Lga).filter(Lga.name.ilike(f"%{lga}%"))
+        stmt = stmt.join(Lga).where(Lga.name.ilike(f"%{lga}%"))
     
     if chamber:
-        query = query.filter(Representative.chamber == chamber)
+        stmt = stmt.where(Representative.chamber == chamber)
     
     if party:
-        query = query.filter(Representative.party.ilike(f"%{party}%"))
+        stmt = stmt.where(Representative.party.ilike(f"%{party}%"))
     
+    rank = None
     if search:
-        query = query.filter(
-            or_(
-                Representative.name.ilike(f"%{search}%"),
-                Representative.constituency.ilike(f"%{search}%"),
-                Representative.senatorial_district.ilike(f"%{search}%")
-            )
-        )
+        stmt, rank = await search_service.filter_representatives(db, stmt, search)
     
-    # Get total count
-    total = query.count()
+    # Get stats (filter-independent, served from cache)
+    stats = StatsResponse(**await db.run_sync(representative_stats.get_stats))
     
-    # Get stats
-    all_reps = db.query(Representative).filter(Representative.is_active == True)
-    stats = StatsResponse(
-        total=all_reps.count(),
-        senators=all_reps.filter(Representative.chamber == Chamber.SENATE).count(),
-        house_reps=all_reps.filter(Representative.chamber == Chamber.HOUSE_OF_REPS).count(),
-        lga_chairmen=all_reps.filter(Representative.chamber == Chamber.LGA_CHAIRMAN).count(),
-        lga_councillors=all_reps.filter(Representative.chamber == Chamber.LGA_COUNCILLOR).count(),
-        state_assembly=all_reps.filter(Representative.chamber == Chamber.STATE_ASSEMBLY).count(),
-        governors=all_reps.filter(Representative.chamber == Chamber.GOVERNOR).count()
-    )
+    options = (joinedload(Representative.state), joinedload(Representative.lga))
     
-    # Paginate
-    offset = (page - 1) * limit
-    reps = query.offset(offset).limit(limit).all()
+    if cursor is not None:
+        # Keyset mode: seek on (name, id), no exact count
+        columns = [Representative.name, Representative.id]
+        try:
+            page_stmt = keyset_filter(stmt.options(*options), columns, cursor, limit, descending=False)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        reps, next_cursor = keyset_result((await db.scalars(page_stmt)).all(), columns, limit)
+        pagination = {
+            "limit": limit,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None
+        }
+    else:
+        # Get total count
+        total = await count_rows(db, stmt)
+        
+        # Paginate
+        offset = (page - 1) * limit
+        page_stmt = stmt.options(*options)
+        if rank is not None:
+            page_stmt = page_stmt.order_by(rank.desc(), Representative.name)
+        reps = (await db.scalars(page_stmt.offset(offset).limit(limit))).all()
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": (total + limit - 1) // limit
+        }
     
     # Transform to response format
     rep_list = []
@@ -278,24 +293,20 @@ async def list_representatives(
     return PaginatedResponse(
         representatives=rep_list,
         stats=stats,
-        pagination={
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
+        pagination=pagination
     )
 
 
 @router.get("/{rep_id}")
-async def get_representative(rep_id: int, db: Session = Depends(get_db)):
+async def get_representative(rep_id: int, db: AsyncSession = Depends(get_db)):
     """Get representative details by ID"""
     
-    rep = db.query(Representative).options(
+    result = await db.execute(select(Representative).options(
         joinedload(Representative.state),
         joinedload(Representative.lga),
         joinedload(Representative.contact_info)
-    ).filter(Representative.id == rep_id).first()
+    ).where(Representative.id == rep_id))
+    rep = result.unique().scalars().first()
     
     if not rep:
         raise HTTPException(status_code=404, detail="Representative not found")
@@ -339,16 +350,16 @@ async def get_representative(rep_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/states/list")
-async def list_states(db: Session = Depends(get_db)):
+async def list_states(db: AsyncSession = Depends(get_db)):
     """Get list of all Nigerian states"""
-    states = db.query(State).order_by(State.name).all()
+    states = (await db.scalars(select(State).order_by(State.name))).all()
     return [{"id": s.id, "name": s.name, "code": s.code} for s in states]
 
 
 @router.get("/states/{state_id}/lgas")
-async def list_lgas_by_state(state_id: int, db: Session = Depends(get_db)):
+async def list_lgas_by_state(state_id: int, db: AsyncSession = Depends(get_db)):
     """Get list of LGAs for a specific state"""
-    lgas = db.query(Lga).filter(Lga.state_id == state_id).order_by(Lga.name).all()
+    lgas = (await db.scalars(select(Lga).where(Lga.state_id == state_id).order_by(Lga.name))).all()
     return [{"id": l.id, "name": l.name} for l in lgas]
 
 
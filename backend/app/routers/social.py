@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime, timedelta
 
 from ..database import get_db
-from ..models.social import SocialPost, SocialDigest, Platform, Sentiment
+from ..pagination import keyset_filter, keyset_result, count_rows
+from ..models.social import SocialPost, SocialDigest, SocialDigestPost, Platform, Sentiment
 from ..models.user import User
 from ..routers.auth import get_current_user
+from ..services.social_rollup import social_rollups, hour_bucket
 
 router = APIRouter()
 
@@ -53,25 +56,47 @@ async def list_social_posts(
     representative_id: Optional[int] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Keyset cursor; pass empty for the first page"),
+    db: AsyncSession = Depends(get_db)
 ):
     """List collected social media posts"""
     
-    query = db.query(SocialPost).filter(SocialPost.is_moderated == True)
+    stmt = select(SocialPost).where(SocialPost.is_moderated == True)
     
     if platform:
-        query = query.filter(SocialPost.platform == platform)
+        stmt = stmt.where(SocialPost.platform == platform)
     
     if sentiment:
-        query = query.filter(SocialPost.sentiment == sentiment)
+        stmt = stmt.where(SocialPost.sentiment == sentiment)
     
     if representative_id:
-        query = query.filter(SocialPost.representative_id == representative_id)
+        stmt = stmt.where(SocialPost.representative_id == representative_id)
     
-    total = query.count()
-    
-    offset = (page - 1) * limit
-    posts = query.order_by(SocialPost.posted_at.desc()).offset(offset).limit(limit).all()
+    if cursor is not None:
+        # Keyset mode: seek on (posted_at, id), no exact count
+        columns = [SocialPost.posted_at, SocialPost.id]
+        try:
+            page_stmt = keyset_filter(stmt, columns, cursor, limit)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        posts, next_cursor = keyset_result((await db.scalars(page_stmt)).all(), columns, limit)
+        pagination = {
+            "limit": limit,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None
+        }
+    else:
+        total = await count_rows(db, stmt)
+        
+        offset = (page - 1) * limit
+        page_stmt = stmt.order_by(SocialPost.posted_at.desc()).offset(offset).limit(limit)
+        posts = (await db.scalars(page_stmt)).all()
+        pagination = {
+            "page": page,
+            "limit": limit,
+            "total": total,
+            "totalPages": (total + limit - 1) // limit
+        }
     
     return {
         "posts": [
@@ -90,12 +115,7 @@ async def list_social_posts(
             }
             for p in posts
         ],
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total,
-            "totalPages": (total + limit - 1) // limit
-        }
+        "pagination": pagination
     }
 
 
@@ -104,19 +124,20 @@ async def list_digests(
     representative_id: Optional[int] = None,
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=20),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List social media digests"""
     
-    query = db.query(SocialDigest)
+    stmt = select(SocialDigest)
     
     if representative_id:
-        query = query.filter(SocialDigest.representative_id == representative_id)
+        stmt = stmt.where(SocialDigest.representative_id == representative_id)
     
-    total = query.count()
+    total = await count_rows(db, stmt)
     
     offset = (page - 1) * limit
-    digests = query.order_by(SocialDigest.created_at.desc()).offset(offset).limit(limit).all()
+    page_stmt = stmt.order_by(SocialDigest.created_at.desc()).offset(offset).limit(limit)
+    digests = (await db.scalars(page_stmt)).all()
     
     return {
         "digests": [
@@ -143,21 +164,41 @@ async def list_digests(
 
 
 @router.get("/digests/{digest_id}")
-async def get_digest(digest_id: int, db: Session = Depends(get_db)):
-    """Get a specific digest with included posts"""
+async def get_digest(
+    digest_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from the previous page of posts"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get a specific digest with a page of its posts"""
     
-    digest = db.query(SocialDigest).filter(SocialDigest.id == digest_id).first()
+    digest = await db.get(SocialDigest, digest_id)
     
     if not digest:
         raise HTTPException(status_code=404, detail="Digest not found")
     
-    # Get included posts
-    posts = db.query(SocialPost).filter(
-        SocialPost.is_included_in_digest == True,
+    # The representative's posts in the period, walked on ix_social_posts_rep_posted_at_id
+    stmt = select(SocialPost).where(
+        SocialPost.representative_id == digest.representative_id,
         SocialPost.posted_at >= digest.period_start,
-        SocialPost.posted_at <= digest.period_end,
-        SocialPost.representative_id == digest.representative_id
-    ).all()
+        SocialPost.posted_at <= digest.period_end
+    )
+    if digest.post_ids is not None:
+        # One membership select drives both the semi-join and the total
+        members = select(SocialDigestPost.post_id).where(SocialDigestPost.digest_id == digest.id)
+        stmt = stmt.where(SocialPost.id.in_(members))
+        total = await count_rows(db, members)
+    else:
+        # Digests from before membership was recorded
+        stmt = stmt.where(SocialPost.is_included_in_digest == True)
+        total = None
+    
+    columns = [SocialPost.posted_at, SocialPost.id]
+    try:
+        page_stmt = keyset_filter(stmt, columns, cursor, limit, descending=False)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    posts, next_cursor = keyset_result((await db.scalars(page_stmt)).all(), columns, limit)
     
     return {
         "id": digest.id,
@@ -179,7 +220,13 @@ async def get_digest(digest_id: int, db: Session = Depends(get_db)):
                 "postedAt": p.posted_at
             }
             for p in posts
-        ]
+        ],
+        "pagination": {
+            "limit": limit,
+            "total": total,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None
+        }
     }
 
 
@@ -187,45 +234,35 @@ async def get_digest(digest_id: int, db: Session = Depends(get_db)):
 async def get_social_stats(
     representative_id: Optional[int] = None,
     days: int = Query(7, ge=1, le=30),
-    db: Session = Depends(get_db)
+    bucket: Optional[str] = Query(None, pattern="^(hour|day)$", description="Add a time series at this granularity"),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get social media statistics"""
-    
-    since = datetime.utcnow() - timedelta(days=days)
-    
-    query = db.query(SocialPost).filter(SocialPost.posted_at >= since)
+    """Get social media statistics (served from hourly rollups)"""
     
-    if representative_id:
-        query = query.filter(SocialPost.representative_id == representative_id)
-    
-    total_posts = query.count()
+    # Rollups are hourly, so the window starts on the hour
+    since = hour_bucket(datetime.utcnow() - timedelta(days=days))
     
-    positive = query.filter(SocialPost.sentiment == Sentiment.POSITIVE).count()
-    negative = query.filter(SocialPost.sentiment == Sentiment.NEGATIVE).count()
-    neutral = query.filter(SocialPost.sentiment == Sentiment.NEUTRAL).count()
-    constructive = query.filter(SocialPost.sentiment == Sentiment.CONSTRUCTIVE).count()
+    series = None
+    if bucket:
+        # One query serves both the series and the totals
+        dialect_name = db.get_bind().dialect.name
+        rows = (await db.execute(social_rollups.series_statement(dialect_name, bucket, since, representative_id))).all()
+        series = social_rollups.summarize_series(rows)
+        stats = social_rollups.summarize((platform, sentiment, total) for _, platform, sentiment, total in rows)
+    else:
+        rows = (await db.execute(social_rollups.stats_statement(since, representative_id))).all()
+        stats = social_rollups.summarize(rows)
     
-    twitter = query.filter(SocialPost.platform == Platform.TWITTER).count()
-    facebook = query.filter(SocialPost.platform == Platform.FACEBOOK).count()
-    instagram = query.filter(SocialPost.platform == Platform.INSTAGRAM).count()
-    
-    return {
+    response = {
         "period": {
             "days": days,
             "start": since,
             "end": datetime.utcnow()
         },
-        "totalPosts": total_posts,
-        "bySentiment": {
-            "positive": positive,
-            "negative": negative,
-            "neutral": neutral,
-            "constructive": constructive
-        },
-        "byPlatform": {
-            "twitter": twitter,
-            "facebook": facebook,
-            "instagram": instagram
-        }
+        **stats
     }
-
+    if series is not None:
+        response["bucket"] = bucket
+        response["series"] = series
+    
+    return response
@@ -3,11 +3,12 @@ Database seeding script for Voice2Gov
 Populates the database with Nigerian states, LGAs, and representatives
 """
 
+from sqlalchemy import bindparam, inspect, text
 from sqlalchemy.orm import Session
 from .database import SessionLocal, engine, Base
 from .models.representative import Representative, ContactInfo, State, Lga, Chamber, ContactType
 from .models.user import User
-from .models.legal_document import LegalDocument
+from .models.legal_document import LegalDocument, LEGAL_TAGS_TEXT_FUNCTION, SEARCH_VECTOR_EXPRESSION
 
 # Nigerian States and their codes
 NIGERIAN_STATES = [
@@ -298,6 +299,79 @@ def seed_legal_documents(db: Session):
     db.commit()
     print(f"Seeded {len(docs)} legal document sections")
 
+def ensure_legal_search_vector():
+    """Add the generated search_vector column to a pre-existing legal_documents table"""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(LEGAL_TAGS_TEXT_FUNCTION)
+        conn.execute(text(
+            "ALTER TABLE legal_documents ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+        ))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_legal_documents_search_vector "
+            "ON legal_documents USING gin (search_vector)"
+        ))
+
+
+def ensure_user_token_version():
+    """Add token_version to a pre-existing users table"""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        conn.execute(text(
+            "ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0"
+        ))
+
+
+def ensure_social_post_digest_index():
+    """Add the (representative_id, posted_at, id) index to a pre-existing social_posts table"""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_social_posts_rep_posted_at_id "
+            "ON social_posts (representative_id, posted_at, id)"
+        ))
+
+
+def ensure_signature_unique():
+    """One-off migration: add the (petition_id, user_id) unique index ON CONFLICT
+    signing targets to a pre-existing signatures table, first removing duplicate
+    signatures and recomputing the affected petitions' signature_count"""
+    inspector = inspect(engine)
+    if not inspector.has_table("signatures"):
+        return
+    columns = ["petition_id", "user_id"]
+    if any(c["column_names"] == columns for c in inspector.get_unique_constraints("signatures")) or any(
+        i["unique"] and i["column_names"] == columns for i in inspector.get_indexes("signatures")
+    ):
+        return
+
+    with engine.begin() as conn:
+        petition_ids = [row[0] for row in conn.execute(text(
+            "SELECT DISTINCT petition_id FROM signatures "
+            "GROUP BY petition_id, user_id HAVING COUNT(*) > 1"
+        ))]
+        if petition_ids:
+            # Keep the first signature of each duplicate set so the index can be built
+            removed = conn.execute(text(
+                "DELETE FROM signatures WHERE id NOT IN "
+                "(SELECT MIN(id) FROM signatures GROUP BY petition_id, user_id)"
+            )).rowcount
+            params = {"ids": petition_ids}
+            # Pending sharded increments counted the removed rows too; the recount replaces them
+            conn.execute(text("DELETE FROM petition_counter_shards WHERE petition_id IN :ids").bindparams(bindparam("ids", expanding=True)), params)
+            conn.execute(text(
+                "UPDATE petitions SET signature_count = "
+                "(SELECT COUNT(*) FROM signatures WHERE signatures.petition_id = petitions.id) "
+                "WHERE id IN :ids"
+            ).bindparams(bindparam("ids", expanding=True)), params)
+            print(f"Removed {removed} duplicate signatures; recounted {len(petition_ids)} petitions")
+        conn.execute(text(
+            "CREATE UNIQUE INDEX uq_signatures_petition_user ON signatures (petition_id, user_id)"
+        ))
+
+
 def run_seed():
     """Run all seed functions"""
     print("=" * 50)
@@ -306,6 +380,10 @@ def run_seed():
     
     # Create tables
     Base.metadata.create_all(bind=engine)
+    ensure_legal_search_vector()
+    ensure_user_token_version()
+    ensure_social_post_digest_index()
+    ensure_signature_unique()
     
     db = SessionLocal()
     try:
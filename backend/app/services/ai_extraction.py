@@ -0,0 +1,196 @@
+"""
+AI Page Extraction Service for Voice2Gov
+- Extracts every representative on a long page (member lists, directories),
+  not just what fits in one prompt
+- Page text is split into chunks at line (element) boundaries, preferring to
+  cut right before an entry starts; chunks that could not be cut there repeat
+  the end of the previous chunk, so no entry is only ever seen in halves
+- Chunks are extracted concurrently under scraper_ai_concurrency
+- Per-chunk JSON is merged: one record per person (same name, or a name that
+  only drops a middle name), fields filled from whichever chunk had them
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+from ..config import settings
+from .openai_service import openai_service
+from .name_matching import name_tokens, name_key
+
+
+FIELDS = ("name", "party", "state", "constituency", "email", "phone", "twitter", "bio")
+
+# Lines that open a new entry on NASS / state listing pages
+ENTRY_START = re.compile(r"^(?:rt\.?\s+)?(?:hon\.?|sen\.?|senator|distinguished|dr\.?|engr\.?|chief|alhaji|barr\.?)\s", re.I)
+
+
+@dataclass
+class ExtractionStats:
+    """Outcome of one extract() call"""
+    characters: int = 0
+    chunks: int = 0
+    chunks_failed: int = 0
+    chunks_skipped: int = 0
+    records: int = 0
+    duplicates: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ExtractionResult:
+    records: List[Dict[str, Any]]
+    stats: ExtractionStats = field(default_factory=ExtractionStats)
+
+
+class ChunkedExtractor:
+    """Overlapping-chunk, concurrent LLM extraction of representatives from page text"""
+
+    def __init__(
+        self,
+        llm=None,
+        chunk_chars: int = 4000,
+        overlap_chars: int = 400,
+        concurrency: int = 4,
+        max_chunks: int = 40
+    ):
+        self.llm = llm or openai_service
+        self.chunk_chars = max(200, chunk_chars)
+        self.overlap_chars = max(0, min(overlap_chars, self.chunk_chars // 2))
+        self.concurrency = max(1, concurrency)
+        self.max_chunks = max(1, max_chunks)
+
+    def _lines(self, text: str) -> List[str]:
+        """Non-empty lines; any longer than a chunk are cut into overlapping pieces"""
+        lines = []
+        for line in text.splitlines():
+            line = line.strip()
+            while len(line) > self.chunk_chars:
+                lines.append(line[:self.chunk_chars])
+                line = line[self.chunk_chars - self.overlap_chars:]
+            if line:
+                lines.append(line)
+        return lines
+
+    def chunk_text(self, text: str) -> List[str]:
+        """Chunks of at most chunk_chars, cut between lines"""
+        lines = self._lines(text)
+        chunks, start = [], 0
+        while start < len(lines):
+            end, size = start, 0
+            while end < len(lines) and (end == start or size + len(lines[end]) + 1 <= self.chunk_chars):
+                size += len(lines[end]) + 1
+                end += 1
+            if end >= len(lines):
+                chunks.append("\n".join(lines[start:]))
+                break
+
+            # Prefer to cut right before an entry that starts near the end
+            cut, tail = None, 0
+            for i in range(end, start, -1):
+                if ENTRY_START.match(lines[i]):
+                    cut = i
+                    break
+                tail += len(lines[i - 1]) + 1
+                if tail > max(self.overlap_chars, self.chunk_chars // 4):
+                    break
+            if cut is not None:
+                chunks.append("\n".join(lines[start:cut]))
+                start = cut
+                continue
+
+            # No clean cut: the next chunk repeats the last overlap_chars of this one
+            chunks.append("\n".join(lines[start:end]))
+            next_start, back = end, 0
+            while next_start - 1 > start and back + len(lines[next_start - 1]) + 1 <= self.overlap_chars:
+                next_start -= 1
+                back += len(lines[next_start]) + 1
+            start = next_start
+        return chunks
+
+    async def _extract_chunk(self, chunk: str, rep_type: str, semaphore: asyncio.Semaphore) -> Optional[List[Dict[str, Any]]]:
+        async with semaphore:
+            return await self.llm.extract_representatives(chunk, rep_type)
+
+    @staticmethod
+    def _same_person(record: Dict[str, Any], kept: Dict[str, Any]) -> bool:
+        """No conflicting state or email; two people can share a name on one page"""
+        for attribute in ("state", "email"):
+            value = record.get(attribute)
+            if value and kept[attribute] and str(value).strip().lower() != str(kept[attribute]).strip().lower():
+                return False
+        return True
+
+    def merge(self, parts: List[List[Dict[str, Any]]], stats: ExtractionStats) -> List[Dict[str, Any]]:
+        """One record per person across chunks, in page order; missing fields filled from repeats"""
+        merged: List[Dict[str, Any]] = []
+        words_of: List[set] = []
+        by_key: Dict[str, List[int]] = {}
+        # Name token -> merged records using it, so middle-name matches only look at
+        # records that share a word instead of scanning every record so far
+        by_token: Dict[str, List[int]] = {}
+        for records in parts:
+            for record in records:
+                name = record.get("name")
+                words = name_tokens(name) if isinstance(name, str) else ()
+                if not words:
+                    continue
+                key, found = name_key(words), set(words)
+                index = next((i for i in by_key.get(key, ()) if self._same_person(record, merged[i])), None)
+                if index is None:
+                    # The same person with or without a middle name (two shared words at least)
+                    candidates = sorted({i for token in found for i in by_token.get(token, ())})
+                    index = next((
+                        i for i in candidates
+                        if min(len(words_of[i]), len(found)) >= 2 and (words_of[i] <= found or found <= words_of[i])
+                        and self._same_person(record, merged[i])
+                    ), None)
+                if index is None:
+                    by_key.setdefault(key, []).append(len(merged))
+                    for token in found:
+                        by_token.setdefault(token, []).append(len(merged))
+                    merged.append({attribute: record.get(attribute) or None for attribute in FIELDS})
+                    words_of.append(found)
+                    continue
+
+                stats.duplicates += 1
+                kept = merged[index]
+                for attribute in FIELDS:
+                    if not kept[attribute] and record.get(attribute):
+                        kept[attribute] = record[attribute]
+                # Keep the fullest spelling of the name
+                if len(found) > len(words_of[index]):
+                    for token in found - words_of[index]:
+                        by_token.setdefault(token, []).append(index)
+                    kept["name"], words_of[index] = name, found
+        return merged
+
+    async def extract(self, text: str, rep_type: str = "senator") -> ExtractionResult:
+        """Every representative found in text"""
+        stats = ExtractionStats(characters=len(text))
+        start = time.perf_counter()
+        chunks = self.chunk_text(text)
+        if len(chunks) > self.max_chunks:
+            stats.chunks_skipped = len(chunks) - self.max_chunks
+            print(f"AI extraction: page needs {len(chunks)} chunks; only the first {self.max_chunks} are sent")
+            chunks = chunks[:self.max_chunks]
+        stats.chunks = len(chunks)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        parts = await asyncio.gather(*[self._extract_chunk(chunk, rep_type, semaphore) for chunk in chunks])
+        stats.chunks_failed = sum(1 for part in parts if part is None)
+        records = self.merge([part for part in parts if part], stats)
+        stats.records = len(records)
+        stats.seconds = time.perf_counter() - start
+        return ExtractionResult(records=records, stats=stats)
+
+
+# Singleton instance
+ai_extractor = ChunkedExtractor(
+    chunk_chars=settings.scraper_ai_chunk_chars,
+    overlap_chars=settings.scraper_ai_chunk_overlap,
+    concurrency=settings.scraper_ai_concurrency,
+    max_chunks=settings.scraper_ai_max_chunks
+)
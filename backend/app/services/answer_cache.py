@@ -0,0 +1,106 @@
+"""
+Answer Cache Service for Voice2Gov
+- Caches constitution answers keyed on the normalized question and the
+  retrieved section IDs
+- In-process LRU with TTL by default, Redis for multi-worker deployments
+- Hit/miss counters
+"""
+
+import hashlib
+import re
+from typing import Optional, List, Dict, Any
+
+from ..config import settings
+from .cache_backends import InMemoryCacheBackend, RedisCacheBackend
+
+
+# Filler that never changes what is being asked; question words, verbs and
+# prepositions stay in the key because they do
+STOPWORDS = {
+    "a", "an", "the", "please", "kindly", "tell", "me", "i", "my", "you", "your",
+    "say", "says", "nigeria", "nigerian", "constitution"
+}
+
+# Longest suffix first; a light stemmer is enough to fold plural/verb forms
+SUFFIXES = ["ations", "ation", "ments", "ment", "ings", "ing", "ies", "ied", "ed", "es", "ly", "s"]
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def stem(word: str) -> str:
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            return word + "y" if suffix in ("ies", "ied") else word
+    return word
+
+
+def normalize_question(question: str) -> str:
+    """Case-, whitespace- and punctuation-insensitive, stemmed form of a question"""
+    words = WORD_PATTERN.findall(question.lower())
+    return " ".join(stem(w) for w in words if w not in STOPWORDS)
+
+
+class AnswerCache:
+    """Cache of generated answers with hit/miss accounting"""
+
+    def __init__(self, backend, ttl_seconds: int = 86400):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def make_key(self, question: str, section_ids: List[int]) -> str:
+        ids = ",".join(str(i) for i in sorted(section_ids))
+        raw = f"{normalize_question(question)}|{ids}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def get(self, question: str, section_ids: List[int]) -> Optional[str]:
+        try:
+            value = await self.backend.get(self.make_key(question, section_ids))
+        except Exception as e:
+            # A cache outage must not take the endpoint down
+            self.errors += 1
+            print(f"Answer cache get error: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, question: str, section_ids: List[int], answer: str):
+        try:
+            await self.backend.set(self.make_key(question, section_ids), answer, self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            print(f"Answer cache set error: {e}")
+
+    async def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": await self.backend.size(),
+        }
+
+
+def create_answer_cache() -> AnswerCache:
+    """Build the cache for the configured backend"""
+    backend = None
+    if settings.answer_cache_backend == "redis" and settings.answer_cache_redis_url:
+        try:
+            backend = RedisCacheBackend(settings.answer_cache_redis_url, prefix="voice2gov:answers:")
+        except ImportError:
+            print("redis package not installed; falling back to in-process answer cache")
+    if backend is None:
+        backend = InMemoryCacheBackend(settings.answer_cache_max_entries)
+    return AnswerCache(backend, settings.answer_cache_ttl_seconds)
+
+
+# Singleton instance
+answer_cache = create_answer_cache()
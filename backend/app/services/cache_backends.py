@@ -0,0 +1,71 @@
+"""
+Cache Backends for Voice2Gov
+- Key/value string stores with per-entry TTL shared by the answer and
+  principal caches
+- In-process LRU by default, Redis for multi-worker deployments
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class InMemoryCacheBackend:
+    """Per-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int):
+        async with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self.discard(key)
+
+    def discard(self, key: str):
+        """Drop an entry without awaiting (safe from sync code on the loop thread)"""
+        self._entries.pop(key, None)
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Shared cache for multi-worker deployments; Redis evicts with allkeys-lru"""
+
+    def __init__(self, url: str, prefix: str = "voice2gov:"):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int):
+        await self.client.set(self.prefix + key, value, ex=ttl_seconds)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+    async def size(self) -> Optional[int]:
+        return None
@@ -0,0 +1,286 @@
+"""
+Contact Extraction Service for Voice2Gov
+- One compiled pass over page text finds Nigerian phone numbers together with
+  mentions of states, LGAs and political parties; emails and @handles come
+  from a second scan that only stops at "@"
+- States and all 774 LGAs are read from data/nigeria_lgas_complete.sql;
+  parties are INEC's registered list, by acronym and full name
+- Place and party names are compiled into a trie-shaped regex, so matching is an
+  Aho-Corasick-style walk inside the regex engine instead of a loop over names
+- Candidate starts (capitals, "+", "0") are masked to one sentinel byte so the
+  scan skips between them with a single-byte search; emails and handles are
+  found from their "@" the same way
+- Phone numbers are normalised to E.164 (+234XXXXXXXXXX)
+"""
+
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple, Iterable
+
+from ..config import settings
+
+
+DEFAULT_GAZETTEER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "data", "nigeria_lgas_complete.sql"
+)
+
+# Used when the gazetteer file is not shipped (e.g. a backend-only deploy)
+STATE_NAMES = [
+    "Abia", "Adamawa", "Akwa Ibom", "Anambra", "Bauchi", "Bayelsa", "Benue", "Borno", "Cross River",
+    "Delta", "Ebonyi", "Edo", "Ekiti", "Enugu", "FCT", "Gombe", "Imo", "Jigawa", "Kaduna", "Kano",
+    "Katsina", "Kebbi", "Kogi", "Kwara", "Lagos", "Nasarawa", "Niger", "Ogun", "Ondo", "Osun", "Oyo",
+    "Plateau", "Rivers", "Sokoto", "Taraba", "Yobe", "Zamfara"
+]
+STATE_ALIASES = {
+    "Abuja": "FCT",
+    "Federal Capital Territory": "FCT",
+    "Nassarawa": "Nasarawa",
+    "Akwa-Ibom": "Akwa Ibom",
+    "Cross-River": "Cross River",
+}
+
+# INEC-registered parties. One- and two-letter acronyms other than LP are too
+# ambiguous in running text (A, AA, BP), so those parties match by name only.
+PARTIES = {
+    "A": ["Accord", "Accord Party"],
+    "AA": ["Action Alliance"],
+    "AAC": ["AAC", "African Action Congress"],
+    "ADC": ["ADC", "African Democratic Congress"],
+    "ADP": ["ADP", "Action Democratic Party"],
+    "APC": ["APC", "All Progressives Congress"],
+    "APGA": ["APGA", "All Progressives Grand Alliance"],
+    "APM": ["APM", "Allied Peoples Movement"],
+    "APP": ["APP", "Action Peoples Party"],
+    "BP": ["Boot Party"],
+    "LP": ["LP", "Labour Party"],
+    "NNPP": ["NNPP", "New Nigeria Peoples Party"],
+    "NRM": ["NRM", "National Rescue Movement"],
+    "PDP": ["PDP", "Peoples Democratic Party"],
+    "PRP": ["PRP", "Peoples Redemption Party"],
+    "SDP": ["SDP", "Social Democratic Party"],
+    "YPP": ["YPP", "Young Progressives Party"],
+    "ZLP": ["ZLP", "Zenith Labour Party"],
+}
+
+# Phrases that contain a state name without referring to the state
+NOT_PLACES = ["Niger Delta", "Niger Republic", "River Niger", "Delta State University"]
+# LGAs that are also common personal names ("Peter Obi"): only counted when
+# the text goes on to say it is an LGA or constituency
+PERSON_NAME_LGAS = ["Obi", "Isa", "Ado", "Ojo"]
+LGA_CUES = (b"lga", b"l.g.a", b"local government", b"federal constituency", b"constituency")
+
+# Characters that can start a name or phone number. The scan runs over a copy
+# of the text (bytes) with all of them turned into one sentinel byte, so the
+# regex engine jumps between sentinels with a single-byte search instead of
+# testing a character class at every position; matches are checked against
+# the original bytes at the same offsets.
+SENTINEL = b"\x01"
+STARTS = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ+0"
+MASK = bytes.maketrans(STARTS + SENTINEL, SENTINEL * len(STARTS) + b" ")
+PHONE_STARTS = b"+0"
+
+# Character classes as they look in the masked text ("0" is a sentinel too)
+WORD = rb"[a-z1-9_\x01\x80-\xff]"
+DIGIT = rb"[1-9\x01]"
+SEPARATOR = rb"[\s.\-)]*"
+# Numbers end before a digit; a trailing sentinel is told apart in the
+# original text. After the sentinel for "+": 234 803..., (234) 803..., 234 (0) 803...
+INTL_PHONE = (
+    rb"(?:2|[\s(]" + SEPARATOR + rb"\(?2)34\)?" + SEPARATOR + rb"(?:\(\x01\)" + SEPARATOR + rb")?[1-9](?:" + SEPARATOR + DIGIT + rb"){9}(?![1-9])"
+)
+# After the sentinel for "0": 803 123 4567, 803-1234-567, 8031234567
+LOCAL_PHONE = rb"[789][1\x01](?:" + SEPARATOR + DIGIT + rb"){8}(?![1-9])"
+# Emails and handles are found from their "@", in the original bytes
+AT_PATTERN = re.compile(
+    rb"@(?:(?<=[a-zA-Z0-9._%+-]@)(?P<domain>[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})"
+    rb"|(?<![a-zA-Z0-9._%+@-]@)(?P<handle>[A-Za-z0-9_]{1,15})(?![A-Za-z0-9_]))"
+)
+# Characters of an email's local part, read backwards from the "@" with rstrip
+LOCAL_CHARS = b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._%+-"
+# Bytes that continue a word in the original text (what WORD is, unmasked)
+WORD_BYTES = frozenset(b"abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+" + bytes(range(0x80, 0x100)))
+NON_DIGITS = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+
+@dataclass
+class Contacts:
+    """Entities found in one text, each list in first-seen order without repeats"""
+    emails: List[str] = field(default_factory=list)
+    phones: List[str] = field(default_factory=list)  # E.164
+    handles: List[str] = field(default_factory=list)
+    states: List[str] = field(default_factory=list)
+    lgas: List[Tuple[str, str]] = field(default_factory=list)  # (lga, state)
+    parties: List[str] = field(default_factory=list)  # acronyms
+
+    @property
+    def count(self) -> int:
+        return len(self.emails) + len(self.phones) + len(self.handles) + len(self.states) + len(self.lgas) + len(self.parties)
+
+
+def load_gazetteer(path: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """States and {state: [LGA names]} from the LGA seed SQL"""
+    with open(path, encoding="utf-8") as f:
+        sql = f.read()
+    states_block = re.search(r"INSERT INTO states .*?VALUES(.*?);", sql, re.S)
+    states = re.findall(r"\('((?:[^']|'')*)',\s*'[A-Z]{2}'", states_block.group(1)) if states_block else []
+    lgas = {}
+    for values, state in re.findall(r"\(VALUES (.*?)\) AS t\(lga_name\)\s*WHERE s\.name = '((?:[^']|'')*)'", sql, re.S):
+        lgas[state.replace("''", "'")] = [
+            name.replace("''", "'") for name in re.findall(r"\('((?:[^']|'')*)'\)", values)
+        ]
+    return [s.replace("''", "'") for s in states], lgas
+
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """E.164 for a Nigerian number written any of the usual ways"""
+    return _e164(raw.encode())
+
+
+def _e164(raw: bytes) -> Optional[str]:
+    digits = raw.translate(None, NON_DIGITS)
+    if digits.startswith(b"2340"):
+        digits = b"234" + digits[4:]
+    elif digits.startswith(b"0"):
+        digits = b"234" + digits[1:]
+    if not digits.startswith(b"234") or len(digits) != 13:
+        return None
+    return "+" + digits.decode()
+
+
+def trie_pattern(words: Iterable[bytes]) -> bytes:
+    """Regex matching any of words, nested by shared prefix (longest match first)"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for byte in word:
+            node = node.setdefault(byte, {})
+        node[None] = True
+
+    def build(node: Dict) -> bytes:
+        branches = [re.escape(bytes([byte])) + build(child) for byte, child in sorted(node.items(), key=lambda i: -1 if i[0] is None else i[0]) if byte is not None]
+        if not branches:
+            return b""
+        optional = None in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = b"(?:" + b"|".join(branches) + b")"
+        return group + b"?" if optional else group
+
+    return build(trie)
+
+
+class ContactExtractor:
+    """Compiled single-pass extractor; build once and reuse"""
+
+    def __init__(self, gazetteer_path: Optional[str] = None):
+        self.gazetteer_path = gazetteer_path or DEFAULT_GAZETTEER
+        self._pattern: Optional[re.Pattern] = None
+        # Name as written (bytes) -> [("state", state) / ("lga", (lga, state)) / ("party", acronym)],
+        # [] for NOT_PLACES
+        self.names: Dict[bytes, List[Tuple[str, object]]] = {}
+        # Names (as written or in capitals) that need an LGA_CUES word after them
+        self.cued = {variant.encode() for name in PERSON_NAME_LGAS for variant in (name, name.upper())}
+
+    def _add(self, name: str, kind: str, value):
+        for variant in {name, name.upper(), name.replace("Peoples", "People's")}:
+            entries = self.names.setdefault(variant.encode(), [])
+            if (kind, value) not in entries:
+                entries.append((kind, value))
+
+    def _compile(self) -> re.Pattern:
+        states, lgas = STATE_NAMES, {}
+        try:
+            states, lgas = load_gazetteer(self.gazetteer_path)
+        except OSError as e:
+            print(f"LGA gazetteer unavailable ({e}); matching states only")
+        for state in states:
+            self._add(state, "state", state)
+        for alias, state in STATE_ALIASES.items():
+            self._add(alias, "state", state)
+        for state, names in lgas.items():
+            for name in names:
+                self._add(name, "lga", (name, state))
+        for acronym, names in PARTIES.items():
+            for name in names:
+                self._add(name, "party", acronym)
+        for phrase in NOT_PLACES:
+            self.names[phrase.encode()] = []
+            self.names[phrase.upper().encode()] = []
+
+        # Names are matched case-sensitively, as written or in capitals, so that
+        # "Delta" and "Obi" the place aren't confused with "delta" and "obi".
+        # Masked, every name starts with the sentinel; the trie covers the rest.
+        # Each alternative after the sentinel opens with a literal or a class,
+        # so the engine rules most of them out on the next byte alone.
+        rests = {name.translate(MASK)[1:] for name in self.names}
+        names = trie_pattern(rests) + rb"(?!" + WORD + rb")"
+        return re.compile(SENTINEL + rb"(?<!" + WORD + rb".)(?:" + names + rb"|" + INTL_PHONE + rb"|" + LOCAL_PHONE + rb")")
+
+    @property
+    def pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            self._pattern = self._compile()
+        return self._pattern
+
+    def extract(self, text: str) -> Contacts:
+        """All entities in text: one scan for names and phones, one for "@" """
+        raw = text.encode("utf-8")
+        # Dicts as ordered sets: first-seen order, no repeats
+        emails, handles, phones, names = {}, {}, {}, {}
+        for match in AT_PATTERN.finditer(raw):
+            domain = match.group("domain")
+            if domain:
+                start = match.start()
+                before = raw[max(0, start - 64):start]
+                emails[before[len(before.rstrip(LOCAL_CHARS)):] + b"@" + domain] = None
+            else:
+                handles[match.group("handle")] = None
+
+        known, cued = self.names, self.cued
+        masked = raw.translate(MASK)
+        search = self.pattern.search
+        match = search(masked)
+        while match:
+            start, end = match.span()
+            found, name = raw[start:end], None
+            if raw[start] in PHONE_STARTS:
+                # A capital right after the number is fine; another "0" is not
+                if raw[end:end + 1] != b"0":
+                    phones[found] = None
+            elif found not in known:
+                # Masked text can't tell "APC" from "THE", so the longest masked
+                # match may hide a shorter real name at the same start ("KANO"
+                # in "KANO STATE") or one starting at a later word ("APC" in
+                # "THE APC"): try the shorter names, else resume at the next word
+                end = start + 1
+                for cut in range(len(found) - 1, 0, -1):
+                    if found[cut] not in WORD_BYTES and found[:cut] in known:
+                        name, end = found[:cut], start + cut
+                        break
+            else:
+                name = found
+            if name is not None and (name not in cued or raw[end:end + 32].lstrip(b" ,-").lower().startswith(LGA_CUES)):
+                names[name] = None
+            match = search(masked, end)
+
+        contacts = Contacts(
+            emails=[e.decode() for e in emails if not e.endswith((b'.png', b'.jpg'))],
+            handles=[h.decode() for h in handles]
+        )
+        normalized = {}
+        for raw_phone in phones:
+            phone = _e164(raw_phone)
+            if phone:
+                normalized[phone] = None
+        contacts.phones = list(normalized)
+        found = {"state": {}, "lga": {}, "party": {}}
+        for name in names:
+            for kind, value in known[name]:
+                found[kind][value] = None
+        contacts.states, contacts.lgas, contacts.parties = list(found["state"]), list(found["lga"]), list(found["party"])
+        return contacts
+
+
+# Singleton instance
+contact_extractor = ContactExtractor(settings.contact_gazetteer_path or None)
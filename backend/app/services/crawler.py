@@ -0,0 +1,339 @@
+"""
+Crawl Engine for Voice2Gov
+- Frontier of URLs with depth, dedupe and a crawl budget (pages and wall-clock seconds)
+- Bounded concurrency overall and per host, with a politeness delay between hits on a host
+- robots.txt fetched once per host; disallowed URLs and Crawl-delay are honoured
+- Retries on 429/5xx and transport errors with jittered exponential backoff (Retry-After wins)
+- Handlers (plain or async) parse each fetched page and may return more URLs to visit
+- Optional PageCache: conditional GETs, and unchanged pages are flagged so parsing can be skipped
+"""
+
+import asyncio
+import inspect
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, Callable, Iterable, Tuple, Union, Awaitable
+from urllib.parse import urldefrag, urlsplit
+from urllib.robotparser import RobotFileParser
+import httpx
+
+from ..config import settings
+from .http_client import http_clients
+from .page_cache import PageCache, page_cache, content_hash
+
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class CrawlRequest:
+    url: str
+    kind: str  # lets the handler tell pages apart, e.g. "senators" or "state"
+    meta: Dict[str, Any] = field(default_factory=dict)
+    depth: int = 0
+
+
+@dataclass
+class CrawlResult:
+    request: CrawlRequest
+    status: Optional[int] = None
+    text: Optional[str] = None
+    url: Optional[str] = None  # after redirects
+    error: Optional[str] = None
+    attempts: int = 0
+    seconds: float = 0.0
+    content_hash: Optional[str] = None
+    # Same body as the cached copy (304, or 200 with an identical hash)
+    unchanged: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (200, 304) and self.text is not None
+
+
+@dataclass
+class CrawlStats:
+    """Outcome of one crawl() call"""
+    queued: int = 0
+    fetched: int = 0
+    failed: int = 0
+    retries: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    bytes_downloaded: int = 0
+    robots_blocked: int = 0
+    duplicates: int = 0
+    over_budget: int = 0
+    hosts: int = 0
+    seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class _Host:
+    """Per-host concurrency, politeness and robots.txt state"""
+
+    def __init__(self, concurrency: int, delay: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.delay = delay
+        self.next_at = 0.0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_loaded: Optional[asyncio.Future] = None
+
+    async def wait_turn(self):
+        """Space request starts on this host by delay seconds"""
+        now = time.monotonic()
+        start = max(now, self.next_at)
+        self.next_at = start + self.delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+def normalize_url(url: str) -> str:
+    return urldefrag(url)[0]
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+Handler = Callable[[CrawlResult], Union[Optional[Iterable[CrawlRequest]], Awaitable[Optional[Iterable[CrawlRequest]]]]]
+
+
+class Crawler:
+    """Polite concurrent fetcher over a URL frontier"""
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        user_agent: str = "Voice2Gov Bot/1.0",
+        max_concurrency: int = 16,
+        per_host_concurrency: int = 2,
+        per_host_delay: float = 0.5,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        max_pages: int = 2000,
+        max_seconds: float = 600.0,
+        max_depth: int = 2,
+        respect_robots: bool = True,
+        cache: Optional[PageCache] = None
+    ):
+        self.client = client
+        self.cache = cache
+        self.user_agent = user_agent
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.per_host_delay = per_host_delay
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.max_depth = max_depth
+        self.respect_robots = respect_robots
+
+    def _client(self) -> httpx.AsyncClient:
+        return self.client or http_clients.get("scraper")
+
+    def backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds before retry number attempt: Retry-After if given, else full jitter"""
+        if retry_after:
+            try:
+                return min(self.backoff_max, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def _load_robots(self, url: str, host: _Host):
+        parts = urlsplit(url)
+        robots = RobotFileParser()
+        try:
+            response = await self._client().get(
+                f"{parts.scheme}://{parts.netloc}/robots.txt", headers={"User-Agent": self.user_agent}
+            )
+            if response.status_code >= 500:
+                # Server trouble: treat the whole host as off limits for this crawl
+                robots.disallow_all = True
+            elif response.status_code >= 400:
+                robots.allow_all = True
+            else:
+                robots.parse(response.text.splitlines())
+        except httpx.HTTPError as e:
+            print(f"robots.txt unavailable for {parts.netloc}: {e}")
+            robots.allow_all = True
+        host.robots = robots
+        crawl_delay = robots.crawl_delay(self.user_agent)
+        if crawl_delay:
+            host.delay = max(host.delay, float(crawl_delay))
+
+    async def allowed(self, url: str, host: _Host) -> bool:
+        if not self.respect_robots:
+            return True
+        if host.robots_loaded is None:
+            host.robots_loaded = asyncio.ensure_future(self._load_robots(url, host))
+        await asyncio.shield(host.robots_loaded)
+        return host.robots.can_fetch(self.user_agent, url)
+
+    async def _read(self, result: CrawlResult, response: httpx.Response, cached, stats: CrawlStats):
+        """Fill result from a final response, revalidating against the cached copy"""
+        cache = self.cache
+        etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+        if response.status_code == 304 and cached is not None:
+            result.text = await asyncio.to_thread(cache.body, cached)
+            result.content_hash = cached.content_hash
+            result.unchanged = True
+            stats.not_modified += 1
+            cache.stats.not_modified += 1
+            cache.stats.bytes_saved += len(result.text)
+            await asyncio.to_thread(cache.refresh, result.request.url, etag, last_modified)
+            return
+        if response.status_code != 200:
+            return
+
+        content = response.content
+        stats.bytes_downloaded += len(content)
+        result.text = response.text
+        result.content_hash = content_hash(content)
+        if cache is None:
+            return
+        cache.stats.bytes_downloaded += len(content)
+        if cached is not None and cached.content_hash == result.content_hash:
+            result.unchanged = True
+            stats.unchanged += 1
+            cache.stats.unchanged += 1
+            await asyncio.to_thread(cache.refresh, result.request.url, etag, last_modified)
+        else:
+            if cached is not None:
+                cache.stats.changed += 1
+            await asyncio.to_thread(cache.store, result.request.url, content, etag, last_modified, result.content_hash)
+
+    async def fetch(self, request: CrawlRequest, host: _Host, semaphore: asyncio.Semaphore, stats: CrawlStats) -> CrawlResult:
+        """GET with per-host and global limits, retrying transient failures"""
+        result = CrawlResult(request)
+        start = time.perf_counter()
+        # SQLite and zlib work stays off the event loop
+        cached = await asyncio.to_thread(self.cache.lookup, request.url) if self.cache is not None else None
+        headers = {"User-Agent": self.user_agent}
+        if cached is not None:
+            headers.update(self.cache.conditional_headers(cached))
+        while True:
+            result.attempts += 1
+            retry_after = None
+            async with host.semaphore:
+                await host.wait_turn()
+                async with semaphore:
+                    try:
+                        response = await self._client().get(request.url, headers=headers)
+                        result.status = response.status_code
+                        result.url = str(response.url)
+                        result.error = None
+                        retry_after = response.headers.get("retry-after")
+                    except httpx.HTTPError as e:
+                        response = None
+                        result.status = None
+                        result.error = f"{type(e).__name__}: {e}"
+
+            retryable = result.status in RETRY_STATUSES or (result.status is None and result.error)
+            if not retryable or result.attempts > self.max_retries:
+                break
+            stats.retries += 1
+            await asyncio.sleep(self.backoff(result.attempts - 1, retry_after))
+
+        if response is not None:
+            await self._read(result, response, cached, stats)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async def crawl(self, seeds: Iterable[CrawlRequest], handler: Handler) -> CrawlStats:
+        """Visit seeds and whatever handler returns, until the frontier is empty or the budget runs out"""
+        stats = CrawlStats()
+        start = time.monotonic()
+        deadline = start + self.max_seconds
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        hosts: Dict[str, _Host] = {}
+        seen = set()
+        frontier: asyncio.Queue = asyncio.Queue()
+        tasks = set()
+
+        def enqueue(request: CrawlRequest):
+            request.url = normalize_url(request.url)
+            if request.url in seen:
+                stats.duplicates += 1
+                return
+            if request.depth > self.max_depth:
+                return
+            seen.add(request.url)
+            stats.queued += 1
+            frontier.put_nowait(request)
+
+        async def visit(request: CrawlRequest) -> Tuple[CrawlResult, Optional[Iterable[CrawlRequest]]]:
+            name = host_of(request.url)
+            host = hosts.get(name)
+            if host is None:
+                host = hosts[name] = _Host(self.per_host_concurrency, self.per_host_delay)
+            if not await self.allowed(request.url, host):
+                stats.robots_blocked += 1
+                return CrawlResult(request, error="disallowed by robots.txt"), None
+            result = await self.fetch(request, host, semaphore, stats)
+            if result.ok:
+                stats.fetched += 1
+            else:
+                stats.failed += 1
+                print(f"Crawl failed for {request.url}: {result.error or result.status}")
+            try:
+                follow = handler(result)
+                if inspect.isawaitable(follow):
+                    follow = await follow
+                return result, follow
+            except Exception as e:
+                print(f"Crawl handler error for {request.url}: {e}")
+                return result, None
+
+        for seed in seeds:
+            enqueue(seed)
+        try:
+            while not frontier.empty() or tasks:
+                while not frontier.empty():
+                    if len(tasks) + stats.fetched + stats.failed >= self.max_pages or time.monotonic() >= deadline:
+                        stats.over_budget += frontier.qsize()
+                        frontier = asyncio.Queue()
+                        break
+                    tasks.add(asyncio.ensure_future(visit(frontier.get_nowait())))
+                if not tasks:
+                    break
+                done, tasks = await asyncio.wait(tasks, timeout=max(0.0, deadline - time.monotonic()), return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Out of time: abandon the requests still in flight
+                    stats.over_budget += len(tasks) + frontier.qsize()
+                    break
+                for task in done:
+                    _, follow = task.result()
+                    for request in follow or ():
+                        enqueue(request)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        stats.hosts = len(hosts)
+        stats.seconds = time.monotonic() - start
+        return stats
+
+
+def create_crawler(client: Optional[httpx.AsyncClient] = None, user_agent: str = "Voice2Gov Bot/1.0") -> Crawler:
+    """Crawler configured from settings"""
+    return Crawler(
+        client=client,
+        user_agent=user_agent,
+        max_concurrency=settings.scraper_max_concurrency,
+        per_host_concurrency=settings.scraper_per_host_concurrency,
+        per_host_delay=settings.scraper_per_host_delay_seconds,
+        max_retries=settings.scraper_max_retries,
+        max_pages=settings.scraper_max_pages,
+        max_seconds=settings.scraper_max_seconds,
+        max_depth=settings.scraper_max_depth,
+        respect_robots=settings.scraper_respect_robots,
+        cache=page_cache if settings.scraper_cache_enabled else None
+    )
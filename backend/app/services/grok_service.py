@@ -5,12 +5,12 @@ Grok (X/Twitter AI) Service for Voice2Gov
 - Influencer tracking
 """
 
-import httpx
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import json
 
 from ..config import settings
+from .http_client import http_clients
 
 
 class GrokService:
@@ -30,26 +30,25 @@ class GrokService:
         if not self.is_configured():
             return None
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/{endpoint}",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json=data,
-                    timeout=60.0
-                )
-                
-                if response.status_code == 200:
-                    return response.json()
-                else:
-                    print(f"Grok API error: {response.status_code} - {response.text}")
-                    return None
-            except Exception as e:
-                print(f"Grok request error: {e}")
+        client = http_clients.get("grok")
+        try:
+            response = await client.post(
+                f"{self.base_url}/{endpoint}",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json=data
+            )
+            
+            if response.status_code == 200:
+                return response.json()
+            else:
+                print(f"Grok API error: {response.status_code} - {response.text}")
                 return None
+        except Exception as e:
+            print(f"Grok request error: {e}")
+            return None
     
     async def analyze_twitter_sentiment(self, tweets: List[str]) -> Dict[str, Any]:
         """Analyze sentiment of Twitter posts about Nigerian governance"""
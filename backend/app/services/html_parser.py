@@ -0,0 +1,377 @@
+"""
+HTML Parsing Service for Voice2Gov
+- One small document interface over interchangeable parser backends:
+  selectolax (lexbor), lxml, or BeautifulSoup with the stdlib html.parser
+- selectolax and lxml are optional; "auto" picks the fastest one installed
+- Page extraction (listing cards, follow-up links, contact details, clean text)
+  as plain functions over that interface
+- ParserPool runs extraction in worker processes so large pages never block
+  the event loop and several pages parse in parallel; small pages stay inline
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, List, Dict, Any, Iterable, Callable
+from urllib.parse import urljoin, urlsplit
+
+from bs4 import BeautifulSoup
+
+from ..config import settings
+from .contact_extractor import contact_extractor, Contacts
+
+
+# Links on a state site worth following for LGA / chairman contacts
+LGA_LINK = re.compile(r"local[-_ ]?gov|lgas?\b|chairm|council", re.I)
+NEXT_LINK = re.compile(r"^\s*(next|»|›|>>)", re.I)
+# Bump when extract_page's output changes, so cached parses are redone
+PARSE_VERSION = 2
+
+SENATOR_CARD = re.compile(r'senator|member|profile', re.I)
+MEMBER_CARD = re.compile(r'member|rep|profile', re.I)
+CARD_NAME = re.compile(r'name|title', re.I)
+CARD_TAGS = ('div', 'article')
+NAME_TAGS = ('h2', 'h3', 'h4', 'span')
+# Dropped before handing page text to the LLM
+BOILERPLATE_TAGS = ('script', 'style', 'nav', 'footer', 'header')
+
+
+class Node(ABC):
+    """The few tree operations the scrapers need, whatever the backend"""
+
+    @abstractmethod
+    def find_all(self, tags: Iterable[str], class_: Optional[re.Pattern] = None) -> List["Node"]:
+        """Descendants with one of tags whose class attribute matches class_"""
+
+    def find(self, tags: Iterable[str], class_: Optional[re.Pattern] = None) -> Optional["Node"]:
+        found = self.find_all(tags, class_)
+        return found[0] if found else None
+
+    @abstractmethod
+    def text(self, separator: str = "", strip: bool = False) -> str:
+        """Text content, joined by separator"""
+
+    @abstractmethod
+    def get(self, name: str) -> Optional[str]:
+        """Attribute value (multi-valued attributes such as class joined by spaces)"""
+
+    @abstractmethod
+    def remove(self, tags: Iterable[str]):
+        """Delete every descendant with one of tags, keeping the text after it"""
+
+
+def _class_matches(value: Optional[str], class_: Optional[re.Pattern]) -> bool:
+    return class_ is None or bool(value and class_.search(value))
+
+
+class _SoupNode(Node):
+    def __init__(self, element):
+        self.element = element
+
+    def find_all(self, tags, class_=None):
+        return [_SoupNode(e) for e in self.element.find_all(list(tags), class_=class_)]
+
+    def find(self, tags, class_=None):
+        element = self.element.find(list(tags), class_=class_)
+        return _SoupNode(element) if element is not None else None
+
+    def text(self, separator="", strip=False):
+        return self.element.get_text(separator, strip=strip)
+
+    def get(self, name):
+        value = self.element.get(name)
+        return " ".join(value) if isinstance(value, list) else value
+
+    def remove(self, tags):
+        for element in self.element(list(tags)):
+            element.decompose()
+
+
+class _LxmlNode(Node):
+    def __init__(self, element):
+        self.element = element
+
+    def _iter(self, tags, class_):
+        for element in self.element.iterdescendants(*tags):
+            if _class_matches(element.get("class"), class_):
+                yield element
+
+    def find_all(self, tags, class_=None):
+        return [_LxmlNode(e) for e in self._iter(tags, class_)]
+
+    def find(self, tags, class_=None):
+        element = next(self._iter(tags, class_), None)
+        return _LxmlNode(element) if element is not None else None
+
+    def text(self, separator="", strip=False):
+        # Skip script/style bodies, as BeautifulSoup's get_text does
+        strings = [
+            s for s in self.element.xpath(".//text()[not(parent::script) and not(parent::style)]")
+        ]
+        if strip:
+            strings = [s.strip() for s in strings if s.strip()]
+        return separator.join(strings)
+
+    def get(self, name):
+        return self.element.get(name)
+
+    def remove(self, tags):
+        for element in list(self.element.iterdescendants(*tags)):
+            element.drop_tree()
+
+
+class _LexborNode(Node):
+    def __init__(self, node):
+        self.node = node
+
+    def _iter(self, tags, class_):
+        for node in self.node.css(", ".join(tags)):
+            if _class_matches(node.attributes.get("class"), class_):
+                yield node
+
+    def find_all(self, tags, class_=None):
+        return [_LexborNode(n) for n in self._iter(tags, class_)]
+
+    def find(self, tags, class_=None):
+        node = next(self._iter(tags, class_), None)
+        return _LexborNode(node) if node is not None else None
+
+    def text(self, separator="", strip=False):
+        return self.node.text(separator=separator, strip=strip, skip_empty=strip)
+
+    def get(self, name):
+        return self.node.attributes.get(name)
+
+    def remove(self, tags):
+        for node in self.node.css(", ".join(tags)):
+            node.decompose()
+
+
+def _parse_soup(html: str) -> Node:
+    return _SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+def _parse_lxml(html: str) -> Node:
+    import lxml.html
+    if not html.strip():
+        html = "<html></html>"
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    return _LxmlNode(lxml.html.document_fromstring(html.encode("utf-8"), parser=parser))
+
+
+def _parse_lexbor(html: str) -> Node:
+    from selectolax.lexbor import LexborHTMLParser
+    tree = LexborHTMLParser(html)
+    # Script/style bodies are not page text (BeautifulSoup skips them too)
+    for node in tree.css("script, style"):
+        node.remove()
+    return _LexborNode(tree.root)
+
+
+# Fastest first; "auto" uses the first one installed
+BACKENDS: Dict[str, Callable[[str], Node]] = {
+    "selectolax": _parse_lexbor,
+    "lxml": _parse_lxml,
+    "html.parser": _parse_soup,
+}
+_BACKEND_MODULES = {"selectolax": "selectolax", "lxml": "lxml", "html.parser": "bs4"}
+
+
+def available_backends() -> List[str]:
+    return [name for name, module in _BACKEND_MODULES.items() if importlib.util.find_spec(module) is not None]
+
+
+def resolve_backend(name: str) -> str:
+    """Backend to use for a configured name, falling back to html.parser if it isn't installed"""
+    available = available_backends()
+    if name == "auto":
+        return available[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+    if name not in available:
+        print(f"{name} not installed; parsing HTML with html.parser")
+        return "html.parser"
+    return name
+
+
+def parse_html(html: str, backend: str = "html.parser") -> Node:
+    return BACKENDS[backend](html)
+
+
+def _fill_contacts(record: Dict[str, Any], contacts: Contacts):
+    """First state, party, email, phone and handle mentioned on a card"""
+    for key, found in (("state", contacts.states), ("party", contacts.parties), ("email", contacts.emails),
+                       ("phone", contacts.phones), ("twitter", contacts.handles)):
+        if found:
+            record[key] = found[0]
+
+
+def parse_senators(doc: Node, url: str) -> List[Dict[str, Any]]:
+    """Senator entries on one listing page"""
+    senators = []
+
+    # Look for senator cards/entries
+    # This would need to be adjusted based on actual website structure
+    for element in doc.find_all(CARD_TAGS, class_=SENATOR_CARD):
+        senator_data = {
+            "name": None,
+            "state": None,
+            "party": None,
+            "district": None,
+            "email": None,
+            "phone": None,
+            "twitter": None,
+            "photo_url": None,
+            "source_url": url
+        }
+
+        # Extract name
+        name_elem = element.find(NAME_TAGS, class_=CARD_NAME)
+        if name_elem:
+            senator_data["name"] = name_elem.text(strip=True)
+
+        # State, party and contact info from the card text
+        _fill_contacts(senator_data, contact_extractor.extract(element.text(separator=" ")))
+
+        # Extract photo
+        img = element.find(('img',))
+        if img and img.get('src'):
+            senator_data["photo_url"] = img.get('src')
+
+        if senator_data["name"]:
+            senators.append(senator_data)
+
+    return senators
+
+
+def parse_house_reps(doc: Node, url: str) -> List[Dict[str, Any]]:
+    """Member entries on one listing page"""
+    reps = []
+
+    # Similar extraction logic as senators
+    for element in doc.find_all(CARD_TAGS, class_=MEMBER_CARD):
+        rep_data = {
+            "name": None,
+            "state": None,
+            "constituency": None,
+            "party": None,
+            "email": None,
+            "phone": None,
+            "twitter": None,
+            "source_url": url
+        }
+
+        name_elem = element.find(NAME_TAGS, class_=CARD_NAME)
+        if name_elem:
+            rep_data["name"] = name_elem.text(strip=True)
+
+        _fill_contacts(rep_data, contact_extractor.extract(element.text(separator=" ")))
+
+        if rep_data["name"]:
+            reps.append(rep_data)
+
+    return reps
+
+
+def page_links(doc: Node, url: str, pattern: re.Pattern, by_text: bool = False) -> List[str]:
+    """Same-host links whose href (or text) matches pattern"""
+    host = urlsplit(url).netloc
+    links = []
+    for anchor in doc.find_all(('a',)):
+        href = anchor.get('href')
+        if href is None:
+            continue
+        target = anchor.text(strip=True) if by_text else href
+        if anchor.get('rel') == 'next' or pattern.search(target or ""):
+            link = urljoin(url, href)
+            if urlsplit(link).netloc == host:
+                links.append(link)
+    return links
+
+
+def extract_page(backend: str, html: str, kind: str, url: str) -> Dict[str, Any]:
+    """Everything a sweep needs from one page, as plain JSON-able data"""
+    doc = parse_html(html, backend)
+    if kind in ("senators", "house_reps"):
+        parse = parse_senators if kind == "senators" else parse_house_reps
+        return {"records": parse(doc, url), "links": page_links(doc, url, NEXT_LINK, by_text=True)}
+
+    text = doc.text()
+    # Separated, so names and numbers from adjacent elements don't run together
+    contacts = contact_extractor.extract(doc.text(separator=" "))
+    return {
+        "text": text[:2000],
+        "emails": contacts.emails,
+        "phones": contacts.phones,
+        "links": page_links(doc, url, LGA_LINK)
+    }
+
+
+def page_text(backend: str, html: str) -> str:
+    """Visible page text without scripts, navigation and footers, one text node per line"""
+    doc = parse_html(html, backend)
+    doc.remove(BOILERPLATE_TAGS)
+    return doc.text(separator='\n', strip=True)
+
+
+class ParserPool:
+    """Runs extraction functions on worker processes; pages under inline_bytes parse in-process"""
+
+    def __init__(self, backend: str = "auto", workers: int = 2, inline_bytes: int = 16384):
+        self.backend = resolve_backend(backend)
+        self.workers = workers
+        self.inline_bytes = inline_bytes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.inline = 0
+        self.offloaded = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: forking a process that runs the event loop and client threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], html: str, *args) -> Any:
+        """fn(backend, html, *args), in a worker process unless the page is small"""
+        if self.workers <= 0 or len(html) < self.inline_bytes:
+            self.inline += 1
+            return fn(self.backend, html, *args)
+        self.offloaded += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, self.backend, html, *args)
+        except BrokenProcessPool as e:
+            print(f"HTML parser pool failed ({e}); parsing in-process")
+            self._executor = None
+            return fn(self.backend, html, *args)
+
+    async def extract_page(self, kind: str, url: str, html: str) -> Dict[str, Any]:
+        return await self.run(extract_page, html, kind, url)
+
+    async def page_text(self, html: str) -> str:
+        return await self.run(page_text, html)
+
+    def warm_up(self):
+        """Start the worker processes now rather than on the first large page"""
+        if self.workers > 0:
+            executor = self._get_executor()
+            for future in [executor.submit(available_backends) for _ in range(self.workers)]:
+                future.result()
+
+    async def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+html_parser = ParserPool(
+    backend=settings.scraper_parser_backend,
+    workers=settings.scraper_parse_workers,
+    inline_bytes=settings.scraper_parse_inline_bytes
+)
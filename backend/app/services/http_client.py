@@ -0,0 +1,120 @@
+"""
+Shared HTTP Client Registry for Voice2Gov
+- One pooled httpx.AsyncClient per outbound service (openai, grok, scraper, twitter)
+- Keep-alive, per-service connection limits, HTTP/2 when h2 is installed
+- Created lazily or on FastAPI startup, closed on shutdown
+"""
+
+import asyncio
+import importlib.util
+from typing import Dict, Any, Optional, Set, Tuple
+import httpx
+
+from ..config import settings
+
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HttpClientRegistry:
+    """Registry of long-lived, pooled async HTTP clients"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 10.0,
+        timeout: float = 60.0,
+        http2: bool = True,
+        service_options: Optional[Dict[str, Dict[str, Any]]] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self.service_options = service_options or {}
+        self._clients: Dict[str, Tuple[httpx.AsyncClient, Optional[asyncio.AbstractEventLoop]]] = {}
+        # Closes of replaced clients still in flight (kept so they are not garbage-collected)
+        self._closing: Set[asyncio.Task] = set()
+
+    def _build(self, name: str, **options: Any) -> httpx.AsyncClient:
+        options = {**self.service_options.get(name, {}), **options}
+        options.setdefault("limits", self.limits)
+        options.setdefault("timeout", self.timeout)
+        options.setdefault("http2", self.http2)
+        return httpx.AsyncClient(**options)
+
+    def get(self, name: str = "default", **options: Any) -> httpx.AsyncClient:
+        """Shared client for a service; options only apply when it is first created"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(name)
+        if entry is not None:
+            client, client_loop = entry
+            # Pooled connections are bound to the loop that opened them
+            if not client.is_closed and (client_loop is None or client_loop is loop):
+                return client
+            self._discard(client, client_loop, loop)
+
+        client = self._build(name, **options)
+        self._clients[name] = (client, loop)
+        return client
+
+    @staticmethod
+    async def _aclose(client: httpx.AsyncClient):
+        try:
+            await client.aclose()
+        except Exception as e:
+            # The connections' own loop may already be closed; nothing left to release then
+            print(f"HTTP client close error: {e}")
+
+    def _discard(self, client: httpx.AsyncClient, client_loop: Optional[asyncio.AbstractEventLoop], loop: Optional[asyncio.AbstractEventLoop]):
+        """Close a client being replaced so its connection pool is released"""
+        if client.is_closed or (client_loop is not None and client_loop.is_closed()):
+            # A closed loop has already torn down the client's transports
+            return
+        if client_loop is not None and client_loop is not loop and client_loop.is_running():
+            # Still serving another thread: close it on its own loop
+            asyncio.run_coroutine_threadsafe(self._aclose(client), client_loop)
+        elif loop is not None:
+            task = loop.create_task(self._aclose(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run(self._aclose(client))
+
+    async def start(self):
+        """Open the clients for the known services"""
+        for name in ("openai", "grok", "scraper", "twitter"):
+            self.get(name)
+
+    async def close(self):
+        """Close every client and drop pooled connections"""
+        clients, self._clients = self._clients, {}
+        for client, _ in clients.values():
+            if not client.is_closed:
+                await client.aclose()
+
+
+# Singleton instance
+http_clients = HttpClientRegistry(
+    max_connections=settings.http_max_connections,
+    max_keepalive_connections=settings.http_max_keepalive_connections,
+    keepalive_expiry=settings.http_keepalive_expiry,
+    connect_timeout=settings.http_connect_timeout,
+    timeout=settings.http_timeout,
+    http2=settings.http_http2,
+    service_options={
+        "scraper": {
+            "follow_redirects": True,
+            "timeout": httpx.Timeout(settings.http_scraper_timeout, connect=settings.http_connect_timeout)
+        }
+    }
+)
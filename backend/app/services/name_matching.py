@@ -0,0 +1,42 @@
+"""
+Name Matching Helpers for Voice2Gov
+- Folds representative names to comparable tokens: no accents, punctuation
+  or honorifics, word order ignored
+- Shared by the scrape reconciler and the AI page extractor
+"""
+
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Tuple, Iterable
+
+
+# Honorifics and titles dropped before names are compared
+TITLES = {
+    "hon", "honourable", "honorable", "rt", "right", "sen", "senator", "distinguished", "dr", "prof",
+    "engr", "barr", "chief", "alhaji", "alhaja", "hajiya", "mr", "mrs", "ms", "dame", "sir", "arc",
+    "pastor", "rev", "otunba", "comrade", "gen", "rtd", "col", "capt", "amb", "mni", "ofr", "con"
+}
+NAME_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def name_tokens(name: str) -> Tuple[str, ...]:
+    """Lower-case name tokens without accents, punctuation or titles"""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    return tuple(token for token in NAME_TOKEN.findall(folded) if token not in TITLES)
+
+
+def name_key(tokens: Iterable[str]) -> str:
+    """Order-free key: "Akpabio Godswill" and "Godswill Akpabio" are the same name"""
+    return " ".join(sorted(tokens))
+
+
+def name_similarity(a: Tuple[str, ...], b: Tuple[str, ...], floor: float = 0.0) -> float:
+    """0..1; a dropped middle name still scores high. Scores below floor may be
+    returned as an upper bound instead, skipping the full comparison."""
+    shorter, longer = sorted((set(a), set(b)), key=len)
+    if len(shorter) >= 2 and shorter <= longer:
+        return 0.95
+    matcher = SequenceMatcher(None, name_key(a), name_key(b))
+    bound = matcher.quick_ratio()
+    return bound if bound < floor else matcher.ratio()
@@ -5,12 +5,49 @@ OpenAI Service for Voice2Gov
 - Summarization of citizen feedback
 """
 
-import httpx
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
 
 from ..config import settings
+from .http_client import http_clients
+
+
+# Returned by summarize_constitution when no answer could be generated
+CONSTITUTION_FALLBACK_ANSWER = "I could not locate the relevant constitutional guidance right now."
+
+DIGEST_SYSTEM_PROMPT = """You are a Nigerian civic engagement analyst.
+Create a professional digest summary of citizen feedback for elected officials.
+The summary should:
+- Highlight main concerns and themes
+- Note positive feedback
+- Identify constructive suggestions
+- Be respectful and professional
+- Include specific issues mentioned
+Write in clear, formal English suitable for government officials."""
+
+EXTRACT_PROMPT = """You are an expert at extracting Nigerian {rep_type} information from web pages.
+The content is one part of a longer page and may list many people; an entry at the very start
+or end may be cut off. Return a JSON array with one object per person in the content:
+- name: full name with title
+- party: political party (APC, PDP, LP, NNPP, etc.)
+- state: Nigerian state they represent
+- constituency: specific constituency or senatorial district
+- email: official email if found
+- phone: phone number if found
+- twitter: Twitter/X handle if found
+- bio: brief biography
+Use null for fields not found and [] if nobody is listed. Be accurate with Nigerian political context."""
+
+
+def parse_json_response(result: str) -> Any:
+    """json.loads a completion, tolerating a ```json code fence around it"""
+    clean_result = result.strip()
+    if clean_result.startswith("```"):
+        clean_result = clean_result.split("```")[1]
+        if clean_result.startswith("json"):
+            clean_result = clean_result[4:]
+    return json.loads(clean_result)
 
 
 class OpenAIService:
@@ -20,6 +57,10 @@ class OpenAIService:
         self.api_key = getattr(settings, 'openai_api_key', '')
         self.model = getattr(settings, 'openai_model', 'gpt-4-turbo-preview')
         self.base_url = "https://api.openai.com/v1"
+        # Running totals from the API's usage field
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
     
     def is_configured(self) -> bool:
         """Check if OpenAI is configured"""
@@ -30,32 +71,35 @@ class OpenAIService:
         if not self.is_configured():
             return None
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {self.api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "max_tokens": 2000
-                    },
-                    timeout=60.0
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data["choices"][0]["message"]["content"]
-                else:
-                    print(f"OpenAI API error: {response.status_code} - {response.text}")
-                    return None
-            except Exception as e:
-                print(f"OpenAI request error: {e}")
+        client = http_clients.get("openai")
+        try:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "model": self.model,
+                    "messages": messages,
+                    "temperature": temperature,
+                    "max_tokens": 2000
+                }
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                usage = data.get("usage") or {}
+                self.requests += 1
+                self.prompt_tokens += usage.get("prompt_tokens", 0)
+                self.completion_tokens += usage.get("completion_tokens", 0)
+                return data["choices"][0]["message"]["content"]
+            else:
+                print(f"OpenAI API error: {response.status_code} - {response.text}")
                 return None
+        except Exception as e:
+            print(f"OpenAI request error: {e}")
+            return None
     
     async def analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of a social media post"""
@@ -83,13 +127,7 @@ class OpenAIService:
         if result:
             try:
                 # Try to parse JSON from response
-                # Handle cases where the response might have markdown code blocks
-                clean_result = result.strip()
-                if clean_result.startswith("```"):
-                    clean_result = clean_result.split("```")[1]
-                    if clean_result.startswith("json"):
-                        clean_result = clean_result[4:]
-                return json.loads(clean_result)
+                return parse_json_response(result)
             except json.JSONDecodeError:
                 return {
                     "sentiment": "NEUTRAL",
@@ -116,73 +154,36 @@ class OpenAIService:
             results.append(result)
         return results
     
-    async def extract_representative_info(self, html_content: str, rep_type: str = "senator") -> Dict[str, Any]:
-        """Extract representative information from scraped HTML content"""
+    async def extract_representatives(self, content: str, rep_type: str = "senator") -> Optional[List[Dict[str, Any]]]:
+        """Every representative listed in a piece of page text; None if the request or its JSON failed"""
         messages = [
-            {
-                "role": "system",
-                "content": f"""You are an expert at extracting Nigerian {rep_type} information from web pages.
-                Extract and return a JSON object with:
-                - name: full name with title
-                - party: political party (APC, PDP, LP, NNPP, etc.)
-                - state: Nigerian state they represent
-                - constituency: specific constituency or senatorial district
-                - email: official email if found
-                - phone: phone number if found
-                - twitter: Twitter/X handle if found
-                - bio: brief biography
-                
-                Return null for fields not found. Be accurate with Nigerian political context."""
-            },
-            {
-                "role": "user",
-                "content": f"Extract {rep_type} information from this content:\n\n{html_content[:4000]}"
-            }
+            {"role": "system", "content": EXTRACT_PROMPT.format(rep_type=rep_type)},
+            {"role": "user", "content": f"Extract every {rep_type} from this content:\n\n{content}"}
         ]
-        
         result = await self._make_request(messages, temperature=0.2)
-        
-        if result:
-            try:
-                clean_result = result.strip()
-                if clean_result.startswith("```"):
-                    clean_result = clean_result.split("```")[1]
-                    if clean_result.startswith("json"):
-                        clean_result = clean_result[4:]
-                return json.loads(clean_result)
-            except json.JSONDecodeError:
-                return {"raw_content": result}
-        
-        return {}
+        if not result:
+            return None
+        try:
+            parsed = parse_json_response(result)
+        except (ValueError, IndexError):
+            return None
+        # Accept {"representatives": [...]} or a lone object as well as a bare array
+        if isinstance(parsed, dict):
+            lists = [value for value in parsed.values() if isinstance(value, list)]
+            parsed = lists[0] if lists else [parsed]
+        return [record for record in parsed if isinstance(record, dict)] if isinstance(parsed, list) else None
+    
+    async def extract_representative_info(self, html_content: str, rep_type: str = "senator") -> Dict[str, Any]:
+        """First representative found in content, or {}; whole pages are chunked and merged
+        by ai_extraction.ChunkedExtractor, and extract_representatives returns every record"""
+        from .ai_extraction import ai_extractor
+        result = await ai_extractor.extract(html_content, rep_type)
+        return result.records[0] if result.records else {}
     
     async def generate_digest_summary(self, posts: List[Dict]) -> str:
-        """Generate a summary digest from multiple social media posts"""
-        posts_text = "\n\n".join([
-            f"- {p.get('author', 'Unknown')}: {p.get('content', '')[:200]}"
-            for p in posts[:20]  # Limit to 20 posts
-        ])
-        
-        messages = [
-            {
-                "role": "system",
-                "content": """You are a Nigerian civic engagement analyst. 
-                Create a professional digest summary of citizen feedback for elected officials.
-                The summary should:
-                - Highlight main concerns and themes
-                - Note positive feedback
-                - Identify constructive suggestions
-                - Be respectful and professional
-                - Include specific issues mentioned
-                Write in clear, formal English suitable for government officials."""
-            },
-            {
-                "role": "user",
-                "content": f"Create a digest summary of these citizen posts:\n\n{posts_text}"
-            }
-        ]
-        
-        result = await self._make_request(messages, temperature=0.5)
-        return result or "Unable to generate summary at this time."
+        """Generate a summary digest from multiple social media posts (map-reduce over all of them)"""
+        from .social_digest import social_digests
+        return (await social_digests.summarize(posts)).summary
     
     async def translate_to_english(self, text: str, source_language: str = "auto") -> str:
         """Translate Nigerian languages to English"""
@@ -259,7 +260,7 @@ class OpenAIService:
             },
         ]
         result = await self._make_request(messages, temperature=0.3)
-        return result or "I could not locate the relevant constitutional guidance right now."
+        return result or CONSTITUTION_FALLBACK_ANSWER
 
 
 # Singleton instance
@@ -0,0 +1,199 @@
+"""
+Page Cache Service for Voice2Gov
+- Persistent on-disk HTTP cache for scraped pages, keyed by URL (SQLite file)
+- Bodies stored zlib-compressed with their ETag / Last-Modified and a content hash
+- Refetches send If-None-Match / If-Modified-Since; a 304 reuses the stored body
+- Parsed output is stored per content hash, so unchanged pages skip parsing
+- Size-bounded LRU eviction (scraper_cache_max_bytes) and a stats report
+- Methods block on SQLite and zlib; async callers run them with asyncio.to_thread,
+  and a lock serialises the worker threads on the one connection
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any
+
+from ..config import settings
+
+
+# Relative cache paths are resolved here, not against the process's working directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@dataclass
+class CachedPage:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: str
+    body: bytes  # compressed
+
+
+@dataclass
+class PageCacheStats:
+    lookups: int = 0
+    misses: int = 0
+    not_modified: int = 0  # 304 from the server
+    unchanged: int = 0  # 200 with the same content hash
+    changed: int = 0
+    stored: int = 0
+    evictions: int = 0
+    parses_skipped: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0  # bodies not re-sent thanks to a 304
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+class PageCache:
+    """URL -> compressed page, validators and parsed output, LRU-bounded by bytes"""
+
+    def __init__(self, path: str, max_bytes: int = 200_000_000):
+        self.path = os.path.join(BACKEND_DIR, os.path.expanduser(path))
+        self.max_bytes = max_bytes
+        self.stats = PageCacheStats()
+        self._db: Optional[sqlite3.Connection] = None
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    def _conn(self) -> sqlite3.Connection:
+        if self._db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_hash TEXT NOT NULL, "
+                "body BLOB NOT NULL, parsed TEXT, parsed_hash TEXT, size INTEGER NOT NULL, "
+                "fetched_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_pages_accessed_at ON pages (accessed_at)")
+            self._bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        return self._db
+
+    def lookup(self, url: str) -> Optional[CachedPage]:
+        """Stored page for url (marks it recently used)"""
+        with self._lock:
+            db = self._conn()
+            self.stats.lookups += 1
+            row = db.execute(
+                "SELECT etag, last_modified, content_hash, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                self.stats.misses += 1
+                return None
+            db.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (time.time(), url))
+            db.commit()
+            return CachedPage(url, row[0], row[1], row[2], row[3])
+
+    def conditional_headers(self, page: Optional[CachedPage]) -> Dict[str, str]:
+        headers = {}
+        if page is not None:
+            if page.etag:
+                headers["If-None-Match"] = page.etag
+            if page.last_modified:
+                headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def body(self, page: CachedPage) -> str:
+        return zlib.decompress(page.body).decode("utf-8", errors="replace")
+
+    def store(self, url: str, content: bytes, etag: Optional[str], last_modified: Optional[str], digest: str):
+        """Insert or replace a page; parsed output from an older body is dropped"""
+        body = zlib.compress(content, 6)
+        now = time.time()
+        with self._lock:
+            db = self._conn()
+            old = db.execute("SELECT size FROM pages WHERE url = ?", (url,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, content_hash, body, parsed, parsed_hash, size, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, NULL, NULL, ?, ?, ?)",
+                (url, etag, last_modified, digest, body, len(body), now, now)
+            )
+            self._bytes += len(body) - (old[0] if old else 0)
+            self.stats.stored += 1
+            self._evict(db)
+            db.commit()
+
+    def refresh(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Record new validators for a page whose body did not change"""
+        with self._lock:
+            db = self._conn()
+            db.execute(
+                "UPDATE pages SET etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified), fetched_at = ? WHERE url = ?",
+                (etag, last_modified, time.time(), url)
+            )
+            db.commit()
+
+    def parsed(self, url: str, digest: str) -> Optional[Any]:
+        """Parsed output stored for this exact body, if any"""
+        with self._lock:
+            row = self._conn().execute(
+                "SELECT parsed FROM pages WHERE url = ? AND parsed_hash = ?", (url, digest)
+            ).fetchone()
+            if row is None or row[0] is None:
+                return None
+            self.stats.parses_skipped += 1
+        return json.loads(row[0])
+
+    def store_parsed(self, url: str, digest: str, value: Any):
+        encoded = json.dumps(value)
+        with self._lock:
+            db = self._conn()
+            old = db.execute("SELECT parsed FROM pages WHERE url = ?", (url,)).fetchone()
+            if old is None:
+                return
+            db.execute("UPDATE pages SET parsed = ?, parsed_hash = ?, size = size + ? WHERE url = ?",
+                       (encoded, digest, len(encoded) - len(old[0] or ""), url))
+            self._bytes += len(encoded) - len(old[0] or "")
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection):
+        """Drop least recently used pages until under max_bytes"""
+        while self._bytes > self.max_bytes:
+            rows = db.execute("SELECT url, size FROM pages ORDER BY accessed_at LIMIT 100").fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for url, size in rows:
+                db.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._bytes -= size
+                self.stats.evictions += 1
+                if self._bytes <= self.max_bytes:
+                    break
+
+    def report(self) -> Dict[str, Any]:
+        """Counters since start-up plus what is on disk"""
+        with self._lock:
+            entries = self._conn().execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        stats = asdict(self.stats)
+        revalidations = self.stats.not_modified + self.stats.unchanged + self.stats.changed
+        return {
+            **stats,
+            "entries": entries,
+            "bytes_on_disk": self._bytes,
+            "max_bytes": self.max_bytes,
+            "unchanged_ratio": (self.stats.not_modified + self.stats.unchanged) / revalidations if revalidations else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Singleton instance
+page_cache = PageCache(settings.scraper_cache_path, settings.scraper_cache_max_bytes)
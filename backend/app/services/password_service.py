@@ -0,0 +1,90 @@
+"""
+Password Hashing Service for Voice2Gov
+- bcrypt hashing and verification on a bounded thread pool, off the event loop
+- Backpressure: new work is rejected once the pool queue is full (routes return 503)
+- Configurable bcrypt cost with transparent rehash on login when it changes
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+
+from ..config import settings
+
+
+class PasswordServiceOverloaded(Exception):
+    """Raised when the hashing queue is full"""
+
+
+class PasswordService:
+    """Runs bcrypt work on worker threads (bcrypt releases the GIL while hashing)"""
+
+    def __init__(self, rounds: int = 12, workers: int = 4, max_queue: int = 64):
+        # Pinning min/max to the configured cost makes any other cost "needs update"
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds
+        )
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Only touched from the event loop thread
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self._in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordServiceOverloaded("Password hashing queue is full")
+
+        self._in_flight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password at the configured cost"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Check a password; returns (valid, new hash if the stored one should be replaced)"""
+        valid, new_hash = await self._run(self.context.verify_and_update, password, password_hash)
+        if valid and new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "maxQueue": self.max_queue,
+            "inFlight": self._in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed
+        }
+
+    async def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+password_service = PasswordService(
+    rounds=settings.bcrypt_rounds,
+    workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue
+)
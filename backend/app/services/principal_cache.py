@@ -0,0 +1,195 @@
+"""
+Principal Cache Service for Voice2Gov
+- Short-TTL cache of the user projection get_current_user needs, keyed on user id
+- In-process LRU by default, Redis for multi-worker deployments
+- Tokens carry a version stamp; deactivation, role changes and password
+  resets bump users.token_version and invalidate the cached principal
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Optional, Iterable, Dict, Any, Set
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+
+from ..config import settings
+from ..models.user import User, UserRole
+from .cache_backends import InMemoryCacheBackend, RedisCacheBackend
+
+
+# Changes to these columns revoke every token issued before them
+REVOKING_COLUMNS = ("is_active", "role", "password_hash")
+
+PENDING_KEY = "principal_cache_invalidations"
+
+
+@dataclass
+class Principal:
+    """The authenticated user as seen by the routes"""
+    id: int
+    email: str
+    name: str
+    phone: Optional[str]
+    state: Optional[str]
+    lga: Optional[str]
+    role: UserRole
+    is_active: bool
+    is_verified: bool
+    created_at: Optional[datetime]
+    token_version: int
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            phone=user.phone,
+            state=user.state,
+            lga=user.lga,
+            role=user.role or UserRole.CITIZEN,
+            is_active=bool(user.is_active),
+            is_verified=bool(user.is_verified),
+            created_at=user.created_at,
+            token_version=user.token_version or 0
+        )
+
+    def dumps(self) -> str:
+        data = asdict(self)
+        data["role"] = self.role.value
+        data["created_at"] = self.created_at.isoformat() if self.created_at else None
+        return json.dumps(data)
+
+    @classmethod
+    def loads(cls, raw: str) -> "Principal":
+        data = json.loads(raw)
+        data["role"] = UserRole(data["role"])
+        if data["created_at"]:
+            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+
+class PrincipalCache:
+    """Principal lookups with hit/miss accounting; ttl_seconds <= 0 disables caching"""
+
+    def __init__(self, backend, ttl_seconds: int = 60):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # Deletes scheduled from sync code, kept so they are not garbage-collected
+        self._pending: Set[asyncio.Task] = set()
+
+    async def get(self, user_id: int) -> Optional[Principal]:
+        if self.ttl_seconds <= 0:
+            return None
+        try:
+            raw = await self.backend.get(str(user_id))
+        except Exception as e:
+            # Fall back to the database if the cache is unavailable
+            self.errors += 1
+            print(f"Principal cache get error: {e}")
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return Principal.loads(raw)
+
+    async def set(self, principal: Principal):
+        if self.ttl_seconds <= 0:
+            return
+        try:
+            await self.backend.set(str(principal.id), principal.dumps(), self.ttl_seconds)
+        except Exception as e:
+            self.errors += 1
+            print(f"Principal cache set error: {e}")
+
+    async def _delete(self, key: str):
+        try:
+            await self.backend.delete(key)
+        except Exception as e:
+            self.errors += 1
+            print(f"Principal cache delete error: {e}")
+
+    def invalidate(self, user_ids: Iterable[int]):
+        """Drop cached principals; callable from sync code such as session events"""
+        keys = [str(user_id) for user_id in user_ids]
+        discard = getattr(self.backend, "discard", None)
+        if discard is not None:
+            for key in keys:
+                discard(key)
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not None:
+            for key in keys:
+                task = loop.create_task(self._delete(key))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+        else:
+            for key in keys:
+                asyncio.run(self._delete(key))
+
+    async def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hitRate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_principal_cache() -> PrincipalCache:
+    """Build the cache for the configured backend"""
+    backend = None
+    if settings.principal_cache_backend == "redis" and settings.principal_cache_redis_url:
+        try:
+            backend = RedisCacheBackend(settings.principal_cache_redis_url, prefix="voice2gov:principals:")
+        except ImportError:
+            print("redis package not installed; falling back to in-process principal cache")
+    if backend is None:
+        backend = InMemoryCacheBackend(settings.principal_cache_max_entries)
+    return PrincipalCache(backend, settings.principal_cache_ttl_seconds)
+
+
+# Singleton instance
+principal_cache = create_principal_cache()
+
+
+def _bump_token_version(mapper, connection, target):
+    if any(get_history(target, column).has_changes() for column in REVOKING_COLUMNS):
+        target.token_version = (target.token_version or 0) + 1
+
+
+def _queue_invalidation(mapper, connection, target):
+    # Invalidate after commit; invalidating at flush would let readers re-cache the old row
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(PENDING_KEY, set()).add(target.id)
+
+
+def _invalidate_committed(session):
+    user_ids = session.info.pop(PENDING_KEY, None)
+    if user_ids:
+        principal_cache.invalidate(user_ids)
+
+
+def _discard_pending(session, previous_transaction):
+    session.info.pop(PENDING_KEY, None)
+
+
+event.listen(User, "before_update", _bump_token_version)
+event.listen(User, "after_update", _queue_invalidation)
+event.listen(User, "after_delete", _queue_invalidation)
+event.listen(Session, "after_commit", _invalidate_committed)
+event.listen(Session, "after_soft_rollback", _discard_pending)
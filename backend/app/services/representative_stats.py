@@ -0,0 +1,155 @@
+"""
+Representative Stats Service for Voice2Gov
+- Per-chamber counts of active representatives in one GROUP BY pass
+- Process-level cache invalidated on Representative writes or by TTL
+- Optional PostgreSQL materialized view refreshed on a schedule
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional, Dict
+from sqlalchemy import event, func, text
+from sqlalchemy.orm import Session
+
+from .. import database
+from ..config import settings
+from ..models.representative import Representative, Chamber
+
+
+# StatsResponse field for each chamber
+CHAMBER_STAT_FIELDS = {
+    Chamber.SENATE: "senators",
+    Chamber.HOUSE_OF_REPS: "house_reps",
+    Chamber.LGA_CHAIRMAN: "lga_chairmen",
+    Chamber.LGA_COUNCILLOR: "lga_councillors",
+    Chamber.STATE_ASSEMBLY: "state_assembly",
+    Chamber.GOVERNOR: "governors",
+}
+
+MATERIALIZED_VIEW = "representative_chamber_stats"
+
+
+class RepresentativeStatsService:
+    """Service for cached representative chamber statistics"""
+
+    def __init__(self, ttl_seconds: float = 300, use_materialized_view: bool = False, refresh_seconds: float = 300):
+        self.ttl_seconds = ttl_seconds
+        self.use_materialized_view = use_materialized_view
+        self.refresh_seconds = refresh_seconds
+        self._stats: Optional[Dict[str, int]] = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def invalidate(self):
+        """Drop the cached stats so the next request recomputes them"""
+        with self._lock:
+            self._stats = None
+            self._expires_at = 0.0
+
+    def _empty_stats(self) -> Dict[str, int]:
+        stats = {"total": 0}
+        stats.update({field: 0 for field in CHAMBER_STAT_FIELDS.values()})
+        return stats
+
+    def _matview_available(self, db: Session) -> bool:
+        return self.use_materialized_view and db.get_bind().dialect.name == "postgresql"
+
+    def compute(self, db: Session) -> Dict[str, int]:
+        """Count active representatives per chamber in a single query"""
+        if self._matview_available(db):
+            rows = db.execute(text(f"SELECT chamber, total FROM {MATERIALIZED_VIEW}")).all()
+            rows = [(Chamber(chamber), total) for chamber, total in rows]
+        else:
+            rows = (
+                db.query(Representative.chamber, func.count(Representative.id))
+                .filter(Representative.is_active == True)
+                .group_by(Representative.chamber)
+                .all()
+            )
+
+        stats = self._empty_stats()
+        for chamber, total in rows:
+            field = CHAMBER_STAT_FIELDS.get(chamber)
+            if field:
+                stats[field] = int(total)
+            stats["total"] += int(total)
+        return stats
+
+    def get_stats(self, db: Session) -> Dict[str, int]:
+        """Cached chamber stats, recomputed after TTL or invalidation"""
+        with self._lock:
+            if self._stats is not None and time.monotonic() < self._expires_at:
+                return dict(self._stats)
+
+        stats = self.compute(db)
+        with self._lock:
+            self._stats = stats
+            self._expires_at = time.monotonic() + self.ttl_seconds
+        return dict(stats)
+
+    def create_materialized_view(self, bind):
+        """Create the rollup materialized view (PostgreSQL only)"""
+        if bind.dialect.name != "postgresql":
+            return
+        with bind.begin() as conn:
+            conn.execute(text(
+                f"CREATE MATERIALIZED VIEW IF NOT EXISTS {MATERIALIZED_VIEW} AS "
+                "SELECT chamber, COUNT(*) AS total FROM representatives "
+                "WHERE is_active = true GROUP BY chamber"
+            ))
+            # A unique index lets the view be refreshed concurrently
+            conn.execute(text(
+                f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{MATERIALIZED_VIEW}_chamber ON {MATERIALIZED_VIEW} (chamber)"
+            ))
+
+    def refresh_materialized_view(self):
+        """Refresh the rollup view and drop the in-process cache"""
+        bind = database.engine
+        if bind is None or bind.dialect.name != "postgresql":
+            return
+        with bind.connect() as conn:
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {MATERIALIZED_VIEW}"))
+        self.invalidate()
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                await asyncio.to_thread(self.refresh_materialized_view)
+            except Exception as e:
+                print(f"Representative stats refresh error: {e}")
+
+    async def start(self):
+        """Create and start refreshing the materialized view, if enabled"""
+        if not self.use_materialized_view or database.engine is None or self._task is not None:
+            return
+        try:
+            await asyncio.to_thread(self.create_materialized_view, database.engine)
+        except Exception as e:
+            print(f"Could not create {MATERIALIZED_VIEW}: {e}")
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+# Singleton instance
+representative_stats = RepresentativeStatsService(
+    ttl_seconds=settings.representative_stats_ttl_seconds,
+    use_materialized_view=settings.representative_stats_materialized_view,
+    refresh_seconds=settings.representative_stats_refresh_seconds
+)
+
+
+def _invalidate_on_write(mapper, connection, target):
+    representative_stats.invalidate()
+
+
+for _event in ("after_insert", "after_update", "after_delete"):
+    event.listen(Representative, _event, _invalidate_on_write)
@@ -0,0 +1,338 @@
+"""
+Scrape Reconciliation Service for Voice2Gov
+- Matches senator / House member records from ScraperService.run_full_scrape
+  to existing Representative rows: candidates are blocked by (state, chamber),
+  exact normalised names match by dict lookup, the rest by fuzzy similarity
+- Profile fields and contacts are compared by content hash, so a record whose
+  scraped values are already stored costs no write and keeps its updated_at
+- Only changed columns and new contacts are written, as executemany
+  statements in one transaction, and every change goes into the report
+- Unmatched and ambiguous records are reported for review, never inserted
+- LGA contact pages list no names, so they are not reconciled here
+"""
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field, asdict
+from difflib import SequenceMatcher
+from typing import Optional, List, Dict, Any, Tuple, Iterable
+from urllib.parse import urljoin
+
+from sqlalchemy import bindparam, select, update
+
+from .. import database
+from ..config import settings
+from ..models.representative import Representative, ContactInfo, State, Chamber, ContactType
+from .contact_extractor import normalize_phone
+from .name_matching import name_tokens, name_key, name_similarity
+from .representative_stats import representative_stats
+from .search_service import search_service
+
+
+# Scrape result key -> chamber
+SCRAPED_CHAMBERS = {
+    "senators": Chamber.SENATE,
+    "house_reps": Chamber.HOUSE_OF_REPS,
+}
+# Scraped field -> Representative column, per chamber
+PROFILE_FIELDS = {
+    Chamber.SENATE: {"party": "party", "district": "senatorial_district", "photo_url": "photo_url"},
+    Chamber.HOUSE_OF_REPS: {"party": "party", "constituency": "constituency", "photo_url": "photo_url"},
+}
+CONTACT_FIELDS = {"email": ContactType.EMAIL, "phone": ContactType.PHONE, "twitter": ContactType.TWITTER}
+
+def content_hash(values: Iterable[Any]) -> str:
+    """Stable digest of field values, for change detection"""
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        digest.update(repr(value).encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def contact_key(contact_type: ContactType, value: str) -> str:
+    """Comparable form of a contact value: lower-case email/handle, E.164 phone"""
+    value = value.strip()
+    if contact_type == ContactType.PHONE:
+        return normalize_phone(value) or value
+    if contact_type == ContactType.TWITTER:
+        return value.lstrip("@").lower()
+    return value.lower()
+
+
+@dataclass
+class Candidate:
+    """An existing representative, as loaded for matching"""
+    id: int
+    name: str
+    tokens: Tuple[str, ...]
+    profile: Dict[str, Any]
+    # contact type -> {comparable value: (contact id, is_primary, value as stored)}
+    contacts: Dict[ContactType, Dict[str, Tuple[int, bool, str]]] = field(default_factory=dict)
+
+
+@dataclass
+class ReconcileReport:
+    """Outcome of one reconcile() call"""
+    scraped: int = 0
+    matched: int = 0
+    exact: int = 0
+    fuzzy: int = 0
+    merged: int = 0
+    ambiguous: int = 0
+    unmatched: int = 0
+    unchanged: int = 0
+    profiles_updated: int = 0
+    contacts_added: int = 0
+    contacts_demoted: int = 0
+    match_seconds: float = 0.0
+    seconds: float = 0.0
+    # {"representative_id", "name", "field", "old", "new"}
+    changes: List[Dict[str, Any]] = field(default_factory=list)
+    unmatched_records: List[Dict[str, Any]] = field(default_factory=list)
+    ambiguous_records: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def matched_per_second(self) -> float:
+        return self.scraped / self.match_seconds if self.match_seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "matchedPerSecond": round(self.matched_per_second, 1)}
+
+
+class Block:
+    """Candidates for one (state, chamber): exact keys plus a token index for fuzzy lookups"""
+
+    def __init__(self):
+        self.candidates: List[Candidate] = []
+        self.by_key: Dict[str, List[Candidate]] = {}
+        self.by_token: Dict[str, List[Candidate]] = {}
+
+    def add(self, candidate: Candidate):
+        self.candidates.append(candidate)
+        self.by_key.setdefault(name_key(candidate.tokens), []).append(candidate)
+        for token in set(candidate.tokens):
+            self.by_token.setdefault(token, []).append(candidate)
+
+
+class ScrapeReconciler:
+    """Change-only reconciliation of scrape results into representatives"""
+
+    def __init__(self, threshold: float = 0.85, margin: float = 0.05):
+        self.threshold = threshold
+        self.margin = margin
+
+    def _load(self, connection) -> Dict[Tuple[Optional[str], Chamber], Block]:
+        """Active senators and members with their contacts, blocked by (state, chamber)"""
+        reps = Representative.__table__
+        columns = sorted({column for fields in PROFILE_FIELDS.values() for column in fields.values()})
+        rows = connection.execute(
+            select(reps.c.id, reps.c.name, reps.c.chamber, State.__table__.c.name.label("state"),
+                   *(reps.c[column] for column in columns))
+            .join(State.__table__, State.__table__.c.id == reps.c.state_id)
+            .where(reps.c.chamber.in_(list(SCRAPED_CHAMBERS.values())), reps.c.is_active.isnot(False))
+        )
+        blocks: Dict[Tuple[Optional[str], Chamber], Block] = {}
+        by_id: Dict[int, Candidate] = {}
+        for row in rows:
+            mapping = row._mapping
+            candidate = Candidate(
+                id=row.id, name=row.name, tokens=name_tokens(row.name),
+                profile={column: mapping[column] for column in columns}
+            )
+            by_id[row.id] = candidate
+            blocks.setdefault((row.state, row.chamber), Block()).add(candidate)
+            # Records without a state fall back to every candidate in the chamber
+            blocks.setdefault((None, row.chamber), Block()).add(candidate)
+
+        contacts = ContactInfo.__table__
+        for row in connection.execute(
+            select(contacts.c.id, contacts.c.representative_id, contacts.c.contact_type, contacts.c.value, contacts.c.is_primary)
+            .join(reps, reps.c.id == contacts.c.representative_id)
+            .where(reps.c.chamber.in_(list(SCRAPED_CHAMBERS.values())))
+        ):
+            candidate = by_id.get(row.representative_id)
+            if candidate is not None:
+                candidate.contacts.setdefault(row.contact_type, {})[contact_key(row.contact_type, row.value)] = (
+                    row.id, bool(row.is_primary), row.value
+                )
+        return blocks
+
+    def match(self, block: Block, tokens: Tuple[str, ...]) -> Tuple[Optional[Candidate], bool, bool]:
+        """(candidate, exact, ambiguous) for one scraped name within its block"""
+        exact = block.by_key.get(name_key(tokens))
+        if exact:
+            return (exact[0], True, False) if len(exact) == 1 else (None, True, True)
+
+        # Fuzzy: only candidates sharing at least one name token
+        seen, scored = set(), []
+        for token in set(tokens):
+            for candidate in block.by_token.get(token, ()):
+                if candidate.id not in seen:
+                    seen.add(candidate.id)
+                    # Anything under threshold - margin can neither match nor make a match ambiguous
+                    scored.append((name_similarity(tokens, candidate.tokens, self.threshold - self.margin), candidate))
+        if not scored:
+            # A typo in every token: compare against the whole (small) block
+            key = name_key(tokens)
+            matcher = SequenceMatcher(None, key)
+            for candidate in block.candidates:
+                matcher.set_seq1(name_key(candidate.tokens))
+                if matcher.real_quick_ratio() >= self.threshold and matcher.quick_ratio() >= self.threshold:
+                    scored.append((matcher.ratio(), candidate))
+        scored.sort(key=lambda item: -item[0])
+        if not scored or scored[0][0] < self.threshold:
+            return None, False, False
+        if len(scored) > 1 and scored[1][0] > scored[0][0] - self.margin:
+            return None, False, True
+        return scored[0][1], False, False
+
+    def _scraped_values(self, chamber: Chamber, record: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[ContactType, str]]:
+        profile = {}
+        for key, column in PROFILE_FIELDS[chamber].items():
+            value = record.get(key)
+            if value:
+                if column == "photo_url" and record.get("source_url") and not value.startswith(("http://", "https://")):
+                    value = urljoin(record["source_url"], value)
+                profile[column] = value.strip()
+        contacts = {
+            contact_type: record[key].strip() for key, contact_type in CONTACT_FIELDS.items() if record.get(key)
+        }
+        return profile, contacts
+
+    def plan(self, blocks: Dict[Tuple[Optional[str], Chamber], Block], results: Dict[str, Any], report: ReconcileReport):
+        """Match every scraped record; returns {candidate id: (candidate, profile, contacts)}"""
+        planned: Dict[int, Tuple[Candidate, Dict[str, Any], Dict[ContactType, str]]] = {}
+        # The same spelling turns up on many pages; match it once per block
+        matched: Dict[Tuple[Optional[str], Chamber, str], Tuple[Optional[Candidate], bool, bool]] = {}
+        for kind, chamber in SCRAPED_CHAMBERS.items():
+            for record in results.get(kind) or []:
+                if not record.get("name"):
+                    continue
+                report.scraped += 1
+                key = (record.get("state"), chamber, record["name"])
+                if key not in matched:
+                    block = blocks.get(key[:2])
+                    tokens = name_tokens(record["name"])
+                    matched[key] = self.match(block, tokens) if block and tokens else (None, False, False)
+                candidate, exact, ambiguous = matched[key]
+                if candidate is None:
+                    if ambiguous:
+                        report.ambiguous += 1
+                        report.ambiguous_records.append(record)
+                    else:
+                        report.unmatched += 1
+                        report.unmatched_records.append(record)
+                    continue
+
+                report.matched += 1
+                if exact:
+                    report.exact += 1
+                else:
+                    report.fuzzy += 1
+                profile, contacts = self._scraped_values(chamber, record)
+                if candidate.id in planned:
+                    # The same person on several pages: first value seen for each field wins
+                    report.merged += 1
+                    _, seen_profile, seen_contacts = planned[candidate.id]
+                    for column, value in profile.items():
+                        seen_profile.setdefault(column, value)
+                    for contact_type, value in contacts.items():
+                        seen_contacts.setdefault(contact_type, value)
+                else:
+                    planned[candidate.id] = (candidate, profile, contacts)
+        return planned
+
+    def diff(self, planned, report: ReconcileReport):
+        """Profile updates grouped by changed columns, contacts to add, primaries to demote"""
+        updates: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        added: List[Dict[str, Any]] = []
+        demoted: List[int] = []
+        for candidate, profile, contacts in planned.values():
+            columns = sorted(profile)
+            stored_contacts = {
+                contact_type: contact_key(contact_type, value) in candidate.contacts.get(contact_type, {})
+                for contact_type, value in contacts.items()
+            }
+            if (content_hash(profile[column] for column in columns) == content_hash(candidate.profile[column] for column in columns)
+                    and all(stored_contacts.values())):
+                report.unchanged += 1
+                continue
+
+            changed = tuple(column for column in columns if profile[column] != candidate.profile[column])
+            if changed:
+                updates.setdefault(changed, []).append({"b_id": candidate.id, **{f"b_{column}": profile[column] for column in changed}})
+                report.profiles_updated += 1
+                for column in changed:
+                    report.changes.append({
+                        "representative_id": candidate.id, "name": candidate.name,
+                        "field": column, "old": candidate.profile[column], "new": profile[column]
+                    })
+
+            for contact_type, value in contacts.items():
+                if stored_contacts[contact_type]:
+                    continue
+                existing = candidate.contacts.get(contact_type, {})
+                # The scraped value is the current one: it becomes primary
+                old_primaries = [(contact_id, stored) for contact_id, primary, stored in existing.values() if primary]
+                demoted.extend(contact_id for contact_id, _ in old_primaries)
+                added.append({
+                    "representative_id": candidate.id, "contact_type": contact_type, "value": value,
+                    "is_primary": True, "is_verified": False
+                })
+                report.changes.append({
+                    "representative_id": candidate.id, "name": candidate.name, "field": contact_type.value.lower(),
+                    "old": old_primaries[0][1] if old_primaries else None, "new": value
+                })
+        report.contacts_added += len(added)
+        report.contacts_demoted += len(demoted)
+        return updates, added, demoted
+
+    def _write(self, connection, updates, added: List[Dict[str, Any]], demoted: List[int], report: ReconcileReport):
+        reps, contacts = Representative.__table__, ContactInfo.__table__
+        # One executemany per set of changed columns; updated_at moves only on these rows
+        for columns, rows in updates.items():
+            connection.execute(
+                update(reps).where(reps.c.id == bindparam("b_id"))
+                .values({column: bindparam(f"b_{column}") for column in columns}),
+                rows
+            )
+        if demoted:
+            connection.execute(
+                update(contacts).where(contacts.c.id == bindparam("b_id")).values(is_primary=False),
+                [{"b_id": contact_id} for contact_id in demoted]
+            )
+        if added:
+            connection.execute(contacts.insert(), added)
+
+    def reconcile(self, results: Dict[str, Any], engine=None, dry_run: bool = False) -> ReconcileReport:
+        """Match scrape results to representatives and write only what changed, in one transaction"""
+        engine = engine or database.engine
+        report = ReconcileReport()
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            blocks = self._load(connection)
+            match_start = time.perf_counter()
+            planned = self.plan(blocks, results, report)
+            report.match_seconds = time.perf_counter() - match_start
+            updates, added, demoted = self.diff(planned, report)
+            if not dry_run:
+                self._write(connection, updates, added, demoted, report)
+        if updates and not dry_run:
+            # Core updates skip the mapper listeners that keep these in sync
+            search_service.reindex_representatives(engine, [row["b_id"] for rows in updates.values() for row in rows])
+            representative_stats.invalidate()
+        report.seconds = time.perf_counter() - start
+        return report
+
+    async def reconcile_async(self, results: Dict[str, Any], engine=None, dry_run: bool = False) -> ReconcileReport:
+        """reconcile() off the event loop"""
+        return await asyncio.to_thread(self.reconcile, results, engine, dry_run)
+
+
+# Singleton instance
+scrape_reconciler = ScrapeReconciler(
+    threshold=settings.scraper_match_threshold,
+    margin=settings.scraper_match_margin
+)
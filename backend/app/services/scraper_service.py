@@ -3,16 +3,66 @@ Web Scraping Service for Voice2Gov
 - Scrape NASS website for representative info
 - Extract contact information from government websites
 - Gather public data about elected officials
+- Sweeps NASS and all 36 state (+ FCT) government sites concurrently via the crawl engine
+- Unchanged pages (304 or same content hash) reuse their cached parse output
+- Pages are parsed by the HTML parser pool, off the event loop
+- AI extraction covers long pages in concurrent, overlapping chunks
+- Optionally reconciles the results into representatives, writing only changes
 """
 
-import httpx
-from bs4 import BeautifulSoup
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-import re
+from urllib.parse import urlsplit
 import asyncio
 
 from .openai_service import openai_service
+from .http_client import http_clients
+from .crawler import create_crawler, CrawlRequest, CrawlResult
+from .html_parser import html_parser, LGA_LINK, PARSE_VERSION
+from .scrape_reconciler import scrape_reconciler
+from .ai_extraction import ai_extractor
+
+
+# State government websites (FCT is the FCT Administration)
+STATE_GOVERNMENT_SITES = {
+    "Abia": "https://abiastate.gov.ng",
+    "Adamawa": "https://adamawastate.gov.ng",
+    "Akwa Ibom": "https://akwaibomstate.gov.ng",
+    "Anambra": "https://anambrastate.gov.ng",
+    "Bauchi": "https://bauchistate.gov.ng",
+    "Bayelsa": "https://bayelsastate.gov.ng",
+    "Benue": "https://benuestate.gov.ng",
+    "Borno": "https://bornostate.gov.ng",
+    "Cross River": "https://crossriverstate.gov.ng",
+    "Delta": "https://deltastate.gov.ng",
+    "Ebonyi": "https://ebonyistate.gov.ng",
+    "Edo": "https://edostate.gov.ng",
+    "Ekiti": "https://ekitistate.gov.ng",
+    "Enugu": "https://enugustate.gov.ng",
+    "FCT": "https://fcta.gov.ng",
+    "Gombe": "https://gombestate.gov.ng",
+    "Imo": "https://imostate.gov.ng",
+    "Jigawa": "https://jigawastate.gov.ng",
+    "Kaduna": "https://kadunastate.gov.ng",
+    "Kano": "https://kanostate.gov.ng",
+    "Katsina": "https://katsinastate.gov.ng",
+    "Kebbi": "https://kebbistate.gov.ng",
+    "Kogi": "https://kogistate.gov.ng",
+    "Kwara": "https://kwarastate.gov.ng",
+    "Lagos": "https://lagosstate.gov.ng",
+    "Nasarawa": "https://nasarawastate.gov.ng",
+    "Niger": "https://nigerstate.gov.ng",
+    "Ogun": "https://ogunstate.gov.ng",
+    "Ondo": "https://ondostate.gov.ng",
+    "Osun": "https://osunstate.gov.ng",
+    "Oyo": "https://oyostate.gov.ng",
+    "Plateau": "https://plateaustate.gov.ng",
+    "Rivers": "https://riversstate.gov.ng",
+    "Sokoto": "https://sokotostate.gov.ng",
+    "Taraba": "https://tarabastate.gov.ng",
+    "Yobe": "https://yobestate.gov.ng",
+    "Zamfara": "https://zamfarastate.gov.ng",
+}
 
 
 class ScraperService:
@@ -30,166 +80,31 @@ class ScraperService:
             "house": "https://nassnig.org",
             "inec": "https://inecnigeria.org"
         }
+        self.state_sites = dict(STATE_GOVERNMENT_SITES)
+        self.crawler = create_crawler(user_agent=self.headers["User-Agent"])
+        self.parser = html_parser
     
     async def _fetch_page(self, url: str) -> Optional[str]:
         """Fetch a web page"""
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            try:
-                response = await client.get(url, headers=self.headers, timeout=30.0)
-                if response.status_code == 200:
-                    return response.text
-                else:
-                    print(f"Failed to fetch {url}: {response.status_code}")
-                    return None
-            except Exception as e:
-                print(f"Error fetching {url}: {e}")
+        client = http_clients.get("scraper")
+        try:
+            response = await client.get(url, headers=self.headers)
+            if response.status_code == 200:
+                return response.text
+            else:
+                print(f"Failed to fetch {url}: {response.status_code}")
                 return None
-    
-    def _extract_emails(self, text: str) -> List[str]:
-        """Extract email addresses from text"""
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text)
-        # Filter out common false positives
-        valid_emails = [e for e in emails if not e.endswith('.png') and not e.endswith('.jpg')]
-        return list(set(valid_emails))
-    
-    def _extract_phones(self, text: str) -> List[str]:
-        """Extract Nigerian phone numbers from text"""
-        # Nigerian phone patterns
-        patterns = [
-            r'\+234\s*\d{3}\s*\d{3}\s*\d{4}',  # +234 xxx xxx xxxx
-            r'\+234\d{10}',                      # +234xxxxxxxxxx
-            r'0[789]0\s*\d{4}\s*\d{4}',         # 0x0 xxxx xxxx
-            r'0[789]0\d{8}',                     # 0x0xxxxxxxx
-        ]
-        
-        phones = []
-        for pattern in patterns:
-            phones.extend(re.findall(pattern, text))
-        
-        return list(set(phones))
-    
-    def _extract_twitter_handles(self, text: str) -> List[str]:
-        """Extract Twitter handles from text"""
-        pattern = r'@([A-Za-z0-9_]{1,15})'
-        handles = re.findall(pattern, text)
-        return list(set(handles))
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
     
     async def scrape_nass_senators(self) -> List[Dict[str, Any]]:
         """Scrape senator information from NASS website"""
-        senators = []
-        
-        # Try to fetch the senators page
-        url = f"{self.sources['nass']}/senators"
-        html = await self._fetch_page(url)
-        
-        if not html:
-            # Try alternative URL
-            url = f"{self.sources['senate']}/senators"
-            html = await self._fetch_page(url)
-        
-        if html:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Look for senator cards/entries
-            # This would need to be adjusted based on actual website structure
-            senator_elements = soup.find_all(['div', 'article'], class_=re.compile(r'senator|member|profile', re.I))
-            
-            for element in senator_elements:
-                senator_data = {
-                    "name": None,
-                    "state": None,
-                    "party": None,
-                    "district": None,
-                    "email": None,
-                    "phone": None,
-                    "twitter": None,
-                    "photo_url": None,
-                    "source_url": url
-                }
-                
-                # Extract name
-                name_elem = element.find(['h2', 'h3', 'h4', 'span'], class_=re.compile(r'name|title', re.I))
-                if name_elem:
-                    senator_data["name"] = name_elem.get_text(strip=True)
-                
-                # Extract other info from text
-                text = element.get_text()
-                
-                # Find state
-                for state in ["Lagos", "Kano", "Rivers", "FCT", "Kaduna"]:  # Would use full state list
-                    if state in text:
-                        senator_data["state"] = state
-                        break
-                
-                # Find party
-                for party in ["APC", "PDP", "LP", "NNPP", "APGA"]:
-                    if party in text:
-                        senator_data["party"] = party
-                        break
-                
-                # Extract contact info
-                emails = self._extract_emails(text)
-                if emails:
-                    senator_data["email"] = emails[0]
-                
-                phones = self._extract_phones(text)
-                if phones:
-                    senator_data["phone"] = phones[0]
-                
-                twitters = self._extract_twitter_handles(text)
-                if twitters:
-                    senator_data["twitter"] = twitters[0]
-                
-                # Extract photo
-                img = element.find('img')
-                if img and img.get('src'):
-                    senator_data["photo_url"] = img['src']
-                
-                if senator_data["name"]:
-                    senators.append(senator_data)
-        
-        return senators
+        return (await self.sweep(self.seeds(senators=True, house_reps=False, states=[])))["senators"]
     
     async def scrape_house_reps(self) -> List[Dict[str, Any]]:
         """Scrape House of Representatives members"""
-        reps = []
-        
-        url = f"{self.sources['house']}/members"
-        html = await self._fetch_page(url)
-        
-        if html:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # Similar extraction logic as senators
-            rep_elements = soup.find_all(['div', 'article'], class_=re.compile(r'member|rep|profile', re.I))
-            
-            for element in rep_elements:
-                rep_data = {
-                    "name": None,
-                    "state": None,
-                    "constituency": None,
-                    "party": None,
-                    "email": None,
-                    "phone": None,
-                    "twitter": None,
-                    "source_url": url
-                }
-                
-                name_elem = element.find(['h2', 'h3', 'h4', 'span'], class_=re.compile(r'name|title', re.I))
-                if name_elem:
-                    rep_data["name"] = name_elem.get_text(strip=True)
-                
-                text = element.get_text()
-                
-                emails = self._extract_emails(text)
-                if emails:
-                    rep_data["email"] = emails[0]
-                
-                if rep_data["name"]:
-                    reps.append(rep_data)
-        
-        return reps
+        return (await self.sweep(self.seeds(senators=False, house_reps=True, states=[])))["house_reps"]
     
     async def scrape_with_ai(self, url: str, rep_type: str = "senator") -> List[Dict[str, Any]]:
         """Use AI to help extract representative info from any webpage"""
@@ -198,21 +113,15 @@ class ScraperService:
         if not html:
             return []
         
-        # Clean HTML and extract text
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Remove script and style elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-            element.decompose()
-        
-        text = soup.get_text(separator=' ', strip=True)
+        # Clean HTML and extract text (off the event loop for large pages)
+        text = await self.parser.page_text(html)
         
-        # Use OpenAI to extract information
+        # Use OpenAI on overlapping chunks of the whole page, merged per person
         if openai_service.is_configured():
-            result = await openai_service.extract_representative_info(text[:4000], rep_type)
-            if result and not result.get('error'):
-                result['source_url'] = url
-                return [result]
+            result = await ai_extractor.extract(text, rep_type)
+            for record in result.records:
+                record['source_url'] = url
+            return result.records
         
         return []
     
@@ -241,38 +150,80 @@ class ScraperService:
     
     async def scrape_state_government(self, state: str) -> Dict[str, Any]:
         """Scrape state government website for LGA chairman info"""
-        # State government website patterns
-        state_domains = {
-            "Lagos": "lagosstate.gov.ng",
-            "Kano": "kanostate.gov.ng",
-            "Rivers": "riversstate.gov.ng",
-            # Add more states
-        }
-        
-        domain = state_domains.get(state)
-        if not domain:
+        if state not in self.state_sites:
             return {"error": f"No known website for {state} State"}
         
-        url = f"https://{domain}/local-government"
-        html = await self._fetch_page(url)
+        states = (await self.sweep(self.seeds(senators=False, house_reps=False, states=[state])))["lga_chairmen"]
+        if states:
+            return states[0]
+        return {"error": f"Could not fetch data from {urlsplit(self.state_sites[state]).netloc}"}
+    
+    def seeds(self, senators: bool = True, house_reps: bool = True, states: Optional[List[str]] = None) -> List[CrawlRequest]:
+        """Start pages for a sweep; states=None means every state"""
+        seeds = []
+        if senators:
+            seeds.append(CrawlRequest(
+                f"{self.sources['nass']}/senators", "senators",
+                meta={"fallback": f"{self.sources['senate']}/senators"}
+            ))
+        if house_reps:
+            seeds.append(CrawlRequest(f"{self.sources['house']}/members", "house_reps"))
+        for state in (self.state_sites if states is None else states):
+            base = self.state_sites[state]
+            seeds.append(CrawlRequest(f"{base}/local-government", "state", meta={"state": state}))
+            seeds.append(CrawlRequest(f"{base}/", "state", meta={"state": state}))
+        return seeds
+    
+    async def _handle_page(self, result: CrawlResult, results: Dict[str, Any]) -> List[CrawlRequest]:
+        """Parse one crawled page into results; returns the pages to visit next"""
+        request = result.request
+        if not result.ok:
+            fallback = request.meta.get("fallback")
+            return [CrawlRequest(fallback, request.kind)] if fallback else []
         
-        if html:
-            # Extract LGA information
-            soup = BeautifulSoup(html, 'html.parser')
-            text = soup.get_text()
-            
-            return {
-                "state": state,
-                "source_url": url,
-                "raw_text": text[:2000],
-                "emails": self._extract_emails(text),
-                "phones": self._extract_phones(text)
-            }
+        url = result.url or request.url
+        cache = self.crawler.cache
+        parsed = None
+        parse_key = f"{result.content_hash}:{PARSE_VERSION}"
+        if result.unchanged and cache is not None:
+            # Same body (and parser) as last time: reuse what it parsed to
+            parsed = await asyncio.to_thread(cache.parsed, request.url, parse_key)
+        if parsed is None:
+            parsed = await self.parser.extract_page(request.kind, url, result.text)
+            results["pages_parsed"] += 1
+            if cache is not None and result.content_hash:
+                await asyncio.to_thread(cache.store_parsed, request.url, parse_key, parsed)
         
-        return {"error": f"Could not fetch data from {domain}"}
+        if request.kind in ("senators", "house_reps"):
+            results[request.kind].extend(parsed["records"])
+            # Listing pages: the next page is a sibling, not a level deeper
+            return [CrawlRequest(link, request.kind, depth=request.depth) for link in parsed["links"]]
+        
+        state = request.meta["state"]
+        entry = results["lga_chairmen"].setdefault(state, {
+            "state": state, "source_url": url, "source_urls": [], "raw_text": "", "emails": [], "phones": []
+        })
+        entry["source_urls"].append(url)
+        if LGA_LINK.search(urlsplit(url).path) and not entry["raw_text"]:
+            entry["source_url"] = url
+            entry["raw_text"] = parsed["text"]
+        entry["emails"] = sorted(set(entry["emails"]) | set(parsed["emails"]))
+        entry["phones"] = sorted(set(entry["phones"]) | set(parsed["phones"]))
+        return [
+            CrawlRequest(link, "state", meta={"state": state}, depth=request.depth + 1)
+            for link in parsed["links"]
+        ]
     
-    async def run_full_scrape(self) -> Dict[str, Any]:
-        """Run a full scrape of all known sources"""
+    async def sweep(self, seeds: List[CrawlRequest]) -> Dict[str, Any]:
+        """Crawl seeds (and the listing/LGA pages they link to) concurrently"""
+        results = {"senators": [], "house_reps": [], "lga_chairmen": {}, "pages_parsed": 0}
+        stats = await self.crawler.crawl(seeds, lambda result: self._handle_page(result, results))
+        results["lga_chairmen"] = list(results["lga_chairmen"].values())
+        results["crawl"] = {**stats.to_dict(), "pages_parsed": results.pop("pages_parsed")}
+        return results
+    
+    async def run_full_scrape(self, reconcile: bool = False, engine=None) -> Dict[str, Any]:
+        """Run a full scrape of all known sources; reconcile writes the changes to representatives"""
         results = {
             "senators": [],
             "house_reps": [],
@@ -282,14 +233,23 @@ class ScraperService:
         }
         
         try:
-            results["senators"] = await self.scrape_nass_senators()
+            results.update(await self.sweep(self.seeds()))
         except Exception as e:
-            results["errors"].append(f"Senators scrape failed: {e}")
+            results["errors"].append(f"Full scrape failed: {e}")
         
-        try:
-            results["house_reps"] = await self.scrape_house_reps()
-        except Exception as e:
-            results["errors"].append(f"House Reps scrape failed: {e}")
+        crawl = results.get("crawl") or {}
+        if crawl.get("failed"):
+            results["errors"].append(f"{crawl['failed']} pages could not be fetched")
+        if crawl.get("over_budget"):
+            results["errors"].append(f"Crawl budget reached; {crawl['over_budget']} pages not visited")
+        
+        # Partial sweeps are fine to reconcile: nothing is ever deleted or deactivated
+        if reconcile and (results["senators"] or results["house_reps"]):
+            try:
+                report = await scrape_reconciler.reconcile_async(results, engine)
+                results["reconciliation"] = report.to_dict()
+            except Exception as e:
+                results["errors"].append(f"Reconciliation failed: {e}")
         
         return results
 
@@ -0,0 +1,269 @@
+"""
+Search Service for Voice2Gov
+- Fuzzy, ranked search over petition titles and representative names
+- PostgreSQL: pg_trgm GIN indexes with word_similarity ranking
+- Other databases (SQLite/tests): in-memory trigram inverted index
+"""
+
+import asyncio
+import re
+import threading
+import unicodedata
+from typing import Optional, List, Dict, Set, Tuple, Any
+from sqlalchemy import Select, bindparam, event, select, func, or_, case, literal, text, false
+from sqlalchemy.orm import Session
+
+from .. import database
+from ..config import settings
+from ..models.petition import Petition
+from ..models.representative import Representative
+
+
+# Trigram GIN indexes created on PostgreSQL, as (index name, table, column)
+TRIGRAM_INDEXES = [
+    ("ix_petitions_title_trgm", "petitions", "title"),
+    ("ix_representatives_name_trgm", "representatives", "name"),
+    ("ix_representatives_constituency_trgm", "representatives", "constituency"),
+    ("ix_representatives_senatorial_district_trgm", "representatives", "senatorial_district"),
+]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize(value: Optional[str]) -> str:
+    """Lowercase and strip diacritics (e.g. Yoruba tone marks)"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    return TOKEN_PATTERN.findall(normalize(value))
+
+
+def trigrams(token: str) -> Set[str]:
+    """pg_trgm-style trigrams: two leading spaces, one trailing"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class InvertedIndex:
+    """In-memory token index with trigram lookup for typo tolerance"""
+
+    def __init__(self):
+        self.ready = False
+        self._docs: Dict[int, Set[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._trigram_tokens: Dict[str, Set[str]] = {}
+        self._lock = threading.RLock()
+
+    def add(self, doc_id: int, *values: Optional[str]):
+        tokens = set()
+        for value in values:
+            tokens.update(tokenize(value))
+        with self._lock:
+            self.remove(doc_id)
+            self._docs[doc_id] = tokens
+            for token in tokens:
+                if token not in self._postings:
+                    self._postings[token] = set()
+                    for gram in trigrams(token):
+                        self._trigram_tokens.setdefault(gram, set()).add(token)
+                self._postings[token].add(doc_id)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            for token in self._docs.pop(doc_id, ()):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(doc_id)
+                    if not postings:
+                        del self._postings[token]
+                        for gram in trigrams(token):
+                            self._trigram_tokens.get(gram, set()).discard(token)
+
+    def _similar_tokens(self, query_token: str, threshold: float) -> Dict[str, float]:
+        """Indexed tokens similar to query_token, with their similarity"""
+        query_grams = trigrams(query_token)
+        overlaps: Dict[str, int] = {}
+        for gram in query_grams:
+            for token in self._trigram_tokens.get(gram, ()):
+                overlaps[token] = overlaps.get(token, 0) + 1
+
+        matches = {}
+        for token, shared in overlaps.items():
+            score = shared / (len(query_grams) + len(trigrams(token)) - shared)
+            if token.startswith(query_token):
+                # Prefix matches behave like the old ILIKE substring search
+                score = max(score, 0.9)
+            if score >= threshold:
+                matches[token] = score
+        return matches
+
+    def search(self, term: str, threshold: float, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Documents matching every query token, best first"""
+        query_tokens = tokenize(term)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            scores: Optional[Dict[int, float]] = None
+            for query_token in query_tokens:
+                best: Dict[int, float] = {}
+                for token, similarity in self._similar_tokens(query_token, threshold).items():
+                    for doc_id in self._postings.get(token, ()):
+                        if similarity > best.get(doc_id, 0.0):
+                            best[doc_id] = similarity
+                if scores is None:
+                    scores = best
+                else:
+                    scores = {doc_id: scores[doc_id] + s for doc_id, s in best.items() if doc_id in scores}
+                if not scores:
+                    return []
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(doc_id, score / len(query_tokens)) for doc_id, score in ranked[:limit]]
+
+
+class SearchService:
+    """Service for indexed petition and representative search"""
+
+    def __init__(self, similarity_threshold: float = 0.4, max_candidates: int = 1000):
+        self.similarity_threshold = similarity_threshold
+        self.max_candidates = max_candidates
+        self.indexes = {
+            "petitions": InvertedIndex(),
+            "representatives": InvertedIndex(),
+        }
+
+    def _uses_trigram(self, db) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    def create_indexes(self, bind):
+        """Create pg_trgm and its GIN indexes (PostgreSQL only)"""
+        if bind.dialect.name != "postgresql":
+            return
+        with bind.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            for name, table, column in TRIGRAM_INDEXES:
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column} gin_trgm_ops)"
+                ))
+
+    async def start(self):
+        if database.engine is None:
+            return
+        try:
+            await asyncio.to_thread(self.create_indexes, database.engine)
+        except Exception as e:
+            print(f"Could not create trigram search indexes: {e}")
+
+    async def _set_threshold(self, db):
+        # SET LOCAL only lasts for the current transaction
+        await db.execute(text(f"SET LOCAL pg_trgm.word_similarity_threshold = {float(self.similarity_threshold)}"))
+
+    def build_index(self, session: Session, name: str):
+        """Load an in-memory index from the database (sync Session)"""
+        index = self.indexes[name]
+        if index.ready:
+            return
+        if name == "petitions":
+            rows = session.query(Petition.id, Petition.title).all()
+        else:
+            rows = session.query(
+                Representative.id,
+                Representative.name,
+                Representative.constituency,
+                Representative.senatorial_district
+            ).all()
+        for row in rows:
+            index.add(row[0], *row[1:])
+        index.ready = True
+
+    def reindex_representatives(self, bind, ids: List[int]):
+        """Refresh in-memory entries for rows changed by Core statements, which skip the mapper listeners"""
+        index = self.indexes["representatives"]
+        if not index.ready or not ids:
+            return
+        reps = Representative.__table__
+        with bind.connect() as conn:
+            rows = conn.execute(
+                select(reps.c.id, reps.c.name, reps.c.constituency, reps.c.senatorial_district)
+                .where(reps.c.id.in_(ids))
+            ).all()
+        for row in rows:
+            index.add(row[0], *row[1:])
+
+    async def _filter_in_memory(self, db, stmt: Select, name: str, id_column, term: str) -> Tuple[Select, Any]:
+        if not self.indexes[name].ready:
+            await db.run_sync(self.build_index, name)
+        matches = self.indexes[name].search(term, self.similarity_threshold)
+        if not matches:
+            return stmt.where(false()), None
+        ids = [doc_id for doc_id, _ in matches]
+        # Every match goes to the caller's filters (inlined, so no bound-parameter
+        # limit applies); only the best max_candidates get a rank, the rest rank 0
+        ranked = ids[:self.max_candidates]
+        rank = case({doc_id: len(ranked) - position for position, doc_id in enumerate(ranked)}, value=id_column, else_=0)
+        return stmt.where(id_column.in_(bindparam("search_ids", ids, expanding=True, literal_execute=True))), rank
+
+    async def filter_petitions(self, db, stmt: Select, term: str) -> Tuple[Select, Any]:
+        """Restrict a Petition select to search matches; returns (select, rank expression)"""
+        if not self._uses_trigram(db):
+            return await self._filter_in_memory(db, stmt, "petitions", Petition.id, term)
+
+        await self._set_threshold(db)
+        rank = func.word_similarity(term, Petition.title)
+        stmt = stmt.where(or_(
+            Petition.title.ilike(f"%{term}%"),
+            literal(term).op("<%")(Petition.title)
+        ))
+        return stmt, rank
+
+    async def filter_representatives(self, db, stmt: Select, term: str) -> Tuple[Select, Any]:
+        """Restrict a Representative select to search matches; returns (select, rank expression)"""
+        if not self._uses_trigram(db):
+            return await self._filter_in_memory(db, stmt, "representatives", Representative.id, term)
+
+        await self._set_threshold(db)
+        columns = [Representative.name, Representative.constituency, Representative.senatorial_district]
+        rank = func.greatest(*[func.coalesce(func.word_similarity(term, c), 0) for c in columns])
+        conditions = []
+        for column in columns:
+            conditions.append(column.ilike(f"%{term}%"))
+            conditions.append(literal(term).op("<%")(column))
+        return stmt.where(or_(*conditions)), rank
+
+
+# Singleton instance
+search_service = SearchService(
+    similarity_threshold=settings.search_similarity_threshold,
+    max_candidates=settings.search_max_candidates
+)
+
+
+def _index_petition(mapper, connection, target):
+    index = search_service.indexes["petitions"]
+    if index.ready:
+        index.add(target.id, target.title)
+
+
+def _index_representative(mapper, connection, target):
+    index = search_service.indexes["representatives"]
+    if index.ready:
+        index.add(target.id, target.name, target.constituency, target.senatorial_district)
+
+
+def _unindex(name):
+    def listener(mapper, connection, target):
+        search_service.indexes[name].remove(target.id)
+    return listener
+
+
+event.listen(Petition, "after_insert", _index_petition)
+event.listen(Petition, "after_update", _index_petition)
+event.listen(Petition, "after_delete", _unindex("petitions"))
+event.listen(Representative, "after_insert", _index_representative)
+event.listen(Representative, "after_update", _index_representative)
+event.listen(Representative, "after_delete", _unindex("representatives"))
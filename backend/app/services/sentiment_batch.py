@@ -0,0 +1,242 @@
+"""
+Batch Sentiment Service for Voice2Gov
+- Many posts per chat completion, each tagged with its id, answered as a JSON array
+- Batches run under a concurrency limit (sentiment_concurrency)
+- Batches whose output fails to parse are split in half and retried
+- Results are written back onto social_posts in bulk, adjusting the hourly rollups
+- Optional lexicon pre-classifier labels clear-cut posts without an LLM call
+"""
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import bindparam, select, update
+
+from .. import database
+from ..config import settings
+from ..models.social import SocialPost, Sentiment
+from .openai_service import openai_service, parse_json_response
+from .social_rollup import social_rollups, rollup_key
+from .sentiment_lexicon import sentiment_lexicon
+
+
+SYSTEM_PROMPT = """You are a sentiment analysis expert for Nigerian social media content.
+You will receive a JSON array of posts, each {"id": ..., "text": ...}.
+Return ONLY a JSON array with one object per post, in any order:
+{"id": <the post's id>, "sentiment": "POSITIVE" | "NEGATIVE" | "NEUTRAL" | "CONSTRUCTIVE",
+ "score": <float from -1 (very negative) to 1 (very positive)>, "topics": [<up to 3 short topics>]}
+Use CONSTRUCTIVE for constructive criticism. Consider Nigerian context, Pidgin English and local expressions."""
+
+
+@dataclass
+class SentimentRunStats:
+    """Outcome of one analyze_pending() call"""
+    posts: int = 0
+    prelabelled: int = 0
+    analysed: int = 0
+    failed: int = 0
+    requests: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def posts_per_second(self) -> float:
+        return self.analysed / self.seconds if self.seconds else 0.0
+
+    @property
+    def tokens_per_post(self) -> float:
+        return (self.prompt_tokens + self.completion_tokens) / self.analysed if self.analysed else 0.0
+
+
+def _result(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Validate one array element; None if it is unusable"""
+    try:
+        sentiment = Sentiment(str(item["sentiment"]).upper())
+        score = max(-1.0, min(1.0, float(item.get("score", 0))))
+    except (KeyError, TypeError, ValueError):
+        return None
+    topics = item.get("topics") or []
+    if not isinstance(topics, list):
+        topics = [topics]
+    return {"sentiment": sentiment, "score": score, "topics": [str(topic) for topic in topics][:5]}
+
+
+class SentimentBatchAnalyzer:
+    """Scores posts many-per-request and stores the results"""
+
+    def __init__(
+        self,
+        llm=None,
+        batch_size: int = 25,
+        concurrency: int = 4,
+        max_post_chars: int = 1000,
+        prefilter=None
+    ):
+        self.llm = llm or openai_service
+        self.prefilter = prefilter
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_post_chars = max_post_chars
+
+    def build_messages(self, posts: List[Tuple[int, str]]) -> List[Dict[str, str]]:
+        items = [{"id": post_id, "text": (text or "")[:self.max_post_chars]} for post_id, text in posts]
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(items, ensure_ascii=False)}
+        ]
+
+    def parse(self, result: Optional[str], ids: List[int]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """id -> analysis for the requested ids; None if the output is not a usable JSON array"""
+        if not result:
+            return None
+        try:
+            items = parse_json_response(result)
+        except (json.JSONDecodeError, IndexError):
+            return None
+        if not isinstance(items, list):
+            return None
+
+        wanted = {str(post_id): post_id for post_id in ids}
+        results = {}
+        for item in items:
+            if not isinstance(item, dict) or str(item.get("id")) not in wanted:
+                continue
+            analysis = _result(item)
+            if analysis is not None:
+                results[wanted[str(item["id"])]] = analysis
+        return results
+
+    async def _analyze_batch(
+        self,
+        posts: List[Tuple[int, str]],
+        semaphore: asyncio.Semaphore,
+        stats: SentimentRunStats
+    ) -> Dict[int, Dict[str, Any]]:
+        async with semaphore:
+            result = await self.llm._make_request(self.build_messages(posts), temperature=0.3)
+        parsed = self.parse(result, [post_id for post_id, _ in posts])
+
+        if parsed is None:
+            if len(posts) == 1:
+                return {}
+            # Unparseable output: split so one bad post or a truncated answer costs half a batch
+            stats.retries += 1
+            middle = len(posts) // 2
+            halves = await asyncio.gather(
+                self._analyze_batch(posts[:middle], semaphore, stats),
+                self._analyze_batch(posts[middle:], semaphore, stats)
+            )
+            return {**halves[0], **halves[1]}
+
+        missing = [post for post in posts if post[0] not in parsed]
+        if missing and len(missing) < len(posts):
+            # Retry only the posts the model skipped
+            stats.retries += 1
+            parsed.update(await self._analyze_batch(missing, semaphore, stats))
+        return parsed
+
+    async def analyze(self, posts: List[Tuple[int, str]], stats: Optional[SentimentRunStats] = None) -> Dict[int, Dict[str, Any]]:
+        """Score (id, text) pairs; posts that never parse are left out"""
+        stats = stats or SentimentRunStats()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [posts[i:i + self.batch_size] for i in range(0, len(posts), self.batch_size)]
+        results: Dict[int, Dict[str, Any]] = {}
+        for batch_results in await asyncio.gather(*[self._analyze_batch(batch, semaphore, stats) for batch in batches]):
+            results.update(batch_results)
+        return results
+
+    def write_back(self, results: Dict[int, Dict[str, Any]], engine=None) -> int:
+        """Store results in one transaction; returns rows updated"""
+        if not results:
+            return 0
+        engine = engine or database.engine
+        table = SocialPost.__table__
+        ids = sorted(results)
+
+        with engine.begin() as connection:
+            # Core updates bypass the mapper events, so adjust the rollups here
+            current = select(
+                table.c.id, table.c.posted_at, table.c.representative_id, table.c.platform, table.c.sentiment
+            ).where(table.c.id.in_(ids)).order_by(table.c.id)
+            if connection.dialect.name == "postgresql":
+                current = current.with_for_update()
+            deltas: Dict[Any, int] = {}
+            found = []
+            for row in connection.execute(current):
+                new_sentiment = results[row.id]["sentiment"]
+                old_key = rollup_key(row.posted_at, row.representative_id, row.platform, row.sentiment)
+                new_key = rollup_key(row.posted_at, row.representative_id, row.platform, new_sentiment)
+                if old_key != new_key:
+                    deltas[old_key] = deltas.get(old_key, 0) - 1
+                    deltas[new_key] = deltas.get(new_key, 0) + 1
+                found.append(row.id)
+
+            if not found:
+                return 0
+            connection.execute(
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values(sentiment=bindparam("b_sentiment"), sentiment_score=bindparam("b_score"), topics=bindparam("b_topics")),
+                [
+                    {
+                        "b_id": post_id,
+                        "b_sentiment": results[post_id]["sentiment"],
+                        "b_score": results[post_id]["score"],
+                        "b_topics": json.dumps(results[post_id]["topics"])
+                    }
+                    for post_id in found
+                ]
+            )
+            social_rollups.apply(connection, deltas)
+        return len(found)
+
+    async def analyze_pending(self, limit: int = 5000, engine=None) -> SentimentRunStats:
+        """Score up to limit posts that have no sentiment yet and store the results"""
+        engine = engine or database.engine
+        table = SocialPost.__table__
+        stats = SentimentRunStats()
+        start = time.perf_counter()
+        usage_before = (self.llm.requests, self.llm.prompt_tokens, self.llm.completion_tokens)
+
+        def load():
+            with engine.connect() as connection:
+                return [tuple(row) for row in connection.execute(
+                    select(table.c.id, table.c.content).where(table.c.sentiment.is_(None)).order_by(table.c.id).limit(limit)
+                )]
+
+        posts = await asyncio.to_thread(load)
+        stats.posts = len(posts)
+        results: Dict[int, Dict[str, Any]] = {}
+        if self.prefilter is not None:
+            labelled, posts = self.prefilter.split(posts)
+            results = {
+                post_id: {"sentiment": label.sentiment, "score": label.score, "topics": []}
+                for post_id, label in labelled.items()
+            }
+            stats.prelabelled = len(results)
+        results.update(await self.analyze(posts, stats))
+        stats.analysed = await asyncio.to_thread(self.write_back, results, engine)
+        stats.failed = stats.posts - len(results)
+
+        stats.requests = self.llm.requests - usage_before[0]
+        stats.prompt_tokens = self.llm.prompt_tokens - usage_before[1]
+        stats.completion_tokens = self.llm.completion_tokens - usage_before[2]
+        stats.seconds = time.perf_counter() - start
+        print(
+            f"Sentiment: {stats.analysed}/{stats.posts} posts ({stats.prelabelled} by lexicon) in {stats.seconds:.1f}s "
+            f"({stats.posts_per_second:.1f}/s, {stats.tokens_per_post:.0f} tokens/post, {stats.failed} failed)"
+        )
+        return stats
+
+
+# Singleton instance
+sentiment_analyzer = SentimentBatchAnalyzer(
+    batch_size=settings.sentiment_batch_size,
+    concurrency=settings.sentiment_concurrency,
+    max_post_chars=settings.sentiment_max_post_chars,
+    prefilter=sentiment_lexicon if settings.sentiment_lexicon_enabled else None
+)
@@ -0,0 +1,194 @@
+"""
+Lexicon Sentiment Service for Voice2Gov
+- In-process pre-classifier over an English + Nigerian Pidgin lexicon
+- Phrase-first matching (e.g. "no light", "don fail", "well done"), negation flips
+- Labels confident posts directly; ambiguous ones are escalated to the LLM
+- Confidence threshold is sentiment_lexicon_threshold
+"""
+
+from dataclasses import dataclass
+from itertools import compress
+from typing import Optional, List, Dict, Tuple
+
+from ..config import settings
+from ..models.social import Sentiment
+
+
+# term -> valence; multi-word entries are matched before their words
+VALENCE: Dict[str, float] = {
+    # English, positive
+    "thank you": 2.0, "thanks": 1.5, "thank": 1.5, "well done": 2.5, "good job": 2.5, "kudos": 2.0,
+    "commend": 2.0, "commendable": 2.0, "appreciate": 2.0, "appreciated": 2.0, "great": 1.5,
+    "excellent": 2.5, "impressive": 2.0, "impressed": 2.0, "proud": 1.5, "good": 1.0, "progress": 1.0,
+    "improved": 1.5, "improvement": 1.0, "congratulations": 2.0, "congrats": 2.0, "delivered": 1.5,
+    "completed": 1.0, "commissioned": 1.0, "support": 0.5, "happy": 1.5, "grateful": 2.0, "bless": 1.5,
+    "god bless": 2.0, "keep it up": 2.5, "working": 0.5, "transparent": 1.5, "honest": 1.5,
+    # English, negative
+    "corrupt": -2.5, "corruption": -2.5, "failed": -2.0, "failure": -2.0, "fail": -1.5, "useless": -2.5,
+    "shame": -2.0, "shameful": -2.5, "disappointed": -2.0, "disappointing": -2.0, "lies": -2.0,
+    "liar": -2.5, "lie": -1.5, "suffer": -2.0, "suffering": -2.0, "hunger": -1.5, "poverty": -1.5,
+    "scam": -2.5, "fraud": -2.5, "embezzle": -2.5, "embezzled": -2.5, "embezzlement": -2.5,
+    "looting": -2.5, "looters": -2.5, "loot": -2.0, "incompetent": -2.5, "clueless": -2.5,
+    "bad": -1.5, "terrible": -2.5, "worst": -2.5, "insecurity": -2.0, "kidnap": -2.0,
+    "kidnapped": -2.0, "kidnapping": -2.0, "bandits": -2.0, "killed": -2.0, "killings": -2.0,
+    "abandoned": -2.0, "neglect": -2.0, "neglected": -2.0, "potholes": -1.5, "pothole": -1.5,
+    "flood": -1.0, "blackout": -2.0, "angry": -2.0, "tired": -1.5, "wicked": -2.5, "thieves": -2.5,
+    "thief": -2.5, "bad road": -2.0, "no light": -2.0, "no water": -2.0, "no salary": -2.0,
+    "unpaid": -2.0, "nothing": -0.5, "greedy": -2.5, "selfish": -2.0,
+    # Nigerian Pidgin
+    "don fail": -2.5, "e no good": -2.0, "no good": -1.5, "wahala": -1.5, "nawa": -1.5,
+    "shege": -2.0, "ode": -2.0, "mumu": -2.0, "ole": -2.5, "chop money": -2.5, "dem chop": -2.0,
+    "wetin una dey do": -2.0, "una no get shame": -3.0, "e don tey": -1.0, "suffer suffer": -2.5,
+    "we dey suffer": -2.5, "dey suffer": -2.0, "no show face": -2.0, "never show face": -2.0,
+    "japa": -1.0, "weldone": 2.5, "well done o": 2.5, "e choke": 2.0, "e sweet": 2.0, "sweet me": 2.0,
+    "this one sweet": 2.0, "gbam": 1.5, "correct person": 2.0, "na correct": 1.5, "na beta": 1.5,
+    "e dey work": 1.5, "we thank you": 2.5, "oga well done": 2.5, "more grease": 2.0,
+    "more grease to your elbow": 2.5, "bless you": 2.0, "carry go": 1.5,
+}
+
+# Cues that the post asks for or proposes something
+CONSTRUCTIVE = {
+    "suggest", "suggestion", "recommend", "recommendation", "propose", "proposal", "kindly",
+    "please fix", "should consider", "we need", "could you", "can you", "how about", "consider",
+    "abeg fix", "make una fix", "una fit", "make dem", "please look into", "look into", "should",
+    "request", "appeal", "urge"
+}
+
+NEGATORS = {"not", "no", "never", "nor", "isn't", "wasn't", "don't", "didn't", "doesn't", "no be", "never be", "nobody"}
+
+# Punctuation to spaces; apostrophes stay inside words. NUL separates posts in a
+# batch (str.split() treats the ASCII record separators as whitespace)
+_RECORD = "\x00"
+_SEPARATORS = str.maketrans({c: " " for c in "!\"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\n\t\r"})
+
+
+@dataclass
+class LexiconLabel:
+    sentiment: Sentiment
+    score: float  # -1..1
+    confidence: float  # 0..1
+
+
+def _label(positive: float, negative: float, cues: int, matched: int) -> Optional[LexiconLabel]:
+    if not matched:
+        return None
+    net = positive - negative
+    total = positive + negative
+    # Agreement between the signals times how much evidence there is
+    confidence = (abs(net) / total if total else 0.0) * (total / (total + 1.5))
+    score = max(-1.0, min(1.0, net / 4.0))
+
+    if cues and net <= 0:
+        # Asking for a fix, even with complaints attached
+        sentiment = Sentiment.CONSTRUCTIVE
+        confidence = min(1.0, cues / (cues + 0.5)) * (1.0 if net > -4 else 0.7)
+    elif net > 0:
+        sentiment = Sentiment.POSITIVE
+    elif net < 0:
+        sentiment = Sentiment.NEGATIVE
+    else:
+        sentiment = Sentiment.NEUTRAL
+        confidence = 0.0
+    return LexiconLabel(sentiment, round(score, 3), round(confidence, 3))
+
+
+class LexiconClassifier:
+    """Scores posts by summing lexicon valences over their tokens.
+
+    Posts are scored a batch at a time. The batch is lowercased, stripped
+    of punctuation and split as one string; itertools.compress then picks
+    out the positions of lexicon words (and post separators) at C speed,
+    so Python code only runs for the few tokens that can match a term.
+    """
+
+    def __init__(self, threshold: float = 0.75, valence: Dict[str, float] = None, constructive=None):
+        self.threshold = threshold
+        # term -> (weight, constructive cue, negator)
+        self.lookup: Dict[str, Tuple[float, bool, bool]] = {}
+        for term, weight in (valence or VALENCE).items():
+            self.lookup[term] = (weight, False, False)
+        for term in constructive or CONSTRUCTIVE:
+            self.lookup[term] = (self.lookup.get(term, (0.0,))[0], True, False)
+        for term in NEGATORS:
+            self.lookup.setdefault(term, (0.0, False, True))
+
+        # First word -> term lengths to try, longest first
+        lengths: Dict[str, set] = {}
+        for term in self.lookup:
+            words = term.split()
+            lengths.setdefault(words[0], set()).add(len(words))
+        self.lengths = {word: sorted(sizes, reverse=True) for word, sizes in lengths.items()}
+        self.interesting = frozenset(self.lengths) | {_RECORD}
+
+    def classify_many(self, texts: List[str]) -> List[Optional[LexiconLabel]]:
+        """A label per text, or None where nothing in the lexicon matched"""
+        if not texts:
+            return []
+        tokens = f" {_RECORD} ".join(text or "" for text in texts).lower().translate(_SEPARATORS).split()
+        lookup, lengths = self.lookup, self.lengths
+
+        labels: List[Optional[LexiconLabel]] = []
+        positive = negative = 0.0
+        cues = matched = 0
+        negated_until = skip_to = -1
+        for i in compress(range(len(tokens)), map(self.interesting.__contains__, tokens)):
+            token = tokens[i]
+            if token == _RECORD:
+                labels.append(_label(positive, negative, cues, matched) if matched else None)
+                positive = negative = 0.0
+                cues = matched = 0
+                negated_until = -1
+                continue
+            if i < skip_to:
+                # Inside a phrase that already matched
+                continue
+
+            entry = None
+            for length in lengths[token]:
+                entry = lookup.get(token if length == 1 else " ".join(tokens[i:i + length]))
+                if entry is not None:
+                    skip_to = i + length
+                    break
+            if entry is None:
+                continue
+
+            weight, is_cue, is_negator = entry
+            if is_negator:
+                # Flips the next lexicon term within two tokens
+                negated_until = skip_to + 1
+                continue
+            if weight and i <= negated_until:
+                weight = -0.8 * weight
+                negated_until = -1
+            if weight > 0:
+                positive += weight
+            elif weight < 0:
+                negative -= weight
+            cues += is_cue
+            matched += 1
+
+        labels.append(_label(positive, negative, cues, matched))
+        if len(labels) != len(texts):
+            # A post contained the separator itself
+            return self.classify_many([(text or "").replace(_RECORD, " ") for text in texts])
+        return labels
+
+    def classify(self, text: str) -> Optional[LexiconLabel]:
+        return self.classify_many([text])[0]
+
+    def split(self, posts: List[Tuple[int, str]]) -> Tuple[Dict[int, LexiconLabel], List[Tuple[int, str]]]:
+        """(confident labels by id, posts to escalate to the LLM)"""
+        labelled: Dict[int, LexiconLabel] = {}
+        escalate: List[Tuple[int, str]] = []
+        threshold = self.threshold
+        labels = self.classify_many([text for _, text in posts])
+        for (post_id, text), label in zip(posts, labels):
+            if label is not None and label.confidence >= threshold:
+                labelled[post_id] = label
+            else:
+                escalate.append((post_id, text))
+        return labelled, escalate
+
+
+# Singleton instance
+sentiment_lexicon = LexiconClassifier(threshold=settings.sentiment_lexicon_threshold)
@@ -0,0 +1,279 @@
+"""
+Signature Counter Service for Voice2Gov
+- "single": atomic increment of petitions.signature_count per signature
+- "sharded": increments spread over petition_counter_shards slot rows
+- "buffered": increments batched in-process and flushed periodically
+Sharded and buffered counts are folded into Petition.signature_count in the
+background, which is also where milestones and THRESHOLD_REACHED are recorded.
+"""
+
+import asyncio
+import random
+import threading
+from typing import Optional, Dict, List
+from sqlalchemy import delete, update, select, func
+from sqlalchemy.orm import Session
+
+from .. import database
+from ..config import settings
+from ..models.petition import Petition, PetitionCounterShard, PetitionTimeline, PetitionStatus, TimelineEventType
+
+
+# Signature counts that get their own timeline entry
+SIGNATURE_MILESTONES = [100, 500, 1000, 5000, 10000]
+
+
+def record_count_transitions(
+    db: Session,
+    petition_id: int,
+    previous_count: int,
+    signature_count: int,
+    signature_goal: Optional[int],
+    status: Optional[PetitionStatus]
+) -> Optional[PetitionStatus]:
+    """Record milestones crossed by a count change and the threshold transition"""
+    for milestone in SIGNATURE_MILESTONES:
+        if previous_count < milestone <= signature_count:
+            db.add(PetitionTimeline(
+                petition_id=petition_id,
+                event_type=TimelineEventType.SIGNATURE_MILESTONE,
+                description=f"Petition reached {milestone} signatures!"
+            ))
+
+    goal = signature_goal or 0
+    if signature_count >= goal and status == PetitionStatus.ACTIVE:
+        # Conditional update so only one writer performs the transition
+        result = db.execute(
+            update(Petition)
+            .where(Petition.id == petition_id, Petition.status == PetitionStatus.ACTIVE)
+            .values(status=PetitionStatus.THRESHOLD_REACHED)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            status = PetitionStatus.THRESHOLD_REACHED
+            db.add(PetitionTimeline(
+                petition_id=petition_id,
+                event_type=TimelineEventType.THRESHOLD_REACHED,
+                description=f"Petition reached {goal} signatures! Ready to be sent."
+            ))
+
+    return status
+
+
+def add_to_signature_count(db: Session, petition_id: int, amount: int) -> Optional[int]:
+    """Atomically add to petitions.signature_count and record transitions"""
+    row = db.execute(
+        update(Petition)
+        .where(Petition.id == petition_id)
+        .values(signature_count=func.coalesce(Petition.signature_count, 0) + amount)
+        .returning(Petition.signature_count, Petition.signature_goal, Petition.status)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if row is None:
+        return None
+
+    signature_count, signature_goal, status = row
+    record_count_transitions(db, petition_id, signature_count - amount, signature_count, signature_goal, status)
+    return signature_count
+
+
+class SignatureCounter:
+    """Single-row counter: every signature updates petitions.signature_count"""
+
+    mode = "single"
+
+    def __init__(self, flush_interval: float = 0.0):
+        self.flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+
+    def increment(self, db: Session, petition_id: int) -> Optional[int]:
+        """Count one signature inside the caller's transaction; None if no petition"""
+        return add_to_signature_count(db, petition_id, 1)
+
+    def after_commit(self, petition_id: int):
+        """Called once the signing transaction has committed"""
+
+    def pending_counts(self, db: Session, petition_ids: List[int]) -> Dict[int, int]:
+        """Increments not yet folded into Petition.signature_count"""
+        return {}
+
+    def flush(self, session_factory=None) -> int:
+        """Fold pending increments into Petition.signature_count"""
+        return 0
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                print(f"Signature counter flush error: {e}")
+
+    async def start(self):
+        """Start the background flusher (no-op for the single-row counter)"""
+        if self.mode != "single" and self.flush_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the background flusher and fold whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.mode != "single":
+            await asyncio.to_thread(self.flush)
+
+
+class ShardedSignatureCounter(SignatureCounter):
+    """Spreads increments across N slot rows per petition"""
+
+    mode = "sharded"
+
+    def __init__(self, shards: int = 16, flush_interval: float = 0.25):
+        super().__init__(flush_interval)
+        self.shards = max(1, shards)
+
+    def increment(self, db: Session, petition_id: int) -> Optional[int]:
+        shard = random.randrange(self.shards)
+        stmt = database.dialect_insert(db, PetitionCounterShard)
+        if stmt is not None:
+            db.execute(
+                stmt.values(petition_id=petition_id, shard=shard, count=1)
+                .on_conflict_do_update(
+                    index_elements=["petition_id", "shard"],
+                    set_={"count": PetitionCounterShard.count + 1}
+                )
+            )
+        else:
+            row = db.get(PetitionCounterShard, (petition_id, shard), with_for_update=True)
+            if row:
+                row.count += 1
+            else:
+                db.add(PetitionCounterShard(petition_id=petition_id, shard=shard, count=1))
+            db.flush()
+
+        pending = (
+            select(func.coalesce(func.sum(PetitionCounterShard.count), 0))
+            .where(PetitionCounterShard.petition_id == Petition.id)
+            .scalar_subquery()
+        )
+        return db.execute(
+            select(func.coalesce(Petition.signature_count, 0) + pending).where(Petition.id == petition_id)
+        ).scalar()
+
+    def pending_counts(self, db: Session, petition_ids: List[int]) -> Dict[int, int]:
+        if not petition_ids:
+            return {}
+        rows = db.execute(
+            select(PetitionCounterShard.petition_id, func.sum(PetitionCounterShard.count))
+            .where(PetitionCounterShard.petition_id.in_(petition_ids))
+            .group_by(PetitionCounterShard.petition_id)
+        ).all()
+        return {petition_id: int(total or 0) for petition_id, total in rows}
+
+    def flush(self, session_factory=None) -> int:
+        session_factory = session_factory or database.SessionLocal
+        if session_factory is None:
+            return 0
+
+        db = session_factory()
+        folded = 0
+        try:
+            # Claim shards by deleting them: RETURNING hands back the counts being
+            # removed, and a concurrent flusher blocks on the row lock and then finds
+            # nothing, so each count is folded once. Later increments recreate the row.
+            rows = db.execute(
+                delete(PetitionCounterShard)
+                .where(PetitionCounterShard.count > 0)
+                .returning(PetitionCounterShard.petition_id, PetitionCounterShard.count)
+                .execution_options(synchronize_session=False)
+            ).all()
+
+            totals: Dict[int, int] = {}
+            for petition_id, count in rows:
+                totals[petition_id] = totals.get(petition_id, 0) + count
+
+            for petition_id, amount in sorted(totals.items()):
+                add_to_signature_count(db, petition_id, amount)
+                folded += amount
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        return folded
+
+
+class BufferedSignatureCounter(SignatureCounter):
+    """Batches increments in process memory and flushes them periodically"""
+
+    mode = "buffered"
+
+    def __init__(self, flush_interval: float = 0.25):
+        super().__init__(flush_interval)
+        self._pending: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, db: Session, petition_id: int) -> Optional[int]:
+        current = db.execute(
+            select(func.coalesce(Petition.signature_count, 0)).where(Petition.id == petition_id)
+        ).scalar()
+        if current is None:
+            return None
+        with self._lock:
+            return current + self._pending.get(petition_id, 0) + 1
+
+    def after_commit(self, petition_id: int):
+        with self._lock:
+            self._pending[petition_id] = self._pending.get(petition_id, 0) + 1
+
+    def pending_counts(self, db: Session, petition_ids: List[int]) -> Dict[int, int]:
+        with self._lock:
+            return {pid: self._pending[pid] for pid in petition_ids if pid in self._pending}
+
+    def flush(self, session_factory=None) -> int:
+        session_factory = session_factory or database.SessionLocal
+        if session_factory is None:
+            return 0
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        db = session_factory()
+        try:
+            for petition_id, amount in pending.items():
+                add_to_signature_count(db, petition_id, amount)
+            db.commit()
+        except Exception:
+            db.rollback()
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                for petition_id, amount in pending.items():
+                    self._pending[petition_id] = self._pending.get(petition_id, 0) + amount
+            raise
+        finally:
+            db.close()
+
+        return sum(pending.values())
+
+
+def create_signature_counter(mode: str, shards: int = 16, flush_ms: int = 250) -> SignatureCounter:
+    """Build the counter for a deployment's configured mode"""
+    flush_interval = max(flush_ms, 10) / 1000
+    if mode == "sharded":
+        return ShardedSignatureCounter(shards=shards, flush_interval=flush_interval)
+    if mode == "buffered":
+        return BufferedSignatureCounter(flush_interval=flush_interval)
+    return SignatureCounter()
+
+
+# Singleton instance
+signature_counter = create_signature_counter(
+    settings.signature_counter_mode,
+    settings.signature_counter_shards,
+    settings.signature_counter_flush_ms
+)
@@ -0,0 +1,93 @@
+"""
+Petition Signing Service for Voice2Gov
+- Records signatures with database-enforced uniqueness
+- Counts them through the configured signature counter
+"""
+
+from typing import Optional, Dict, Any
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..database import dialect_insert
+from ..models.petition import Signature
+from .signature_counter import SignatureCounter, signature_counter
+
+
+# SQLSTATE for foreign_key_violation (psycopg2 pgcode / asyncpg sqlstate)
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    """True if error is a foreign key violation rather than e.g. a unique or NOT NULL one"""
+    code = getattr(error.orig, "pgcode", None) or getattr(error.orig, "sqlstate", None)
+    if code:
+        return code == FOREIGN_KEY_VIOLATION
+    # SQLite reports constraint failures by message only
+    return "foreign key" in str(error.orig).lower()
+
+
+class SigningService:
+    """Service for recording petition signatures under concurrency"""
+
+    def __init__(self, counter: SignatureCounter = signature_counter):
+        self.counter = counter
+
+    def _insert_signature(self, db: Session, values: Dict[str, Any]) -> bool:
+        """Insert a signature, returning False if the user already signed"""
+        stmt = dialect_insert(db, Signature)
+        if stmt is None:
+            # No portable ON CONFLICT; rely on the unique constraint instead
+            try:
+                with db.begin_nested():
+                    db.add(Signature(**values))
+                return True
+            except IntegrityError as e:
+                if is_foreign_key_violation(e):
+                    raise
+                return False
+
+        result = db.execute(stmt.values(**values).on_conflict_do_nothing().returning(Signature.id))
+        return result.first() is not None
+
+    def sign(
+        self,
+        db: Session,
+        petition_id: int,
+        user_id: int,
+        comment: Optional[str] = None,
+        is_anonymous: bool = False
+    ) -> Dict[str, Any]:
+        """Sign a petition in a single transaction"""
+        values = {
+            "petition_id": petition_id,
+            "user_id": user_id,
+            "comment": comment,
+            "is_anonymous": is_anonymous
+        }
+
+        try:
+            inserted = self._insert_signature(db, values)
+        except IntegrityError as e:
+            db.rollback()
+            if not is_foreign_key_violation(e):
+                raise
+            # The petition (or user) row does not exist
+            return {"signed": False, "reason": "not_found"}
+
+        if not inserted:
+            db.rollback()
+            return {"signed": False, "reason": "already_signed"}
+
+        signature_count = self.counter.increment(db, petition_id)
+        if signature_count is None:
+            db.rollback()
+            return {"signed": False, "reason": "not_found"}
+
+        db.commit()
+        self.counter.after_commit(petition_id)
+
+        return {"signed": True, "signature_count": signature_count}
+
+
+# Singleton instance
+signing_service = SigningService()
@@ -0,0 +1,98 @@
+"""
+Social Poll Checkpoint Service for Voice2Gov
+- Highest tweet id stored per search query and per handle (social_poll_checkpoints)
+- Polls ask Twitter for since_id=<checkpoint> and only get newer tweets
+- Checkpoints only move forward, and only after the tweets are stored
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, Iterable, Dict, Any
+from sqlalchemy import case, func, select, update
+
+from .. import database
+from ..models.social import SocialPollCheckpoint
+
+
+QUERY = "query"
+HANDLE = "handle"
+
+
+def checkpoint_key(kind: str, key: str) -> str:
+    """Handles are case-insensitive and may come with or without @"""
+    if kind == HANDLE:
+        return key.strip().lstrip("@").lower()
+    return key.strip()
+
+
+def newest_id(tweets: Iterable[Dict[str, Any]]) -> Optional[int]:
+    ids = [int(tweet["platform_id"]) for tweet in tweets if tweet.get("platform_id")]
+    return max(ids) if ids else None
+
+
+class SocialCheckpointStore:
+    """Reads and advances poll checkpoints on their own short transactions"""
+
+    def get(self, kind: str, key: str, engine=None) -> Optional[SocialPollCheckpoint]:
+        engine = engine or database.engine
+        table = SocialPollCheckpoint.__table__
+        with engine.connect() as connection:
+            return connection.execute(
+                select(table).where(table.c.kind == kind, table.c.key == checkpoint_key(kind, key))
+            ).first()
+
+    def advance(
+        self,
+        kind: str,
+        key: str,
+        since_id: Optional[int],
+        user_id: Optional[str] = None,
+        engine=None
+    ):
+        """Record a poll; since_id is kept only if it is newer than the stored one"""
+        engine = engine or database.engine
+        table = SocialPollCheckpoint.__table__
+        row = {
+            "kind": kind,
+            "key": checkpoint_key(kind, key),
+            "since_id": since_id,
+            "user_id": user_id,
+            "last_polled_at": datetime.now(timezone.utc)
+        }
+
+        with engine.begin() as connection:
+            insert = database.dialect_insert(connection, table)
+            if insert is not None:
+                excluded = insert.excluded
+                connection.execute(insert.values(**row).on_conflict_do_update(
+                    index_elements=["kind", "key"],
+                    set_={
+                        # Overlapping polls must not move a checkpoint backwards
+                        "since_id": case(
+                            (table.c.since_id.is_(None), excluded.since_id),
+                            (excluded.since_id > table.c.since_id, excluded.since_id),
+                            else_=table.c.since_id
+                        ),
+                        "user_id": func.coalesce(excluded.user_id, table.c.user_id),
+                        "last_polled_at": excluded.last_polled_at
+                    }
+                ))
+                return
+
+            current = connection.execute(
+                select(table.c.since_id).where(table.c.kind == kind, table.c.key == row["key"]).with_for_update()
+            ).first()
+            if current is None:
+                connection.execute(table.insert().values(**row))
+                return
+            values = {"last_polled_at": row["last_polled_at"]}
+            if since_id is not None and (current.since_id is None or since_id > current.since_id):
+                values["since_id"] = since_id
+            if user_id:
+                values["user_id"] = user_id
+            connection.execute(
+                update(table).where(table.c.kind == kind, table.c.key == row["key"]).values(**values)
+            )
+
+
+# Singleton instance
+social_checkpoints = SocialCheckpointStore()
@@ -0,0 +1,306 @@
+"""
+Social Digest Service for Voice2Gov
+- Map-reduce summaries over every post in a digest period, not a sample
+- Near-duplicate posts (retweets, copy-paste campaigns) are clustered in-process first
+- Chunk summaries run concurrently under digest_concurrency; reduce steps merge them
+- Bounded by digest_max_clusters and digest_max_post_chars, so 10k posts stay within budget
+- Posts the summary covers are recorded in social_digest_posts (and SocialDigest.post_ids)
+"""
+
+import asyncio
+import json
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from sqlalchemy import select, update
+
+from .. import database
+from ..config import settings
+from ..models.social import SocialPost, SocialDigest, SocialDigestPost
+from .openai_service import openai_service, DIGEST_SYSTEM_PROMPT
+
+
+CHUNK_PROMPT = """You are a Nigerian civic engagement analyst.
+You will receive citizen posts about an elected official, one per line, each prefixed with
+how many near-identical posts it stands for and its sentiment, e.g. [x12 NEGATIVE].
+Summarise them in at most 150 words: main concerns and themes, positive feedback,
+constructive suggestions and specific issues or places mentioned. Weigh themes by post count.
+Write plain, formal English."""
+
+REDUCE_PROMPT = """You are a Nigerian civic engagement analyst.
+You will receive partial summaries of citizen feedback, each covering a share of the posts.
+Merge them into one summary of at most 200 words, keeping the most widespread themes,
+specific issues and constructive suggestions. Write plain, formal English."""
+
+FALLBACK_SUMMARY = "Unable to generate summary at this time."
+
+_URLS = re.compile(r"https?://\S+|www\.\S+")
+_MENTIONS = re.compile(r"(^|\s)(rt\s+)?@\w+:?")
+_NOISE = str.maketrans({c: " " for c in "!\"#$%&()*+,-./:;<=>?@[\\]^_`{|}~'0123456789\n\t\r"})
+
+
+def cluster_key(text: str) -> str:
+    """Posts with the same key are treated as one: case, links, mentions,
+    numbers, punctuation and word order are ignored"""
+    text = _MENTIONS.sub(" ", _URLS.sub(" ", (text or "").lower()))
+    return " ".join(sorted(set(text.translate(_NOISE).split())))
+
+
+@dataclass
+class PostCluster:
+    """Near-identical posts, represented by the most engaged-with one"""
+    ids: List[int] = field(default_factory=list)
+    author: str = ""
+    content: str = ""
+    engagement: int = -1
+    sentiments: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def sentiment(self) -> str:
+        return max(self.sentiments, key=self.sentiments.get) if self.sentiments else "UNSCORED"
+
+
+@dataclass
+class DigestStats:
+    """Outcome of one summarize() call"""
+    posts: int = 0
+    clusters: int = 0
+    clusters_summarised: int = 0
+    posts_covered: int = 0
+    chunks: int = 0
+    chunks_failed: int = 0
+    reduce_requests: int = 0
+    requests: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    seconds: float = 0.0
+
+    @property
+    def coverage(self) -> float:
+        return self.posts_covered / self.posts if self.posts else 0.0
+
+
+@dataclass
+class DigestResult:
+    summary: str
+    post_ids: List[int]
+    stats: DigestStats
+    digest_id: Optional[int] = None
+
+
+class DigestBuilder:
+    """Hierarchical (map-reduce) digest summaries"""
+
+    def __init__(
+        self,
+        llm=None,
+        chunk_size: int = 50,
+        concurrency: int = 4,
+        max_clusters: int = 2000,
+        max_post_chars: int = 280,
+        reduce_fanout: int = 10
+    ):
+        self.llm = llm or openai_service
+        self.chunk_size = max(1, chunk_size)
+        self.concurrency = max(1, concurrency)
+        self.max_clusters = max(1, max_clusters)
+        self.max_post_chars = max_post_chars
+        self.reduce_fanout = max(2, reduce_fanout)
+
+    def cluster(self, posts: List[Dict[str, Any]]) -> List[PostCluster]:
+        """Group posts by cluster_key, largest and most engaged-with clusters first"""
+        clusters: Dict[str, PostCluster] = {}
+        for index, post in enumerate(posts):
+            content = post.get("content") or ""
+            cluster = clusters.setdefault(cluster_key(content) or content, PostCluster())
+            cluster.ids.append(post.get("id", index))
+            engagement = (post.get("likes") or 0) + (post.get("shares") or 0) + (post.get("comments") or 0)
+            if engagement > cluster.engagement:
+                cluster.engagement = engagement
+                cluster.author = post.get("author") or "Unknown"
+                cluster.content = content
+            sentiment = post.get("sentiment")
+            if sentiment:
+                sentiment = getattr(sentiment, "value", sentiment)
+                cluster.sentiments[sentiment] = cluster.sentiments.get(sentiment, 0) + 1
+        return sorted(clusters.values(), key=lambda c: (c.size, c.engagement), reverse=True)
+
+    def chunk_messages(self, clusters: List[PostCluster]) -> List[Dict[str, str]]:
+        lines = [
+            f"[x{c.size} {c.sentiment}] @{c.author}: {' '.join(c.content[:self.max_post_chars].split())}"
+            for c in clusters
+        ]
+        return [
+            {"role": "system", "content": CHUNK_PROMPT},
+            {"role": "user", "content": "\n".join(lines)}
+        ]
+
+    async def _request(self, messages: List[Dict[str, str]], semaphore: asyncio.Semaphore) -> Optional[str]:
+        async with semaphore:
+            return await self.llm._make_request(messages, temperature=0.3)
+
+    async def _reduce(self, parts: List[str], overview: str, semaphore: asyncio.Semaphore, stats: DigestStats) -> Optional[str]:
+        """Merge partial summaries, fanout at a time, down to the final digest"""
+        while len(parts) > self.reduce_fanout:
+            groups = [parts[i:i + self.reduce_fanout] for i in range(0, len(parts), self.reduce_fanout)]
+            stats.reduce_requests += len(groups)
+            merged = await asyncio.gather(*[
+                self._request([
+                    {"role": "system", "content": REDUCE_PROMPT},
+                    {"role": "user", "content": "\n\n".join(group)}
+                ], semaphore)
+                for group in groups
+            ])
+            # A failed merge keeps its inputs for the next round rather than losing them
+            parts = [summary if summary else "\n\n".join(group) for summary, group in zip(merged, groups)]
+
+        stats.reduce_requests += 1
+        numbered = "\n\n".join(f"Part {i}:\n{part}" for i, part in enumerate(parts, 1))
+        return await self._request([
+            {"role": "system", "content": DIGEST_SYSTEM_PROMPT},
+            {"role": "user", "content": f"{overview}\n\nCreate a digest summary from these partial summaries:\n\n{numbered}"}
+        ], semaphore)
+
+    def overview(self, posts: int, clusters: List[PostCluster], summarised: int) -> str:
+        """Counts computed in-process, so the final prompt has exact totals"""
+        sentiments: Dict[str, int] = {}
+        for cluster in clusters:
+            for sentiment, count in cluster.sentiments.items():
+                sentiments[sentiment] = sentiments.get(sentiment, 0) + count
+        breakdown = ", ".join(f"{sentiment} {count}" for sentiment, count in sorted(sentiments.items())) or "not yet analysed"
+        lines = [f"{posts} citizen posts in {len(clusters)} distinct threads. Sentiment: {breakdown}."]
+        if summarised < len(clusters):
+            skipped = sum(c.size for c in clusters[summarised:])
+            lines.append(f"The {len(clusters) - summarised} smallest threads ({skipped} posts) are not included below.")
+        return "\n".join(lines)
+
+    async def summarize(self, posts: List[Dict[str, Any]]) -> DigestResult:
+        """Summarise post dicts (id, author, content, sentiment, likes, shares, comments)"""
+        stats = DigestStats(posts=len(posts))
+        start = time.perf_counter()
+        usage_before = (self.llm.requests, self.llm.prompt_tokens, self.llm.completion_tokens)
+
+        clusters = self.cluster(posts)
+        stats.clusters = len(clusters)
+        selected = clusters[:self.max_clusters]
+        chunks = [selected[i:i + self.chunk_size] for i in range(0, len(selected), self.chunk_size)]
+        stats.chunks = len(chunks)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        summaries = await asyncio.gather(*[self._request(self.chunk_messages(chunk), semaphore) for chunk in chunks])
+
+        parts: List[str] = []
+        post_ids: List[int] = []
+        for chunk, summary in zip(chunks, summaries):
+            if not summary:
+                # Posts in a failed chunk are not part of the digest
+                stats.chunks_failed += 1
+                continue
+            parts.append(f"({sum(c.size for c in chunk)} posts) {summary.strip()}")
+            for cluster in chunk:
+                stats.clusters_summarised += 1
+                post_ids.extend(cluster.ids)
+
+        summary = None
+        if parts:
+            summary = await self._reduce(parts, self.overview(len(posts), clusters, len(selected)), semaphore, stats)
+        if not summary:
+            post_ids = []
+            stats.clusters_summarised = 0
+        stats.posts_covered = len(post_ids)
+
+        stats.requests = self.llm.requests - usage_before[0]
+        stats.prompt_tokens = self.llm.prompt_tokens - usage_before[1]
+        stats.completion_tokens = self.llm.completion_tokens - usage_before[2]
+        stats.seconds = time.perf_counter() - start
+        return DigestResult(summary or FALLBACK_SUMMARY, sorted(post_ids), stats)
+
+    def load_posts(self, representative_id: int, period_start: datetime, period_end: datetime, engine=None) -> List[Dict[str, Any]]:
+        engine = engine or database.engine
+        table = SocialPost.__table__
+        with engine.connect() as connection:
+            rows = connection.execute(
+                select(
+                    table.c.id, table.c.author_handle, table.c.content, table.c.sentiment,
+                    table.c.likes, table.c.shares, table.c.comments
+                ).where(
+                    table.c.representative_id == representative_id,
+                    table.c.posted_at >= period_start,
+                    table.c.posted_at <= period_end
+                ).order_by(table.c.id)
+            )
+            return [
+                {
+                    "id": row.id, "author": row.author_handle, "content": row.content, "sentiment": row.sentiment,
+                    "likes": row.likes, "shares": row.shares, "comments": row.comments
+                }
+                for row in rows
+            ]
+
+    def save(self, representative_id: int, title: str, result: DigestResult, period_start: datetime, period_end: datetime, engine=None) -> int:
+        """Insert the digest and its membership rows, in one transaction; returns the digest id"""
+        engine = engine or database.engine
+        posts = SocialPost.__table__
+        with engine.begin() as connection:
+            digest_id = connection.execute(SocialDigest.__table__.insert().values(
+                representative_id=representative_id,
+                title=title,
+                summary=result.summary,
+                post_ids=json.dumps(result.post_ids),
+                period_start=period_start,
+                period_end=period_end
+            )).inserted_primary_key[0]
+            if result.post_ids:
+                connection.execute(
+                    SocialDigestPost.__table__.insert(),
+                    [{"digest_id": digest_id, "post_id": post_id} for post_id in result.post_ids]
+                )
+            for i in range(0, len(result.post_ids), 1000):
+                connection.execute(
+                    update(posts).where(posts.c.id.in_(result.post_ids[i:i + 1000])).values(is_included_in_digest=True)
+                )
+        return digest_id
+
+    async def build_digest(
+        self,
+        representative_id: int,
+        period_start: datetime,
+        period_end: datetime,
+        title: Optional[str] = None,
+        engine=None
+    ) -> Optional[DigestResult]:
+        """Summarise a representative's posts for the period and store a SocialDigest; None if there were none"""
+        posts = await asyncio.to_thread(self.load_posts, representative_id, period_start, period_end, engine)
+        if not posts:
+            return None
+        result = await self.summarize(posts)
+        if not result.post_ids:
+            print(f"Digest for representative {representative_id} failed: no chunk could be summarised")
+            return result
+
+        title = title or f"Citizen feedback {period_start:%d %b} - {period_end:%d %b %Y}"
+        result.digest_id = await asyncio.to_thread(
+            self.save, representative_id, title, result, period_start, period_end, engine
+        )
+        stats = result.stats
+        print(
+            f"Digest {result.digest_id}: {stats.posts_covered}/{stats.posts} posts in {stats.clusters_summarised} clusters, "
+            f"{stats.requests} requests, {stats.prompt_tokens + stats.completion_tokens} tokens in {stats.seconds:.1f}s"
+        )
+        return result
+
+
+# Singleton instance
+social_digests = DigestBuilder(
+    chunk_size=settings.digest_chunk_size,
+    concurrency=settings.digest_concurrency,
+    max_clusters=settings.digest_max_clusters,
+    max_post_chars=settings.digest_max_post_chars,
+    reduce_fanout=settings.digest_reduce_fanout
+)
@@ -0,0 +1,250 @@
+"""
+Social Ingest Service for Voice2Gov
+- Persists post dicts from TwitterService (search_tweets, get_user_tweets,
+  search_governance_topics) into social_posts
+- Dedupes in memory by platform_id, then writes multi-row upserts in
+  batches of social_ingest_batch_size, one transaction per batch
+- Re-seen posts only get their engagement counters refreshed
+- Newly inserted posts are added to the hourly rollups
+- Polls per query / handle fetch only tweets newer than their checkpoint
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional, List, Dict, Any, Iterable
+from sqlalchemy import bindparam, or_, select, update
+
+from .. import database
+from ..config import settings
+from ..models.social import SocialPost, Platform
+from .social_rollup import social_rollups
+from .social_checkpoints import social_checkpoints, newest_id, QUERY, HANDLE
+from .twitter_service import twitter_service, governance_query, GOVERNANCE_TOPICS
+
+
+# Columns written for every post; multi-row VALUES need the same keys in every row
+POST_COLUMNS = (
+    "platform", "platform_id", "author_handle", "author_name", "content", "url",
+    "likes", "shares", "comments", "representative_id", "posted_at"
+)
+ENGAGEMENT_COLUMNS = ("likes", "shares", "comments")
+
+
+@dataclass
+class IngestStats:
+    """Outcome of one ingest() call"""
+    received: int = 0
+    duplicates: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def inserted_per_second(self) -> float:
+        return self.inserted / self.seconds if self.seconds else 0.0
+
+    @property
+    def updated_per_second(self) -> float:
+        return self.updated / self.seconds if self.seconds else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        written = self.inserted + self.updated + self.unchanged
+        return written / self.seconds if self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **asdict(self),
+            "insertedPerSecond": round(self.inserted_per_second, 1),
+            "updatedPerSecond": round(self.updated_per_second, 1),
+            "rowsPerSecond": round(self.rows_per_second, 1)
+        }
+
+
+class SocialIngestService:
+    """Batched upsert of collected posts into social_posts"""
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = max(1, batch_size)
+
+    def _row(self, post: Dict[str, Any], platform: Platform, representative_id: Optional[int]) -> Dict[str, Any]:
+        row = {column: post.get(column) for column in POST_COLUMNS}
+        row["platform"] = Platform(post.get("platform") or platform)
+        row["platform_id"] = str(post["platform_id"])
+        row["author_handle"] = row["author_handle"] or "unknown"
+        row["content"] = row["content"] or ""
+        for column in ENGAGEMENT_COLUMNS:
+            row[column] = row[column] or 0
+        if row["representative_id"] is None:
+            row["representative_id"] = representative_id
+        return row
+
+    def dedupe(
+        self,
+        posts: Iterable[Dict[str, Any]],
+        platform: Platform = Platform.TWITTER,
+        representative_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """One row per platform_id; the last occurrence carries the freshest counters"""
+        rows: Dict[str, Dict[str, Any]] = {}
+        for post in posts:
+            if not post.get("platform_id") or post.get("posted_at") is None:
+                continue
+            row = self._row(post, platform, representative_id)
+            rows[row["platform_id"]] = row
+        return list(rows.values())
+
+    def _write_batch(self, connection, rows: List[Dict[str, Any]], stats: IngestStats):
+        insert = database.dialect_insert(connection, SocialPost.__table__)
+        if insert is None:
+            self._write_batch_portable(connection, rows, stats)
+            return
+
+        # Executed with a parameter list, SQLAlchemy sends these as multi-row
+        # VALUES pages ("insertmanyvalues") from one cached compiled statement.
+        # Insert what is new first: RETURNING names exactly the rows this
+        # transaction created, which is what the rollups must count
+        inserted_ids = set(connection.scalars(
+            insert.on_conflict_do_nothing(index_elements=["platform_id"]).returning(insert.table.c.platform_id),
+            rows
+        ))
+        new_rows = [row for row in rows if row["platform_id"] in inserted_ids]
+        social_rollups.apply(connection, social_rollups.deltas_for_posts(new_rows))
+        stats.inserted += len(new_rows)
+
+        existing = [row for row in rows if row["platform_id"] not in inserted_ids]
+        if not existing:
+            return
+
+        # Refresh engagement counters, skipping rows whose counters have not moved
+        columns, excluded = insert.table.c, insert.excluded
+        result = connection.execute(
+            insert.on_conflict_do_update(
+                index_elements=["platform_id"],
+                set_={column: excluded[column] for column in ENGAGEMENT_COLUMNS},
+                where=or_(*(columns[column].is_distinct_from(excluded[column]) for column in ENGAGEMENT_COLUMNS))
+            ),
+            existing
+        )
+        updated = max(0, min(result.rowcount, len(existing)))
+        stats.updated += updated
+        stats.unchanged += len(existing) - updated
+
+    def _write_batch_portable(self, connection, rows: List[Dict[str, Any]], stats: IngestStats):
+        """Databases without ON CONFLICT: look up existing ids, then insert/update"""
+        ids = [row["platform_id"] for row in rows]
+        existing = set(connection.scalars(select(SocialPost.platform_id).where(SocialPost.platform_id.in_(ids))))
+
+        new_rows = [row for row in rows if row["platform_id"] not in existing]
+        if new_rows:
+            connection.execute(SocialPost.__table__.insert(), new_rows)
+            social_rollups.apply(connection, social_rollups.deltas_for_posts(new_rows))
+        stats.inserted += len(new_rows)
+
+        old_rows = [row for row in rows if row["platform_id"] in existing]
+        if old_rows:
+            table = SocialPost.__table__
+            connection.execute(
+                update(table)
+                .where(table.c.platform_id == bindparam("b_platform_id"))
+                .values({column: bindparam(f"b_{column}") for column in ENGAGEMENT_COLUMNS}),
+                [{f"b_{key}": row[key] for key in ("platform_id", *ENGAGEMENT_COLUMNS)} for row in old_rows]
+            )
+        stats.updated += len(old_rows)
+
+    def ingest(
+        self,
+        posts: Iterable[Dict[str, Any]],
+        platform: Platform = Platform.TWITTER,
+        representative_id: Optional[int] = None,
+        engine=None
+    ) -> IngestStats:
+        """Upsert posts in batches, each batch in its own transaction"""
+        engine = engine or database.engine
+        posts = list(posts)
+        stats = IngestStats(received=len(posts))
+        start = time.perf_counter()
+
+        rows = self.dedupe(posts, platform, representative_id)
+        stats.duplicates = len(posts) - len(rows)
+        for offset in range(0, len(rows), self.batch_size):
+            batch = rows[offset:offset + self.batch_size]
+            # Sorted ids give concurrent pollers the same lock order
+            batch.sort(key=lambda row: row["platform_id"])
+            with engine.begin() as connection:
+                self._write_batch(connection, batch, stats)
+            stats.batches += 1
+
+        stats.seconds = time.perf_counter() - start
+        return stats
+
+    async def ingest_async(
+        self,
+        posts: Iterable[Dict[str, Any]],
+        platform: Platform = Platform.TWITTER,
+        representative_id: Optional[int] = None,
+        engine=None
+    ) -> IngestStats:
+        """ingest() off the event loop"""
+        return await asyncio.to_thread(self.ingest, list(posts), platform, representative_id, engine)
+
+    async def poll_query(self, query: str, max_results: int = 100, engine=None) -> IngestStats:
+        """Store tweets newer than the query's checkpoint, then advance it"""
+        checkpoint = await asyncio.to_thread(social_checkpoints.get, QUERY, query, engine)
+        since_id = checkpoint.since_id if checkpoint else None
+        tweets = await twitter_service.search_tweets(query, max_results=max_results, since_id=since_id)
+        stats = await self.ingest_async(tweets, Platform.TWITTER, engine=engine)
+        # Advance only once the tweets are stored; a failed poll retries from the old checkpoint
+        await asyncio.to_thread(social_checkpoints.advance, QUERY, query, newest_id(tweets), None, engine)
+        return stats
+
+    async def poll_handle(
+        self,
+        username: str,
+        representative_id: Optional[int] = None,
+        max_results: int = 100,
+        engine=None
+    ) -> IngestStats:
+        """Store a handle's tweets newer than its checkpoint, then advance it"""
+        checkpoint = await asyncio.to_thread(social_checkpoints.get, HANDLE, username, engine)
+        user_id = checkpoint.user_id if checkpoint else None
+        if not user_id:
+            user_id = await twitter_service.resolve_user_id(username)
+            if not user_id:
+                return IngestStats()
+        tweets = await twitter_service.get_user_tweets(
+            username,
+            max_results=max_results,
+            since_id=checkpoint.since_id if checkpoint else None,
+            user_id=user_id
+        )
+        stats = await self.ingest_async(tweets, Platform.TWITTER, representative_id, engine=engine)
+        await asyncio.to_thread(social_checkpoints.advance, HANDLE, username, newest_id(tweets), user_id, engine)
+        return stats
+
+    async def poll_governance_topics(self, topics: List[str] = None, max_results: int = 100, engine=None) -> IngestStats:
+        """Fetch new governance tweets for every topic and store them"""
+        topics = topics or GOVERNANCE_TOPICS
+        start = time.perf_counter()
+        results = await asyncio.gather(*[
+            self.poll_query(governance_query(topic), max_results=max_results // len(topics), engine=engine)
+            for topic in topics
+        ])
+
+        stats = IngestStats()
+        for part in results:
+            for field in ("received", "duplicates", "inserted", "updated", "unchanged", "batches"):
+                setattr(stats, field, getattr(stats, field) + getattr(part, field))
+        stats.seconds = time.perf_counter() - start
+        print(
+            f"Social ingest: {stats.inserted} new, {stats.updated} updated, "
+            f"{stats.unchanged} unchanged in {stats.seconds:.2f}s ({stats.rows_per_second:.0f} rows/s)"
+        )
+        return stats
+
+
+# Singleton instance
+social_ingest = SocialIngestService(batch_size=settings.social_ingest_batch_size)
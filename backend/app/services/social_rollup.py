@@ -0,0 +1,239 @@
+"""
+Social Rollup Service for Voice2Gov
+- Hourly post counts keyed by (hour, representative, platform, sentiment)
+- Maintained incrementally: ORM writes through mapper events, bulk writers through apply()
+- Stats and hour/day time series from a single aggregate query
+- Backfill from social_posts (python -m app.backfill_social_rollups)
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple, Any
+from sqlalchemy import Select, String, cast, event, func, literal, select, text, update
+from sqlalchemy.orm.attributes import get_history
+
+from ..database import dialect_insert
+from ..models.social import SocialPost, SocialRollup, Platform, Sentiment
+
+
+NO_REPRESENTATIVE = 0
+NOT_ANALYSED = "NONE"
+
+# (hour, representative_id, platform, sentiment)
+RollupKey = Tuple[datetime, int, Platform, str]
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_key(
+    posted_at: datetime,
+    representative_id: Optional[int],
+    platform: Platform,
+    sentiment: Optional[Sentiment]
+) -> RollupKey:
+    return (
+        hour_bucket(posted_at),
+        representative_id or NO_REPRESENTATIVE,
+        Platform(platform),
+        Sentiment(sentiment).value if sentiment else NOT_ANALYSED
+    )
+
+
+def _sql_hour(dialect_name: str, column):
+    """SQL expression truncating a timestamp column to the hour, matching hour_bucket()"""
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", column)
+    # SQLite stores DateTime as text; keep SQLAlchemy's microsecond format so keys compare equal
+    return func.strftime("%Y-%m-%d %H:00:00.000000", column)
+
+
+def _sql_day(dialect_name: str, column):
+    if dialect_name == "postgresql":
+        return func.date_trunc("day", column)
+    return func.strftime("%Y-%m-%d 00:00:00.000000", column)
+
+
+def _empty_counts() -> Dict[str, Any]:
+    return {
+        "totalPosts": 0,
+        "bySentiment": {s.value.lower(): 0 for s in Sentiment},
+        "byPlatform": {p.value.lower(): 0 for p in Platform}
+    }
+
+
+def _add_counts(counts: Dict[str, Any], platform, sentiment: str, total: int):
+    counts["totalPosts"] += total
+    if sentiment != NOT_ANALYSED:
+        key = sentiment.lower()
+        counts["bySentiment"][key] = counts["bySentiment"].get(key, 0) + total
+    key = Platform(platform).value.lower()
+    counts["byPlatform"][key] = counts["byPlatform"].get(key, 0) + total
+
+
+class SocialRollupService:
+    """Service for the social_post_rollups table"""
+
+    def apply(self, connection, deltas: Dict[RollupKey, int]):
+        """Add count deltas in one multi-row upsert on the caller's connection/transaction"""
+        deltas = {key: amount for key, amount in deltas.items() if amount}
+        if not deltas:
+            return
+
+        # Sorted keys give concurrent writers the same lock order
+        rows = [
+            {
+                "hour": hour,
+                "representative_id": representative_id,
+                "platform": platform,
+                "sentiment": sentiment,
+                "post_count": amount
+            }
+            for (hour, representative_id, platform, sentiment), amount in sorted(
+                deltas.items(), key=lambda item: (item[0][0], item[0][1], item[0][2].value, item[0][3])
+            )
+        ]
+
+        insert = dialect_insert(connection, SocialRollup)
+        if insert is not None:
+            connection.execute(insert.values(rows).on_conflict_do_update(
+                index_elements=["hour", "representative_id", "platform", "sentiment"],
+                set_={"post_count": SocialRollup.post_count + insert.excluded.post_count}
+            ))
+            return
+
+        for row in rows:
+            result = connection.execute(
+                update(SocialRollup)
+                .where(
+                    SocialRollup.hour == row["hour"],
+                    SocialRollup.representative_id == row["representative_id"],
+                    SocialRollup.platform == row["platform"],
+                    SocialRollup.sentiment == row["sentiment"]
+                )
+                .values(post_count=SocialRollup.post_count + row["post_count"])
+            )
+            if result.rowcount == 0:
+                connection.execute(SocialRollup.__table__.insert().values(**row))
+
+    def deltas_for_posts(self, posts: List[Dict[str, Any]]) -> Dict[RollupKey, int]:
+        """+1 per post dict (posted_at, representative_id, platform, sentiment)"""
+        deltas: Dict[RollupKey, int] = {}
+        for post in posts:
+            key = rollup_key(post["posted_at"], post.get("representative_id"), post["platform"], post.get("sentiment"))
+            deltas[key] = deltas.get(key, 0) + 1
+        return deltas
+
+    def _filter(self, stmt: Select, since: datetime, representative_id: Optional[int]) -> Select:
+        stmt = stmt.where(SocialRollup.hour >= hour_bucket(since))
+        if representative_id:
+            stmt = stmt.where(SocialRollup.representative_id == representative_id)
+        return stmt
+
+    def stats_statement(self, since: datetime, representative_id: Optional[int] = None) -> Select:
+        """Totals by platform and sentiment since the start of since's hour"""
+        stmt = select(SocialRollup.platform, SocialRollup.sentiment, func.sum(SocialRollup.post_count))
+        stmt = self._filter(stmt, since, representative_id)
+        return stmt.group_by(SocialRollup.platform, SocialRollup.sentiment)
+
+    def summarize(self, rows) -> Dict[str, Any]:
+        counts = _empty_counts()
+        for platform, sentiment, total in rows:
+            _add_counts(counts, platform, sentiment, int(total or 0))
+        return counts
+
+    def series_statement(
+        self,
+        dialect_name: str,
+        bucket: str,
+        since: datetime,
+        representative_id: Optional[int] = None
+    ) -> Select:
+        """Per-bucket totals by platform and sentiment; bucket is "hour" or "day\""""
+        bucket_column = SocialRollup.hour if bucket == "hour" else _sql_day(dialect_name, SocialRollup.hour)
+        bucket_column = bucket_column.label("bucket")
+        stmt = select(bucket_column, SocialRollup.platform, SocialRollup.sentiment, func.sum(SocialRollup.post_count))
+        stmt = self._filter(stmt, since, representative_id)
+        return stmt.group_by(bucket_column, SocialRollup.platform, SocialRollup.sentiment).order_by(bucket_column)
+
+    def summarize_series(self, rows) -> List[Dict[str, Any]]:
+        series: Dict[datetime, Dict[str, Any]] = {}
+        for bucket, platform, sentiment, total in rows:
+            if isinstance(bucket, str):
+                bucket = datetime.fromisoformat(bucket)
+            if bucket not in series:
+                series[bucket] = {"bucket": bucket, **_empty_counts()}
+            _add_counts(series[bucket], platform, sentiment, int(total or 0))
+        return list(series.values())
+
+    def backfill(self, connection, since: Optional[datetime] = None) -> int:
+        """Rebuild rollups from social_posts (all, or from since's hour); returns rows written"""
+        dialect_name = connection.dialect.name
+        if dialect_name == "postgresql":
+            # Block incremental upserts until the rebuilt rows are committed
+            connection.execute(text("LOCK TABLE social_post_rollups IN SHARE ROW EXCLUSIVE MODE"))
+
+        delete = SocialRollup.__table__.delete()
+        if since is not None:
+            delete = delete.where(SocialRollup.hour >= hour_bucket(since))
+        connection.execute(delete)
+
+        hour = _sql_hour(dialect_name, SocialPost.posted_at)
+        representative_id = func.coalesce(SocialPost.representative_id, NO_REPRESENTATIVE)
+        sentiment = func.coalesce(cast(SocialPost.sentiment, String), literal(NOT_ANALYSED))
+        source = select(hour, representative_id, SocialPost.platform, sentiment, func.count())
+        if since is not None:
+            source = source.where(SocialPost.posted_at >= hour_bucket(since))
+        source = source.group_by(hour, representative_id, SocialPost.platform, sentiment)
+
+        result = connection.execute(SocialRollup.__table__.insert().from_select(
+            ["hour", "representative_id", "platform", "sentiment", "post_count"], source
+        ))
+        return result.rowcount
+
+
+# Singleton instance
+social_rollups = SocialRollupService()
+
+
+def _current_key(target) -> RollupKey:
+    return rollup_key(target.posted_at, target.representative_id, target.platform, target.sentiment)
+
+
+def _previous_key(target) -> RollupKey:
+    values = []
+    for column in ("posted_at", "representative_id", "platform", "sentiment"):
+        history = get_history(target, column)
+        if history.deleted:
+            values.append(history.deleted[0])
+        else:
+            values.append(getattr(target, column))
+    return rollup_key(*values)
+
+
+def _count_insert(mapper, connection, target):
+    social_rollups.apply(connection, {_current_key(target): 1})
+
+
+def _count_update(mapper, connection, target):
+    previous, current = _previous_key(target), _current_key(target)
+    if previous != current:
+        social_rollups.apply(connection, {previous: -1, current: 1})
+
+
+def _count_delete(mapper, connection, target):
+    social_rollups.apply(connection, {_previous_key(target): -1})
+
+
+def _load_previous(target, value, oldvalue, initiator):
+    pass
+
+
+# Load the old value when a key column is set on an expired instance, so
+# _previous_key sees it in the attribute history
+for _column in (SocialPost.posted_at, SocialPost.representative_id, SocialPost.platform, SocialPost.sentiment):
+    event.listen(_column, "set", _load_previous, active_history=True)
+
+event.listen(SocialPost, "after_insert", _count_insert)
+event.listen(SocialPost, "after_update", _count_update)
+event.listen(SocialPost, "after_delete", _count_delete)
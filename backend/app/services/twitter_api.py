@@ -0,0 +1,232 @@
+"""
+Async Twitter/X API v2 client for Voice2Gov
+- Native async requests on the shared pooled HTTP client (no blocking tweepy calls)
+- Bounded concurrency for fan-out across topics and handles
+- Per-endpoint token buckets driven by x-rate-limit-* response headers;
+  a 429 parks only the tasks waiting on that endpoint until its window resets
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, Any
+import httpx
+
+from ..config import settings
+from .http_client import http_clients
+
+
+class TwitterRateLimited(Exception):
+    """The endpoint's window resets later than the caller is willing to wait"""
+
+    def __init__(self, endpoint: str, retry_after: float):
+        super().__init__(f"{endpoint} rate limited for {retry_after:.0f}s")
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+
+class RateLimitBucket:
+    """Token bucket for one endpoint's 15-minute window.
+
+    remaining/reset come from x-rate-limit-remaining and x-rate-limit-reset.
+    Tokens are taken before a request is sent, so concurrent tasks cannot
+    overshoot the window between responses.
+    """
+
+    def __init__(self, endpoint: str, clock=time.time):
+        self.endpoint = endpoint
+        self.clock = clock
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None  # None until the first response
+        self.reset_at: Optional[float] = None
+        self.probing = False
+        self.waits = 0
+
+    def _refill(self, now: float):
+        if self.reset_at is not None and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = None
+
+    def delay(self) -> float:
+        """Seconds until a token is available, taking it if there is one now"""
+        now = self.clock()
+        self._refill(now)
+        if self.remaining is None:
+            # Unknown window: send one request and let its headers size the bucket
+            if self.probing:
+                return 0.05
+            self.probing = True
+            return 0.0
+        if self.remaining > 0:
+            self.remaining -= 1
+            return 0.0
+        if self.reset_at is None:
+            # Exhausted with no known reset: probe again shortly
+            return 1.0
+        return max(0.0, self.reset_at - now)
+
+    async def acquire(self, max_wait: float):
+        while True:
+            delay = self.delay()
+            if delay <= 0:
+                return
+            if delay > max_wait:
+                raise TwitterRateLimited(self.endpoint, delay)
+            self.waits += 1
+            await asyncio.sleep(delay + 0.05)
+
+    def update(self, headers: httpx.Headers):
+        """Fold in the rate-limit headers of a response"""
+        self.probing = False
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset_at = float(headers["x-rate-limit-reset"])
+        except (KeyError, ValueError):
+            return
+        self.limit = limit
+        if self.reset_at is None or reset_at != self.reset_at or self.remaining is None:
+            # New window: the server's count is authoritative
+            self.remaining = remaining
+        else:
+            # Same window: tokens taken by requests still in flight are not in the header yet
+            self.remaining = min(self.remaining, remaining)
+        self.reset_at = reset_at
+
+    def exhaust(self, headers: httpx.Headers):
+        """A 429: no tokens until the reset the server reports"""
+        self.update(headers)
+        self.remaining = 0
+        if self.reset_at is None or self.reset_at <= self.clock():
+            retry_after = headers.get("retry-after")
+            self.reset_at = self.clock() + (float(retry_after) if retry_after else 60.0)
+
+
+class TwitterAPI:
+    """Minimal async client for the v2 endpoints TwitterService uses"""
+
+    def __init__(
+        self,
+        bearer_token: str,
+        base_url: str = "https://api.twitter.com/2",
+        max_concurrency: int = 4,
+        max_wait_seconds: float = 900.0,
+        max_retries: int = 3,
+        client: Optional[httpx.AsyncClient] = None
+    ):
+        self.bearer_token = bearer_token
+        self.base_url = base_url.rstrip("/")
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retries = max_retries
+        self.client = client
+        self.buckets: Dict[str, RateLimitBucket] = {}
+        self.requests = 0
+        self.rate_limited = 0
+        self._semaphores: Dict[Any, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores belong to the loop they are first awaited on
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            self._semaphores = {loop: asyncio.Semaphore(self.max_concurrency)}
+            semaphore = self._semaphores[loop]
+        return semaphore
+
+    def bucket(self, endpoint: str) -> RateLimitBucket:
+        if endpoint not in self.buckets:
+            self.buckets[endpoint] = RateLimitBucket(endpoint)
+        return self.buckets[endpoint]
+
+    async def get(self, endpoint: str, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET base_url + path; endpoint names the rate-limit bucket (e.g. "tweets/search/recent")"""
+        bucket = self.bucket(endpoint)
+        client = self.client or http_clients.get("twitter")
+        headers = {"Authorization": f"Bearer {self.bearer_token}"}
+
+        for _ in range(self.max_retries + 1):
+            # Wait for a token outside the semaphore so parked tasks hold no slot
+            await bucket.acquire(self.max_wait_seconds)
+            try:
+                async with self._semaphore():
+                    response = await client.get(f"{self.base_url}/{path}", params=params, headers=headers)
+            finally:
+                bucket.probing = False
+            self.requests += 1
+
+            if response.status_code == 429:
+                self.rate_limited += 1
+                bucket.exhaust(response.headers)
+                continue
+            bucket.update(response.headers)
+            response.raise_for_status()
+            return response.json()
+
+        raise TwitterRateLimited(endpoint, max(0.0, (bucket.reset_at or time.time()) - time.time()))
+
+    async def search_recent(
+        self,
+        query: str,
+        max_results: int,
+        start_time: Optional[str] = None,
+        since_id: Optional[int] = None,
+        next_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        params = {
+            "query": query,
+            "max_results": max(10, min(max_results, 100)),
+            "tweet.fields": "created_at,public_metrics,author_id,lang",
+            "user.fields": "name,username",
+            "expansions": "author_id"
+        }
+        if start_time:
+            params["start_time"] = start_time
+        if since_id:
+            params["since_id"] = str(since_id)
+        if next_token:
+            params["next_token"] = next_token
+        return await self.get("tweets/search/recent", "tweets/search/recent", params)
+
+    async def get_user_by_username(self, username: str) -> Dict[str, Any]:
+        return await self.get("users/by/username", f"users/by/username/{username}")
+
+    async def get_users_tweets(
+        self,
+        user_id: str,
+        max_results: int,
+        since_id: Optional[int] = None,
+        pagination_token: Optional[str] = None
+    ) -> Dict[str, Any]:
+        params = {
+            "max_results": max(5, min(max_results, 100)),
+            "tweet.fields": "created_at,public_metrics",
+            "user.fields": "name,username",
+            "expansions": "author_id"
+        }
+        if since_id:
+            params["since_id"] = str(since_id)
+        if pagination_token:
+            params["pagination_token"] = pagination_token
+        return await self.get("users/tweets", f"users/{user_id}/tweets", params)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "rateLimited": self.rate_limited,
+            "buckets": {
+                name: {"remaining": bucket.remaining, "limit": bucket.limit, "resetAt": bucket.reset_at, "waits": bucket.waits}
+                for name, bucket in self.buckets.items()
+            }
+        }
+
+
+def create_twitter_api() -> Optional[TwitterAPI]:
+    """Client for the configured bearer token, or None without one"""
+    if not settings.twitter_bearer_token:
+        return None
+    return TwitterAPI(
+        settings.twitter_bearer_token,
+        base_url=settings.twitter_api_base_url,
+        max_concurrency=settings.twitter_max_concurrency,
+        max_wait_seconds=settings.twitter_rate_limit_max_wait_seconds
+    )
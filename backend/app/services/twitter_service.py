@@ -1,7 +1,9 @@
+import asyncio
 import tweepy
 from typing import Optional, List
 from datetime import datetime, timedelta
 from ..config import settings
+from .twitter_api import create_twitter_api
 
 
 class TwitterService:
@@ -14,7 +16,8 @@ class TwitterService:
         self.access_token_secret = settings.twitter_access_token_secret
         self.bearer_token = settings.twitter_bearer_token
         
-        self.client = None
+        # v2 reads go through the async client; tweepy is only used for v1.1
+        self.client = create_twitter_api()
         self.api = None
         
         if self.is_configured():
@@ -25,19 +28,8 @@ class TwitterService:
         return bool(self.bearer_token or (self.api_key and self.api_secret))
     
     def _initialize_client(self):
-        """Initialize Twitter API client"""
+        """Initialize Twitter API v1.1 client"""
         try:
-            # Twitter API v2 client
-            if self.bearer_token:
-                self.client = tweepy.Client(
-                    bearer_token=self.bearer_token,
-                    consumer_key=self.api_key,
-                    consumer_secret=self.api_secret,
-                    access_token=self.access_token,
-                    access_token_secret=self.access_token_secret,
-                    wait_on_rate_limit=True
-                )
-            
             # Twitter API v1.1 for some features
             if self.api_key and self.api_secret and self.access_token and self.access_token_secret:
                 auth = tweepy.OAuthHandler(self.api_key, self.api_secret)
@@ -46,59 +38,68 @@ class TwitterService:
         except Exception as e:
             print(f"Error initializing Twitter client: {e}")
     
+    def _tweet(self, tweet: dict, username: Optional[str], name: Optional[str]) -> dict:
+        metrics = tweet.get("public_metrics") or {}
+        return {
+            "platform_id": str(tweet["id"]),
+            "author_handle": username or "unknown",
+            "author_name": name,
+            "content": tweet.get("text", ""),
+            "url": f"https://twitter.com/{username or 'i'}/status/{tweet['id']}",
+            "likes": metrics.get("like_count", 0),
+            "shares": metrics.get("retweet_count", 0),
+            "comments": metrics.get("reply_count", 0),
+            "posted_at": _parse_time(tweet.get("created_at")),
+            "language": tweet.get("lang")
+        }
+    
+    def _users(self, response: dict) -> dict:
+        return {user["id"]: user for user in (response.get("includes") or {}).get("users", [])}
+    
     async def search_tweets(
         self,
         query: str,
         max_results: int = 100,
-        since_hours: int = 24
+        since_hours: int = 24,
+        since_id: Optional[int] = None
     ) -> List[dict]:
-        """Search for tweets matching a query"""
+        """Search for tweets matching a query.
+        
+        With since_id, returns every newer tweet (paging up to
+        twitter_poll_max_pages) instead of the last since_hours.
+        """
         if not self.client:
             return []
         
         try:
             # Calculate start time
-            start_time = datetime.utcnow() - timedelta(hours=since_hours)
-            
-            # Search tweets using v2 API
-            response = self.client.search_recent_tweets(
-                query=query,
-                max_results=min(max_results, 100),
-                start_time=start_time,
-                tweet_fields=["created_at", "public_metrics", "author_id", "lang"],
-                user_fields=["name", "username"],
-                expansions=["author_id"]
-            )
-            
-            if not response.data:
-                return []
-            
-            # Build user lookup
-            users = {}
-            if response.includes and "users" in response.includes:
-                for user in response.includes["users"]:
-                    users[user.id] = {
-                        "name": user.name,
-                        "username": user.username
-                    }
+            start_time = None
+            if not since_id:
+                start_time = (datetime.utcnow() - timedelta(hours=since_hours)).strftime("%Y-%m-%dT%H:%M:%SZ")
             
             tweets = []
-            for tweet in response.data:
-                author = users.get(tweet.author_id, {})
-                metrics = tweet.public_metrics or {}
+            next_token = None
+            for _ in range(settings.twitter_poll_max_pages):
+                # Search tweets using v2 API
+                response = await self.client.search_recent(
+                    query,
+                    max_results=max_results,
+                    start_time=start_time,
+                    since_id=since_id,
+                    next_token=next_token
+                )
                 
-                tweets.append({
-                    "platform_id": str(tweet.id),
-                    "author_handle": author.get("username", "unknown"),
-                    "author_name": author.get("name"),
-                    "content": tweet.text,
-                    "url": f"https://twitter.com/{author.get('username', 'i')}/status/{tweet.id}",
-                    "likes": metrics.get("like_count", 0),
-                    "shares": metrics.get("retweet_count", 0),
-                    "comments": metrics.get("reply_count", 0),
-                    "posted_at": tweet.created_at,
-                    "language": tweet.lang
-                })
+                # Build user lookup
+                users = self._users(response)
+                for tweet in response.get("data") or []:
+                    author = users.get(tweet.get("author_id"), {})
+                    tweets.append(self._tweet(tweet, author.get("username"), author.get("name")))
+                
+                next_token = (response.get("meta") or {}).get("next_token")
+                if not since_id or not next_token:
+                    break
+            else:
+                print(f"Twitter search '{query}': more than {settings.twitter_poll_max_pages} pages since {since_id}; older tweets skipped")
             
             return tweets
         
@@ -106,48 +107,58 @@ class TwitterService:
             print(f"Error searching tweets: {e}")
             return []
     
+    async def resolve_user_id(self, username: str) -> Optional[str]:
+        """Account id for a handle"""
+        if not self.client:
+            return None
+        try:
+            user = (await self.client.get_user_by_username(username.lstrip("@"))).get("data")
+            return user["id"] if user else None
+        except Exception as e:
+            print(f"Error resolving Twitter user {username}: {e}")
+            return None
+    
     async def get_user_tweets(
         self,
         username: str,
-        max_results: int = 50
+        max_results: int = 50,
+        since_id: Optional[int] = None,
+        user_id: Optional[str] = None
     ) -> List[dict]:
-        """Get tweets from a specific user"""
+        """Get tweets from a specific user.
+        
+        With since_id, pages forward to every tweet newer than it. A known
+        user_id skips the username lookup.
+        """
         if not self.client:
             return []
         
         try:
             # Get user ID
-            user = self.client.get_user(username=username)
-            if not user.data:
-                return []
-            
-            user_id = user.data.id
-            
-            # Get user tweets
-            response = self.client.get_users_tweets(
-                id=user_id,
-                max_results=min(max_results, 100),
-                tweet_fields=["created_at", "public_metrics"],
-            )
-            
-            if not response.data:
+            user_id = user_id or await self.resolve_user_id(username)
+            if not user_id:
                 return []
             
             tweets = []
-            for tweet in response.data:
-                metrics = tweet.public_metrics or {}
+            pagination_token = None
+            for _ in range(settings.twitter_poll_max_pages):
+                # Get user tweets
+                response = await self.client.get_users_tweets(
+                    user_id,
+                    max_results=max_results,
+                    since_id=since_id,
+                    pagination_token=pagination_token
+                )
+                
+                author = self._users(response).get(user_id, {})
+                for tweet in response.get("data") or []:
+                    tweets.append(self._tweet(tweet, author.get("username", username), author.get("name")))
                 
-                tweets.append({
-                    "platform_id": str(tweet.id),
-                    "author_handle": username,
-                    "author_name": user.data.name,
-                    "content": tweet.text,
-                    "url": f"https://twitter.com/{username}/status/{tweet.id}",
-                    "likes": metrics.get("like_count", 0),
-                    "shares": metrics.get("retweet_count", 0),
-                    "comments": metrics.get("reply_count", 0),
-                    "posted_at": tweet.created_at
-                })
+                pagination_token = (response.get("meta") or {}).get("next_token")
+                if not since_id or not pagination_token:
+                    break
+            else:
+                print(f"Twitter timeline @{username}: more than {settings.twitter_poll_max_pages} pages since {since_id}; older tweets skipped")
             
             return tweets
         
@@ -163,22 +174,15 @@ class TwitterService:
     ) -> List[dict]:
         """Search for tweets about governance topics in Nigeria"""
         
-        default_topics = [
-            "Nigerian government",
-            "NASS Nigeria",
-            "House of Reps Nigeria",
-            "Senate Nigeria",
-            "Governor Nigeria",
-            "LGA Nigeria"
-        ]
+        search_topics = topics or GOVERNANCE_TOPICS
         
-        search_topics = topics or default_topics
-        all_tweets = []
-        
-        for topic in search_topics:
-            query = f"{topic} lang:en -is:retweet"
-            tweets = await self.search_tweets(query, max_results=max_results // len(search_topics))
-            all_tweets.extend(tweets)
+        # Topics are fetched concurrently; the client bounds in-flight
+        # requests and holds back only tasks whose endpoint is rate limited
+        results = await asyncio.gather(*[
+            self.search_tweets(governance_query(topic), max_results=max_results // len(search_topics))
+            for topic in search_topics
+        ])
+        all_tweets = [tweet for tweets in results for tweet in tweets]
         
         # Remove duplicates
         seen = set()
@@ -191,6 +195,27 @@ class TwitterService:
         return unique_tweets
 
 
+GOVERNANCE_TOPICS = [
+    "Nigerian government",
+    "NASS Nigeria",
+    "House of Reps Nigeria",
+    "Senate Nigeria",
+    "Governor Nigeria",
+    "LGA Nigeria"
+]
+
+
+def governance_query(topic: str) -> str:
+    return f"{topic} lang:en -is:retweet"
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """v2 timestamps look like 2024-01-31T12:00:00.000Z"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
 # Singleton instance
 twitter_service = TwitterService()
 
@@ -0,0 +1 @@
+# Voice2Gov benchmarks and load tests
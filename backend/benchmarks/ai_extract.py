@@ -0,0 +1,142 @@
+"""
+AI extraction of long listing pages: one 4000-character prompt vs chunked extraction
+
+Builds NASS-style member listing pages (the generator from
+benchmarks.html_parse, --cards entries each) or reads saved pages from
+--corpus (*.html), turns them into page text as scrape_with_ai does, and
+extracts representatives against a local OpenAI-compatible stub whose
+"model" returns every entry it can see in the prompt (an entry cut off by
+the end of the prompt comes back with the fields it had):
+  previous: one prompt over text[:4000], keeping its first record, as
+            scrape_with_ai did before chunking
+  chunked:  ChunkedExtractor over the whole page, once with one LLM call at a
+            time and once with --concurrency calls in flight
+Reports records per page against the entries on the page, merged duplicates
+and incomplete records, wall-clock per page, requests and tokens.
+
+Usage (from backend/):
+    python -m benchmarks.ai_extract --pages 6 --cards 100 --concurrency 4 --latency-ms 800
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import random
+import re
+import time
+
+from app.services.ai_extraction import ChunkedExtractor, ENTRY_START
+from app.services.html_parser import page_text, available_backends
+from app.services.openai_service import openai_service
+from .html_parse import listing
+from .stub_server import StubServer, stub_llm_app
+
+EMAIL = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+PHONE = re.compile(r"\+?\d[\d ]{9,16}\d")
+HANDLE = re.compile(r"(?<![\w.])@(\w{1,15})\b")
+
+
+def respond(messages):
+    """Every entry in the prompt as a JSON array"""
+    content = messages[-1]["content"].split("\n\n", 1)[-1]
+    records = []
+    for line in content.splitlines():
+        if ENTRY_START.match(line):
+            records.append({"name": line.strip(), "party": None, "state": None, "constituency": None,
+                            "email": None, "phone": None, "twitter": None, "bio": None})
+        elif records:
+            record = records[-1]
+            if "·" in line and not record["state"]:
+                record["state"], _, record["party"] = (part.strip() for part in line.partition("·"))
+            email, phone, handle = EMAIL.search(line), PHONE.search(line), HANDLE.search(line)
+            record["email"] = record["email"] or (email.group() if email else None)
+            record["phone"] = record["phone"] or (phone.group() if phone else None)
+            record["twitter"] = record["twitter"] or (handle.group(1) if handle else None)
+            if not (email or phone or "·" in line):
+                record["bio"] = record["bio"] or line[:120]
+    return json.dumps(records)
+
+
+def load_pages(args):
+    backend = available_backends()[0]
+    if args.corpus:
+        htmls = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                htmls.append(f.read())
+    else:
+        rng = random.Random(25)
+        htmls = [listing("house_reps", page, args.cards, rng) for page in range(args.pages)]
+    return [page_text(backend, html) for html in htmls]
+
+
+def usage():
+    return openai_service.requests, openai_service.prompt_tokens + openai_service.completion_tokens
+
+
+def complete(record) -> bool:
+    return all(record.get(key) for key in ("name", "state", "party", "email", "phone", "twitter"))
+
+
+def run(label: str, pages, extract):
+    requests, tokens = usage()
+    found = entries = full = 0
+    start = time.perf_counter()
+    for text in pages:
+        records = asyncio.run(extract(text))
+        found += len(records)
+        full += sum(1 for record in records if complete(record))
+        entries += sum(1 for line in text.splitlines() if ENTRY_START.match(line))
+    elapsed = time.perf_counter() - start
+    requests, tokens = usage()[0] - requests, usage()[1] - tokens
+    print(
+        f"{label}: {found / len(pages):.1f} records/page of {entries / len(pages):.0f} entries ({found / max(1, entries):.0%}), "
+        f"{full} complete; {elapsed / len(pages):.2f}s/page; {requests / len(pages):.1f} requests, {tokens / len(pages):.0f} tokens per page"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=6)
+    parser.add_argument("--cards", type=int, default=100, help="Entries per generated page")
+    parser.add_argument("--corpus", help="Directory of saved *.html listing pages to use instead")
+    parser.add_argument("--chunk-chars", type=int, default=4000)
+    parser.add_argument("--overlap", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    pages = load_pages(args)
+    print(f"{len(pages)} pages, {sum(len(text) for text in pages) / len(pages) / 1000:.0f}k characters of text per page")
+
+    with StubServer(stub_llm_app(args.latency_ms, respond, per_token_ms=args.per_token_ms)) as server:
+        openai_service.api_key = "bench"
+        openai_service.base_url = f"{server.base_url}/v1"
+
+        async def previous(text):
+            records = await openai_service.extract_representatives(text[:4000], "member")
+            return [record for record in records or [] if record.get("name")][:1]
+
+        run("previous, text[:4000]", pages, previous)
+        for concurrency in (1, args.concurrency):
+            extractor = ChunkedExtractor(
+                openai_service, chunk_chars=args.chunk_chars, overlap_chars=args.overlap,
+                concurrency=concurrency, max_chunks=1000
+            )
+
+            async def chunked(text):
+                result = await extractor.extract(text, "member")
+                return result.records
+
+            run(f"chunked x{args.chunk_chars}, {concurrency} concurrent", pages, chunked)
+        stats = asyncio.run(extractor.extract(pages[0], "member")).stats
+        print(f"one page: {stats.chunks} chunks ({stats.chunks_failed} failed), {stats.duplicates} duplicates merged, {stats.records} records")
+
+
+if __name__ == "__main__":
+    main()
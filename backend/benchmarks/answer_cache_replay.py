@@ -0,0 +1,100 @@
+"""
+Replay a constitution question log through the answer cache
+
+Each question is looked up in an AnswerCache; misses call a stub LLM that
+sleeps for --llm-ms. Reports hit rate and latency with and without the
+cache. Without --log, a synthetic Zipf-distributed log of common citizen
+questions (with casing, punctuation and wording variants) is used.
+
+Usage (from backend/):
+    python -m benchmarks.answer_cache_replay --log questions.txt --llm-ms 2500
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from app.services.answer_cache import AnswerCache, normalize_question
+from app.services.cache_backends import InMemoryCacheBackend
+from .common import format_latency
+
+TOPICS = [
+    ("right to life", ["What does the constitution say about the right to life?", "right to life", "Right to Life?"]),
+    ("freedom of religion", ["freedom of religion", "Is there freedom of religion in Nigeria?", "FREEDOM OF RELIGION"]),
+    ("personal liberty", ["Can police detain me without trial?", "can the police detain me without a trial", "right to personal liberty"]),
+    ("expression", ["freedom of expression", "Do I have freedom of expression and the press?", "freedom of the press"]),
+    ("movement", ["freedom of movement", "Can I move freely to any state?", "right to freedom of movement"]),
+    ("dignity", ["right to dignity of human person", "Is torture allowed?", "dignity of the human person"]),
+    ("fair hearing", ["right to fair hearing", "Do I have a right to a lawyer?", "fair hearing in court"]),
+    ("citizenship", ["How do I become a citizen?", "citizenship by registration", "Nigerian citizenship rules"]),
+    ("impeachment", ["How can a governor be impeached?", "impeachment of the governor", "Who can impeach the president?"]),
+    ("assembly", ["right to peaceful assembly", "Can I join a protest?", "freedom of assembly and association"]),
+]
+
+
+def synthetic_log(size: int, seed: int = 42):
+    rng = random.Random(seed)
+    # Zipf-like popularity: a handful of topics dominate
+    weights = [1 / (rank + 1) for rank in range(len(TOPICS))]
+    questions = []
+    for _ in range(size):
+        _, variants = rng.choices(TOPICS, weights=weights)[0]
+        questions.append(rng.choice(variants))
+    # Long tail of one-off questions
+    for i in range(size // 10):
+        questions.insert(rng.randrange(len(questions)), f"Question about obscure section {i}?")
+    return questions
+
+
+def retrieve_section_ids(question: str):
+    """Stand-in for the full-text retrieval step: same normalized question, same sections"""
+    rng = random.Random(normalize_question(question))
+    return sorted(rng.sample(range(1, 321), 3))
+
+
+async def replay(questions, llm_ms: int, use_cache: bool):
+    cache = AnswerCache(InMemoryCacheBackend(max_entries=1000), ttl_seconds=3600)
+
+    async def stub_llm(question):
+        await asyncio.sleep(llm_ms / 1000)
+        return f"Answer to {question}"
+
+    samples = []
+    for question in questions:
+        section_ids = retrieve_section_ids(question)
+        start = time.perf_counter()
+        answer = await cache.get(question, section_ids) if use_cache else None
+        if answer is None:
+            answer = await stub_llm(question)
+            if use_cache:
+                await cache.set(question, section_ids, answer)
+        samples.append(time.perf_counter() - start)
+    return samples, await cache.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="File with one question per line")
+    parser.add_argument("--size", type=int, default=500, help="Synthetic log size when --log is not given")
+    parser.add_argument("--llm-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log) as f:
+            questions = [line.strip() for line in f if line.strip()]
+    else:
+        questions = synthetic_log(args.size)
+
+    uncached, _ = asyncio.run(replay(questions, args.llm_ms, use_cache=False))
+    cached, stats = asyncio.run(replay(questions, args.llm_ms, use_cache=True))
+
+    print(f"questions={len(questions)} distinct_normalized={len({normalize_question(q) for q in questions})}")
+    print(f"hit rate={stats['hitRate']:.1%} hits={stats['hits']} misses={stats['misses']}")
+    print(format_latency("without cache", uncached))
+    print(format_latency("with cache", cached))
+    print(f"total LLM wait: {sum(uncached):.1f}s -> {sum(cached):.1f}s ({1 - sum(cached) / sum(uncached):.1%} saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Concurrent list requests through the sync session adapter vs AsyncSession
+
+Fires N concurrent GET /api/petitions/ and /api/representatives/ requests
+at the ASGI app in one event loop, first with get_db yielding the sync
+Session adapter (DATABASE_ASYNC=false) and then an AsyncSession on the
+async driver (aiosqlite / asyncpg). A ticker task measures how long the
+event loop is stalled: with sync sessions every query blocks the loop.
+
+Run it against PostgreSQL (BENCH_DATABASE_URL) for throughput numbers; on
+the default SQLite file aiosqlite adds a thread hop per statement, so only
+the loop-stall comparison is meaningful there.
+
+Usage (from backend/):
+    python -m benchmarks.async_db_concurrency --rows 200000 --requests 500 --concurrency 100
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+
+import httpx
+
+from .common import (
+    make_engine, make_session_factory, make_async_session_factory, reset_schema,
+    override_get_db, format_latency, bench_database_url
+)
+from .petition_pagination import TABLES, seed
+
+TICK = 0.005
+
+
+class LoopMonitor:
+    """Records how late a periodic ticker wakes up"""
+
+    def __init__(self, interval: float = TICK):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+        self._tick_start = 0.0
+
+    def _record(self):
+        self.lags.append(max(0.0, time.perf_counter() - self._tick_start - self.interval))
+
+    async def _run(self):
+        while True:
+            self._tick_start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self._record()
+
+    def __enter__(self):
+        self._tick_start = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        # A tick still pending at the end was blocked for the remainder of the run
+        self._record()
+        self._task.cancel()
+
+
+async def run(app, requests: int, concurrency: int, pages: int):
+    rng = random.Random(3)
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i: int):
+            async with semaphore:
+                if i % 2:
+                    path, params = "/api/petitions/", {"page": rng.randint(1, pages), "limit": 20}
+                else:
+                    path, params = "/api/representatives/states/list", {}
+                start = time.perf_counter()
+                response = await client.get(path, params=params)
+                response.raise_for_status()
+                samples.append(time.perf_counter() - start)
+
+        with LoopMonitor() as monitor:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            elapsed = time.perf_counter() - start
+
+    return samples, elapsed, monitor.lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=200, help="Petition pages to spread requests over")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    seed(engine, SessionFactory, args.rows)
+    print(f"seeded {args.rows} petitions into {bench_database_url()}")
+
+    for label, factory in (
+        ("sync adapter", SessionFactory),
+        ("async session", make_async_session_factory()),
+    ):
+        app = override_get_db(factory)
+        samples, elapsed, lags = asyncio.run(run(app, args.requests, args.concurrency, args.pages))
+        print(f"{label}: {len(samples) / elapsed:.0f} req/s")
+        print(format_latency(f"{label} latency", samples))
+        print(format_latency(f"{label} loop lag", lags) + f" stalled={sum(lags) / elapsed:.0%}")
+
+
+if __name__ == "__main__":
+    main()
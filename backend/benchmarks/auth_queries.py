@@ -0,0 +1,86 @@
+"""
+SQL statements per authenticated request, with and without the principal cache
+
+Issues tokens for a pool of users and replays GET /api/auth/me and
+POST /api/petitions/{id}/sign, counting statements on the engine. The
+"legacy" pass uses email-only tokens (the old lookup by email), the
+"uncached" pass disables the principal cache, and the "cached" pass uses
+the in-process cache.
+
+Usage (from backend/):
+    python -m benchmarks.auth_queries --users 200 --requests 2000
+"""
+
+import argparse
+import logging
+import random
+from datetime import timedelta
+
+from app.routers import auth as auth_router
+from app.routers.auth import create_access_token
+from app.services.cache_backends import InMemoryCacheBackend
+from app.services.principal_cache import PrincipalCache
+from app.models.petition import Petition, Signature
+from app.models.user import User
+from .common import make_engine, make_session_factory, reset_schema, make_client, QueryCounter, Timer
+from .petition_pagination import TABLES, seed
+
+SIGN_TABLES = TABLES + ["signatures", "petition_timeline"]
+
+
+def seed_users(SessionFactory, users: int):
+    db = SessionFactory()
+    db.add_all([User(email=f"user{i}@bench.ng", password_hash="x", name=f"User {i}") for i in range(users)])
+    db.commit()
+    rows = [(u.id, u.email, u.token_version) for u in db.query(User).order_by(User.id)]
+    db.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--petitions", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    reset_schema(engine, SIGN_TABLES)
+    SessionFactory = make_session_factory(engine)
+    seed(engine, SessionFactory, args.petitions)
+    users = seed_users(SessionFactory, args.users)
+    client = make_client(SessionFactory)
+    expires = timedelta(hours=1)
+
+    passes = (
+        ("legacy", 0, lambda u: {"sub": u[1]}),
+        ("uncached", 0, lambda u: {"sub": u[1], "uid": u[0], "ver": u[2]}),
+        ("cached", 60, lambda u: {"sub": u[1], "uid": u[0], "ver": u[2]}),
+    )
+    for label, ttl, claims in passes:
+        with engine.begin() as conn:
+            conn.execute(Signature.__table__.delete())
+            conn.execute(Petition.__table__.update().values(signature_count=0))
+        auth_router.principal_cache = PrincipalCache(InMemoryCacheBackend(args.users), ttl)
+        tokens = {u[0]: create_access_token(claims(u), expires) for u in users}
+        rng = random.Random(11)
+
+        for path in ("/api/auth/me", "sign"):
+            with QueryCounter(engine) as counter, Timer() as timer:
+                for _ in range(args.requests):
+                    user = rng.choice(users)
+                    headers = {"Authorization": f"Bearer {tokens[user[0]]}"}
+                    if path == "sign":
+                        response = client.post(f"/api/petitions/{rng.randint(1, args.petitions)}/sign", json={}, headers=headers)
+                    else:
+                        response = client.get(path, headers=headers)
+                    assert response.status_code in (200, 400), response.text
+            print(
+                f"{label:9s} {path:14s} {counter.count / args.requests:.2f} statements/request, "
+                f"{args.requests / timer.elapsed:.0f} req/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
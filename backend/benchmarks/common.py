@@ -0,0 +1,132 @@
+"""
+Shared helpers for Voice2Gov benchmarks
+- Engine setup against BENCH_DATABASE_URL (SQLite file by default)
+- Schema creation for the tables a benchmark touches
+- Latency percentile reporting
+"""
+
+import os
+import tempfile
+import time
+from typing import List, Dict, Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app import models  # noqa: F401 - registers all tables on Base.metadata
+
+
+def bench_database_url() -> str:
+    """Database to benchmark against; never the application database by accident"""
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url:
+        return url
+    path = os.path.join(tempfile.gettempdir(), "voice2gov_bench.db")
+    return f"sqlite:///{path}"
+
+
+def make_engine(url: Optional[str] = None, pool_size: int = 32):
+    """Create an engine sized for concurrent benchmark workers"""
+    url = url or bench_database_url()
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"timeout": 30, "check_same_thread": False})
+    return create_engine(url, pool_size=pool_size, max_overflow=pool_size)
+
+
+def reset_schema(engine, table_names: List[str]):
+    """Drop and recreate the given tables"""
+    tables = [Base.metadata.tables[name] for name in table_names]
+    Base.metadata.drop_all(bind=engine, tables=tables)
+    Base.metadata.create_all(bind=engine, tables=tables)
+
+
+def make_session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def make_async_session_factory(url: Optional[str] = None, pool_size: int = 32):
+    """async_sessionmaker on the async driver for the benchmark database"""
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    from app.database import async_database_url
+
+    url = async_database_url(url or bench_database_url())
+    if url.startswith("sqlite"):
+        engine = create_async_engine(url, connect_args={"timeout": 30})
+    else:
+        engine = create_async_engine(url, pool_size=pool_size, max_overflow=pool_size)
+    return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """p50/p99/max of latency samples, in milliseconds"""
+    if not samples:
+        return {"p50": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"p50": pick(0.50), "p99": pick(0.99), "max": ordered[-1] * 1000}
+
+
+def format_latency(label: str, samples: List[float]) -> str:
+    stats = percentiles(samples)
+    return f"{label}: n={len(samples)} p50={stats['p50']:.2f}ms p99={stats['p99']:.2f}ms max={stats['max']:.2f}ms"
+
+
+class Timer:
+    """Context manager measuring wall-clock seconds"""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._on_execute)
+
+
+def override_get_db(SessionFactory):
+    """Point the app's get_db at SessionFactory (sync sessionmaker or async_sessionmaker)"""
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+    from app.database import get_db, SyncSessionAdapter
+    from app.main import app
+
+    if isinstance(SessionFactory, async_sessionmaker):
+        async def override():
+            async with SessionFactory() as db:
+                yield db
+    else:
+        async def override():
+            db = SessionFactory()
+            try:
+                yield SyncSessionAdapter(db)
+            finally:
+                db.close()
+
+    app.dependency_overrides[get_db] = override
+    return app
+
+
+def make_client(SessionFactory):
+    """FastAPI TestClient whose get_db dependency uses the benchmark database"""
+    from fastapi.testclient import TestClient
+
+    return TestClient(override_get_db(SessionFactory))
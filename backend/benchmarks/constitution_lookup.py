@@ -0,0 +1,119 @@
+"""
+Constitution lookup: per-row to_tsvector scan vs stored search_vector + GIN
+
+Loads a synthetic constitution (320 sections by default, roughly the size of
+the 1999 Constitution) and times the retrieval query used by
+POST /api/legal/constitution in its old and new forms. PostgreSQL only.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.constitution_lookup --sections 320 --copies 10
+"""
+
+import argparse
+import random
+import sys
+
+from sqlalchemy import func, text
+
+from app.models.legal_document import LegalDocument
+from .common import make_engine, make_session_factory, reset_schema, format_latency, Timer
+
+QUESTIONS = [
+    "right to life",
+    "freedom of religion",
+    "can the police detain me without trial",
+    "right to personal liberty",
+    "freedom of expression and the press",
+    "who can impeach the governor",
+    "citizenship by registration",
+    "fundamental objectives of state policy",
+]
+
+VOCABULARY = (
+    "person right freedom liberty life religion expression press assembly association movement "
+    "citizen citizenship registration naturalisation court trial detention arrest police state "
+    "federal governor president senate house assembly impeachment election commission budget "
+    "revenue allocation local government council education health environment dignity privacy"
+).split()
+
+
+def seed(SessionFactory, sections: int, copies: int):
+    rng = random.Random(1999)
+    db = SessionFactory()
+    docs = []
+    for copy in range(copies):
+        for number in range(1, sections + 1):
+            words = rng.sample(VOCABULARY, 6)
+            body = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(80, 400)))
+            docs.append({
+                "title": "1999 Constitution of Nigeria" if copy == 0 else f"Constitution draft {copy}",
+                "chapter": f"Chapter {number // 30 + 1}",
+                "section": f"Section {number}",
+                "heading": " ".join(words[:3]).title(),
+                "content": body,
+                "tags": words[3:],
+            })
+    db.bulk_insert_mappings(LegalDocument, docs)
+    db.commit()
+    db.close()
+
+
+def legacy_lookup(db, question: str):
+    ts_query = func.plainto_tsquery("english", question)
+    return (
+        db.query(LegalDocument.id)
+        .filter(
+            func.to_tsvector("english", LegalDocument.content).match(ts_query)
+            | func.to_tsvector("english", LegalDocument.heading).match(ts_query)
+        )
+        .limit(5)
+        .all()
+    )
+
+
+def ranked_lookup(db, question: str):
+    ts_query = func.plainto_tsquery("english", question)
+    rank = func.ts_rank_cd(LegalDocument.search_vector, ts_query)
+    return (
+        db.query(LegalDocument.id)
+        .filter(LegalDocument.search_vector.op("@@")(ts_query))
+        .order_by(rank.desc(), LegalDocument.id)
+        .limit(5)
+        .all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=320)
+    parser.add_argument("--copies", type=int, default=1, help="Repeat the corpus to simulate more documents")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    if engine.dialect.name != "postgresql":
+        print("This benchmark needs PostgreSQL full-text search; set BENCH_DATABASE_URL")
+        sys.exit(1)
+
+    reset_schema(engine, ["legal_documents"])
+    SessionFactory = make_session_factory(engine)
+    with Timer() as timer:
+        seed(SessionFactory, args.sections, args.copies)
+    print(f"loaded {args.sections * args.copies} sections in {timer.elapsed:.1f}s")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE legal_documents"))
+
+    db = SessionFactory()
+    for label, lookup in (("per-row to_tsvector", legacy_lookup), ("search_vector + GIN", ranked_lookup)):
+        samples = []
+        for _ in range(args.repeat):
+            for question in QUESTIONS:
+                with Timer() as timer:
+                    lookup(db, question)
+                samples.append(timer.elapsed)
+        print(format_latency(label, samples))
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Contact extraction over scraped page text: per-pattern scans vs the compiled extractor
+
+Generates ~10 MB of NASS/state-site style page text - paragraphs of
+biography and news prose, a --density share of them carrying a profile
+card (name, LGA, state, party, email, a phone in one of the usual Nigerian
+formats, handle) - or reads *.txt files from --corpus, and extracts
+contacts two ways:
+  previous: the scraper's former extract_emails, extract_phones (four
+            regexes) and extract_twitter_handles, then its five-state and
+            five-party substring loops (copied here)
+  compiled: ContactExtractor.extract, one pass
+Reports time and throughput, entity counts by kind, and checks that
+everything the previous code found (phones compared in E.164, handles
+that were really the domain of an email left out) is also found by the
+compiled extractor on the corpus, and that the phrases in EXPECTED yield
+exactly the entities listed for them.
+
+Usage (from backend/):
+    python -m benchmarks.contact_extract --megabytes 10 --density 0.25 --repeat 3
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import time
+
+from app.services.contact_extractor import ContactExtractor, normalize_phone, load_gazetteer, DEFAULT_GAZETTEER, PARTIES
+
+OLD_STATES = ["Lagos", "Kano", "Rivers", "FCT", "Kaduna"]
+OLD_PARTIES = ["APC", "PDP", "LP", "NNPP", "APGA"]
+# Headings and phrases from government pages, with exactly what each must yield
+# for the listed kinds: all-caps text where a masked match can hide a shorter
+# real name, phrases that name no state, and people who share an LGA's name
+EXPECTED = [
+    ("THE APC won", "parties", ["APC"]),
+    ("Governor of KANO STATE, APC", "states", ["Kano"]),
+    ("Governor of KANO STATE, APC", "parties", ["APC"]),
+    ("HOUSE OF REPRESENTATIVES, LAGOS STATE", "states", ["Lagos"]),
+    ("SENATOR REPRESENTING RIVERS STATE (PDP)", "parties", ["PDP"]),
+    ("Oil spills in the Niger Delta", "states", []),
+    ("COMMISSION FOR THE NIGER DELTA", "states", []),
+    ("Peter Obi (LP) visited the market", "lgas", []),
+    ("Member representing Obi Federal Constituency, Benue State", "lgas", [("Obi", "Benue"), ("Obi", "Nasarawa")]),
+]
+FIRST = ["Ade", "Musa", "Chika", "Ngozi", "Bello", "Emeka", "Aisha", "Tunde", "Ifeanyi", "Halima", "Yakubu", "Funmi"]
+LAST = ["Okafor", "Abubakar", "Adeyemi", "Eze", "Ibrahim", "Nwosu", "Suleiman", "Balogun", "Danjuma", "Okonkwo"]
+PROSE = (
+    "The member sponsored bills on rural electrification and primary health care, and chaired the committee on "
+    "appropriations during the second session. Constituents raised concerns about road maintenance, flooding and "
+    "the payment of teachers' salaries at a town hall meeting held in the council secretariat. The office can be "
+    "reached during working hours for petitions, and a constituency liaison officer attends to walk-in visitors "
+    "every week. In the last plenary the senate considered the report on the supplementary budget."
+).split(". ")
+
+
+def phone(rng: random.Random) -> str:
+    digits = f"{rng.choice(['70', '80', '81', '90', '91'])}{rng.randint(0, 9)}{rng.randint(1000000, 9999999)}"
+    return rng.choice([
+        f"0{digits[:3]} {digits[3:6]} {digits[6:]}", f"0{digits}", f"+234 {digits[:3]} {digits[3:6]} {digits[6:]}",
+        f"+234{digits}", f"+234 (0) {digits[:3]}-{digits[3:6]}-{digits[6:]}", f"0{digits[:3]}-{digits[3:7]}-{digits[7:]}",
+        f"080{rng.randint(0, 9)} {rng.randint(1000, 9999)} {rng.randint(1000, 9999)}"
+    ])
+
+
+def make_text(megabytes: float, density: float, rng: random.Random) -> str:
+    """Paragraphs of prose; a density share of them end with a profile card"""
+    states, lgas = load_gazetteer(DEFAULT_GAZETTEER)
+    places = [(state, lga) for state, names in lgas.items() for lga in names]
+    parties = [names[-1] if rng.random() < 0.2 else acronym for acronym, names in PARTIES.items()]
+    parts, size, i = [], 0, 0
+    while size < megabytes * 1e6:
+        paragraph = ". ".join(rng.choice(PROSE) for _ in range(3 if density >= 1 else 12)) + "."
+        if rng.random() < density:
+            state, lga = rng.choice(places)
+            name = f"{rng.choice(FIRST)} {rng.choice(LAST)}"
+            handle = f"{name.split()[0].lower()}_{i}"
+            paragraph = (
+                f"Hon. {name} - {rng.choice(['Senator', 'Member'])} representing {lga} Federal Constituency, {state} State. "
+                f"Party: {rng.choice(parties)}. Email: {handle}@nass.gov.ng. Tel: {phone(rng)}. Follow @{handle} for updates. "
+            ) + paragraph
+            i += 1
+        parts.append(paragraph)
+        size += len(paragraph)
+    return "\n\n".join(parts)
+
+
+def load_corpus(args) -> str:
+    if args.corpus:
+        texts = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.txt"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                texts.append(f.read())
+        return "\n".join(texts)
+    return make_text(args.megabytes, args.density, random.Random(23))
+
+
+def extract_emails(text: str):
+    emails = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', text)
+    return list(set(e for e in emails if not e.endswith('.png') and not e.endswith('.jpg')))
+
+
+def extract_phones(text: str):
+    phones = []
+    for pattern in [r'\+234\s*\d{3}\s*\d{3}\s*\d{4}', r'\+234\d{10}', r'0[789]0\s*\d{4}\s*\d{4}', r'0[789]0\d{8}']:
+        phones.extend(re.findall(pattern, text))
+    return list(set(phones))
+
+
+def extract_twitter_handles(text: str):
+    return list(set(re.findall(r'@([A-Za-z0-9_]{1,15})', text)))
+
+
+def previous(text: str):
+    """What the scraper ran per page before the compiled extractor"""
+    emails = extract_emails(text)
+    phones = extract_phones(text)
+    handles = extract_twitter_handles(text)
+    states = [state for state in OLD_STATES if state in text]
+    parties = [party for party in OLD_PARTIES if party in text]
+    return emails, phones, handles, states, parties
+
+
+def best_of(repeat: int, call):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = call()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--megabytes", type=float, default=10.0)
+    parser.add_argument("--density", type=float, default=0.25, help="Share of paragraphs with a profile card (1 = cards only)")
+    parser.add_argument("--corpus", help="Directory of *.txt page texts to use instead")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    text = load_corpus(args)
+    megabytes = len(text.encode()) / 1e6
+    extractor = ContactExtractor()
+    start = time.perf_counter()
+    extractor.pattern
+    print(f"corpus: {megabytes:.1f} MB; extractor compiled in {(time.perf_counter() - start) * 1000:.0f}ms ({len(extractor.names)} names)")
+
+    old_time, (emails, phones, handles, states, parties) = best_of(args.repeat, lambda: previous(text))
+    new_time, contacts = best_of(args.repeat, lambda: extractor.extract(text))
+    old_count = len(emails) + len(phones) + len(handles) + len(states) + len(parties)
+    print(
+        f"previous: {old_time * 1000:.0f}ms ({megabytes / old_time:.0f} MB/s); {old_count} entities: {len(emails)} emails, "
+        f"{len(phones)} phones, {len(handles)} handles, {len(states)} states, {len(parties)} parties"
+    )
+    print(
+        f"compiled: {new_time * 1000:.0f}ms ({megabytes / new_time:.0f} MB/s); {contacts.count} entities: {len(contacts.emails)} emails, "
+        f"{len(contacts.phones)} phones, {len(contacts.handles)} handles, {len(contacts.states)} states, "
+        f"{len(contacts.lgas)} LGAs, {len(contacts.parties)} parties"
+    )
+
+    email_domains = {email.split("@", 1)[1] for email in emails}
+    real_handles = {h for h in handles if not any(domain.startswith(h) for domain in email_domains)}
+    missing = {
+        "emails": set(emails) - set(contacts.emails),
+        "phones": {normalize_phone(p) for p in phones} - set(contacts.phones),
+        "handles": real_handles - set(contacts.handles),
+        "states": set(states) - set(contacts.states),
+        "parties": set(parties) - set(contacts.parties),
+    }
+    print(
+        f"speed-up {old_time / new_time:.1f}x; compiled finds everything the previous code did: "
+        f"{not any(missing.values())}{'' if not any(missing.values()) else ' ' + str({k: sorted(v)[:5] for k, v in missing.items() if v})}; "
+        f"{len(handles) - len(real_handles)} previous 'handles' were email domains"
+    )
+    wrong = []
+    for case, kind, expected in EXPECTED:
+        got = getattr(extractor.extract(case), kind)
+        if got != expected:
+            wrong.append((case, kind, expected, got))
+    print(f"expected entities on {len(EXPECTED)} phrases: {not wrong}")
+    for case, kind, expected, got in wrong:
+        print(f"  {case!r}: {kind} {got}, expected {expected}")
+    if any(missing.values()) or wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Sustained signing throughput per signature counter mode
+
+Signs one hot petition with N distinct users under concurrency, once per
+counter mode, with the background flusher running for sharded/buffered.
+Reports signatures/sec and exits non-zero unless every mode's folded count
+matches the signature rows.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.counter_throughput --signers 5000 --concurrency 64
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.petition import Petition, Signature
+from app.models.user import User
+from app.services.signature_counter import create_signature_counter
+from app.services.signing_service import SigningService
+from .common import make_engine, make_session_factory, reset_schema, format_latency, Timer
+from .signing_load import TABLES, setup
+
+MODES = ["single", "sharded", "buffered"]
+
+
+def run_mode(mode: str, signers: int, concurrency: int, shards: int, flush_ms: int):
+    engine = make_engine(pool_size=concurrency)
+    reset_schema(engine, TABLES + ["petition_counter_shards"])
+    SessionFactory = make_session_factory(engine)
+    petition_id = setup(SessionFactory, signers, goal=signers)
+
+    db = SessionFactory()
+    user_ids = [u.id for u in db.query(User.id).filter(User.email.like("signer%")).all()]
+    db.close()
+
+    counter = create_signature_counter(mode, shards=shards, flush_ms=flush_ms)
+    service = SigningService(counter=counter)
+
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.wait(counter.flush_interval):
+            counter.flush(SessionFactory)
+
+    flush_thread = None
+    if mode != "single":
+        flush_thread = threading.Thread(target=flusher, daemon=True)
+        flush_thread.start()
+
+    latencies = []
+    errors = []
+
+    def sign(user_id: int):
+        session = SessionFactory()
+        start = time.perf_counter()
+        try:
+            service.sign(session, petition_id, user_id)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            session.rollback()
+            errors.append(str(e))
+        finally:
+            session.close()
+
+    with Timer() as timer:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(sign, user_ids))
+
+    stop.set()
+    if flush_thread:
+        flush_thread.join()
+    counter.flush(SessionFactory)
+
+    db = SessionFactory()
+    count = db.query(Petition.signature_count).filter(Petition.id == petition_id).scalar()
+    rows = db.query(Signature).filter(Signature.petition_id == petition_id).count()
+    db.close()
+
+    print(f"[{mode}] {len(latencies) / timer.elapsed:.0f} signatures/s over {timer.elapsed:.2f}s errors={len(errors)}")
+    print(f"[{mode}] {format_latency('sign latency', latencies)}")
+    print(f"[{mode}] folded signature_count={count} signature_rows={rows}")
+    engine.dispose()
+    return count == rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signers", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--flush-ms", type=int, default=250)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    args = parser.parse_args()
+    mismatched = [
+        mode for mode in args.modes
+        if not run_mode(mode, args.signers, args.concurrency, args.shards, args.flush_ms)
+    ]
+    if mismatched:
+        raise SystemExit(f"folded signature_count does not match signature rows for: {', '.join(mismatched)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+GET /api/social/digests/{id} latency: range-scan re-derivation vs recorded membership
+
+Seeds social_posts (5M rows by default) with a few busy representatives,
+then stores digests for a busy and a quiet representative with explicit
+membership (social_digest_posts), plus a daily digest that overlaps the
+busy weekly one. Times:
+  legacy:  the previous endpoint body - every is_included_in_digest post in
+           the period, unpaginated - without and with the
+           (representative_id, posted_at, id) index
+  current: the endpoint, first page and a page from the middle by cursor
+and counts how many posts the legacy lookup returns that were never in the
+digest.
+
+Usage (from backend/):
+    python -m benchmarks.digest_fetch --posts 5000000 --repeat 20
+"""
+
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, text, update
+
+from app.models.social import SocialPost, SocialDigest, SocialDigestPost, Sentiment, Platform
+from app.pagination import encode_cursor
+from .common import make_engine, make_session_factory, reset_schema, make_client, format_latency, Timer
+
+TABLES = ["states", "lgas", "representatives", "social_posts", "social_post_rollups", "social_digests", "social_digest_posts"]
+CHUNK = 50000
+DAYS = 90
+BUSY = 10  # representatives 1..BUSY get 2% of all posts each
+REPRESENTATIVES = 2000
+INDEX = "ix_social_posts_rep_posted_at_id"
+
+
+def seed_posts(engine, posts: int, now: datetime):
+    rng = random.Random(19)
+    sentiments = [s.name for s in Sentiment] + [None]
+    with engine.begin() as conn:
+        for start in range(0, posts, CHUNK):
+            conn.execute(SocialPost.__table__.insert(), [
+                {
+                    "platform": Platform.TWITTER.name,
+                    "platform_id": f"fetch-{i}",
+                    "author_handle": f"citizen{i % 5000}",
+                    "content": f"Citizen post {i} about roads, power and schools in the constituency",
+                    "sentiment": rng.choice(sentiments),
+                    "representative_id": rng.randint(1, BUSY) if rng.random() < 0.02 * BUSY else rng.randint(BUSY + 1, REPRESENTATIVES),
+                    "posted_at": now - timedelta(seconds=rng.randint(0, DAYS * 86400))
+                }
+                for i in range(start, min(start + CHUNK, posts))
+            ])
+
+
+def store_digest(engine, representative_id: int, start: datetime, end: datetime, share: float, seed: int) -> int:
+    """A digest over a random share of the representative's posts in the period"""
+    posts = SocialPost.__table__
+    with engine.begin() as conn:
+        ids = conn.scalars(select(posts.c.id).where(
+            posts.c.representative_id == representative_id, posts.c.posted_at >= start, posts.c.posted_at <= end
+        )).all()
+        rng = random.Random(seed)
+        member_ids = sorted(rng.sample(ids, int(len(ids) * share)))
+        digest_id = conn.execute(SocialDigest.__table__.insert().values(
+            representative_id=representative_id, title=f"Digest {seed}", summary="...",
+            post_ids=json.dumps(member_ids), period_start=start, period_end=end
+        )).inserted_primary_key[0]
+        conn.execute(SocialDigestPost.__table__.insert(), [{"digest_id": digest_id, "post_id": i} for i in member_ids])
+        for i in range(0, len(member_ids), 1000):
+            conn.execute(update(posts).where(posts.c.id.in_(member_ids[i:i + 1000])).values(is_included_in_digest=True))
+    return digest_id
+
+
+def legacy_get_digest(SessionFactory, digest_id: int):
+    """The previous endpoint: all flagged posts in the representative's period"""
+    db = SessionFactory()
+    digest = db.get(SocialDigest, digest_id)
+    posts = db.scalars(select(SocialPost).where(
+        SocialPost.is_included_in_digest == True,
+        SocialPost.posted_at >= digest.period_start,
+        SocialPost.posted_at <= digest.period_end,
+        SocialPost.representative_id == digest.representative_id
+    )).all()
+    payload = [
+        {"id": p.id, "platform": p.platform, "authorHandle": p.author_handle, "content": p.content,
+         "sentiment": p.sentiment, "postedAt": p.posted_at}
+        for p in posts
+    ]
+    db.close()
+    return payload
+
+
+def time_calls(call, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the tables from a previous run")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    now = datetime.utcnow()
+    week_start = now - timedelta(days=7)
+    if not args.skip_seed:
+        reset_schema(engine, TABLES)
+        with Timer() as timer:
+            seed_posts(engine, args.posts, now)
+            busy = store_digest(engine, 1, week_start, now, 0.6, seed=1)
+            store_digest(engine, 1, now - timedelta(days=2), now - timedelta(days=1), 0.5, seed=2)
+            quiet = store_digest(engine, REPRESENTATIVES, week_start, now, 0.6, seed=3)
+        print(f"seeded {args.posts} posts and 3 digests in {timer.elapsed:.1f}s")
+    else:
+        busy, quiet = 1, 3
+
+    client = make_client(SessionFactory)
+    db = SessionFactory()
+    for digest_id in (busy, quiet):
+        members = set(db.scalars(select(SocialDigestPost.post_id).where(SocialDigestPost.digest_id == digest_id)))
+        # Cursor halfway through the digest, found outside the timed loop
+        middle = db.execute(
+            select(SocialPost.posted_at, SocialPost.id)
+            .where(SocialPost.id.in_(select(SocialDigestPost.post_id).where(SocialDigestPost.digest_id == digest_id)))
+            .order_by(SocialPost.posted_at, SocialPost.id)
+            .offset(len(members) // 2)
+            .limit(1)
+        ).first()
+        label = f"digest {digest_id} ({len(members)} posts)"
+
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP INDEX IF EXISTS {INDEX}"))
+        legacy = legacy_get_digest(SessionFactory, digest_id)
+        print(format_latency(f"{label} legacy, no index", time_calls(lambda: legacy_get_digest(SessionFactory, digest_id), args.repeat)))
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {INDEX} ON social_posts (representative_id, posted_at, id)"))
+        print(format_latency(f"{label} legacy, indexed", time_calls(lambda: legacy_get_digest(SessionFactory, digest_id), args.repeat)))
+
+        url = f"/api/social/digests/{digest_id}"
+        for page, params in (("first page", {"limit": args.limit}), ("middle page", {"limit": args.limit, "cursor": encode_cursor(list(middle))})):
+            def fetch():
+                response = client.get(url, params=params)
+                assert response.status_code == 200, response.text
+            print(format_latency(f"{label} current, {page}", time_calls(fetch, args.repeat)))
+
+        cursor, fetched = None, []
+        while True:
+            body = client.get(url, params={"limit": 100, **({"cursor": cursor} if cursor else {})}).json()
+            fetched += [p["id"] for p in body["posts"]]
+            cursor = body["pagination"]["nextCursor"]
+            if not cursor:
+                break
+        print(
+            f"{label}: legacy returns {len(legacy)} posts, {len({p['id'] for p in legacy} - members)} never in the digest; "
+            f"paging returns exactly the members: {set(fetched) == members and len(fetched) == len(members)}"
+        )
+
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT social_posts.id FROM social_posts WHERE representative_id = 1 "
+        "AND posted_at >= :start AND EXISTS (SELECT 1 FROM social_digest_posts m WHERE m.digest_id = 1 "
+        "AND m.post_id = social_posts.id) ORDER BY posted_at, id LIMIT 51"
+    ), {"start": week_start}).all() if engine.dialect.name == "sqlite" else []
+    for row in plan:
+        print(f"plan: {row[-1]}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
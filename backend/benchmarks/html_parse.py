@@ -0,0 +1,134 @@
+"""
+HTML parsing of NASS-style listing pages: parser backends and the process pool
+
+Generates a corpus of saved-page-sized NASS listings (senator and member
+cards inside a heavy page shell: scripts, styles, mega-menu navigation,
+footer), or reads real saved pages from --corpus (*.html; files with
+"senator" in the name are parsed as senator listings, the rest as House
+member listings). Then:
+  backends: extract_page over the corpus with each installed backend
+            (html.parser, lxml, selectolax) - ms per page, MB/s, and
+            whether the records and links match html.parser's
+  event loop: the corpus parsed while a 10ms ticker runs on the loop,
+            once inline (the previous scraper) and once through
+            ParserPool with --workers processes - wall-clock time and the
+            worst ticker stall, i.e. how long other requests would wait
+
+Usage (from backend/):
+    python -m benchmarks.html_parse --pages 40 --cards 400 --workers 2
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import random
+import time
+
+from app.services.html_parser import ParserPool, available_backends, extract_page
+from .common import percentiles
+
+PARTIES = ["APC", "PDP", "LP", "NNPP", "APGA"]
+STATES = ["Lagos", "Kano", "Rivers", "FCT", "Kaduna", "Oyo", "Enugu", "Borno"]
+
+
+def listing(kind: str, page: int, cards: int, rng: random.Random) -> str:
+    css = "".join(f".c{i}{{margin:{i}px}}" for i in range(400))
+    script = "var menu = " + repr([f"item {i}" for i in range(800)]) + ";"
+    menu = "".join(f'<li><a href="/section/{i}">Section {i}</a><ul>' + "".join(
+        f'<li><a href="/section/{i}/{j}">Item {j}</a></li>' for j in range(12)) + "</ul></li>" for i in range(25))
+    card_class = "senator-profile card" if kind == "senators" else "member-profile card"
+    body = "".join(
+        f'<article class="{card_class}"><img src="/photos/{page}-{i}.jpg" alt="">'
+        f'<h3 class="name">Hon. {rng.choice(["Ade", "Musa", "Chika", "Ngozi", "Bello"])} {page}-{i}</h3>'
+        f'<p class="meta">{rng.choice(STATES)} &middot; {rng.choice(PARTIES)}</p>'
+        f'<p class="contact">Email: rep{page}x{i}@nass.gov.ng &middot; Tel: +234 80{i % 10} {rng.randint(100, 999)} {rng.randint(1000, 9999)}'
+        f' &middot; @rep_{page}_{i}</p><div class="bio"><p>' + "Committee member and sponsor of bills. " * 6 + "</p></div></article>"
+        for i in range(cards)
+    )
+    return (
+        f"<!DOCTYPE html><html><head><title>National Assembly</title><style>{css}</style><script>{script}</script></head>"
+        f"<body><header><nav><ul>{menu}</ul></nav></header><main>{body}</main>"
+        f'<div class="pager"><a href="?page={page + 1}">Next</a></div>'
+        f"<footer>{menu}</footer></body></html>"
+    )
+
+
+def load_corpus(args):
+    if args.corpus:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(args.corpus, "*.html"))):
+            with open(path, encoding="utf-8", errors="replace") as f:
+                kind = "senators" if "senator" in os.path.basename(path).lower() else "house_reps"
+                pages.append((kind, f"https://nass.gov.ng/{os.path.basename(path)}", f.read()))
+        return pages
+    rng = random.Random(22)
+    return [
+        ("senators" if page % 3 == 0 else "house_reps", f"https://nass.gov.ng/listing?page={page}", listing("senators" if page % 3 == 0 else "house_reps", page, args.cards, rng))
+        for page in range(args.pages)
+    ]
+
+
+def compare_backends(corpus, megabytes: float):
+    expected = None
+    for backend in ["html.parser"] + [b for b in available_backends() if b != "html.parser"]:
+        start = time.perf_counter()
+        output = [extract_page(backend, html, kind, url) for kind, url, html in corpus]
+        elapsed = time.perf_counter() - start
+        if expected is None:
+            expected = output
+        records = sum(len(page["records"]) for page in output)
+        print(
+            f"{backend}: {elapsed / len(corpus) * 1000:.1f}ms/page, {megabytes / elapsed:.1f} MB/s, "
+            f"{records} records; matches html.parser: {output == expected}"
+        )
+
+
+async def parse_under_load(corpus, pool: ParserPool):
+    """Parse every page concurrently while a ticker measures event-loop stalls"""
+    stalls, done = [], False
+
+    async def ticker():
+        while not done:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls.append(max(0.0, time.perf_counter() - start - 0.01))
+
+    tick = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(pool.extract_page(kind, url, html) for kind, url, html in corpus))
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+    return elapsed, percentiles(stalls), sum(len(page["records"]) for page in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--cards", type=int, default=400, help="Profile cards per generated page")
+    parser.add_argument("--corpus", help="Directory of saved *.html pages to use instead")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--backend", default="auto", help="Backend for the event-loop runs")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    megabytes = sum(len(html.encode()) for _, _, html in corpus) / 1e6
+    print(f"corpus: {len(corpus)} pages, {megabytes:.1f} MB; {os.cpu_count()} CPUs; backends installed: {', '.join(available_backends())}")
+    compare_backends(corpus, megabytes)
+
+    runs = [("inline, html.parser", ParserPool("html.parser", workers=0)), (f"inline, {args.backend}", ParserPool(args.backend, workers=0))]
+    runs.append((f"pool x{args.workers}, {args.backend}", ParserPool(args.backend, workers=args.workers, inline_bytes=0)))
+    for label, pool in runs:
+        pool.warm_up()
+        elapsed, stalls, records = asyncio.run(parse_under_load(corpus, pool))
+        print(
+            f"{label}: {elapsed:.2f}s for {records} records; event loop stall p50={stalls['p50']:.1f}ms "
+            f"p99={stalls['p99']:.1f}ms max={stalls['max']:.1f}ms"
+        )
+        asyncio.run(pool.stop())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Per-call httpx clients vs the shared client registry
+
+Sends N POSTs at a local stub chat-completions server, first opening a new
+AsyncClient per request (the old _make_request pattern) and then through
+HttpClientRegistry. Use --tls to include TLS handshakes in the comparison.
+
+Usage (from backend/):
+    python -m benchmarks.http_client_pool --requests 2000 --concurrency 50 --tls
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.http_client import HttpClientRegistry
+from .common import format_latency
+from .stub_server import StubServer, stub_llm_app
+
+PAYLOAD = {"model": "stub", "messages": [{"role": "user", "content": "ping"}]}
+
+
+async def run(base_url: str, requests: int, concurrency: int, pooled: bool, verify: bool):
+    registry = HttpClientRegistry(max_connections=concurrency, max_keepalive_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    samples = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            if pooled:
+                client = registry.get("bench", verify=verify)
+                response = await client.post(f"{base_url}/v1/chat/completions", json=PAYLOAD)
+            else:
+                async with httpx.AsyncClient(verify=verify) as client:
+                    response = await client.post(f"{base_url}/v1/chat/completions", json=PAYLOAD, timeout=60.0)
+            response.raise_for_status()
+            samples.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    await registry.close()
+    return samples, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Server-side delay per request")
+    parser.add_argument("--tls", action="store_true")
+    args = parser.parse_args()
+
+    with StubServer(stub_llm_app(args.latency_ms), tls=args.tls) as server:
+        for label, pooled in (("per-call client", False), ("shared registry", True)):
+            samples, elapsed = asyncio.run(run(server.base_url, args.requests, args.concurrency, pooled, verify=False))
+            print(f"{label}: {len(samples) / elapsed:.0f} req/s")
+            print(format_latency(f"{label} latency", samples))
+
+
+if __name__ == "__main__":
+    main()
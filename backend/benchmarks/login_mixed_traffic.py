@@ -0,0 +1,129 @@
+"""
+Petition-list latency during a login spike, bcrypt inline vs offloaded
+
+Runs a paced stream of logins alongside a steady stream of GET
+/api/petitions/ requests in one event loop and reports list-endpoint
+latency, measured from each request's scheduled send time. Inline mode
+verifies passwords on the event loop (the old handler behaviour); offloaded
+mode uses PasswordService's bounded thread pool. Logins rejected with 503
+by the pool's backpressure are counted. Set --login-interval-ms 0 for an
+unpaced burst; keep the login rate under the machine's bcrypt capacity to
+compare event-loop blocking rather than raw CPU saturation.
+
+Usage (from backend/):
+    python -m benchmarks.login_mixed_traffic --logins 100 --login-interval-ms 50 --rounds 12
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+
+from app.models.user import User
+from app.routers import auth as auth_router
+from app.services.password_service import PasswordService
+from .common import make_engine, make_session_factory, reset_schema, override_get_db, format_latency
+from .petition_pagination import TABLES, seed
+
+PASSWORD = "correct horse battery staple"
+
+
+class InlinePasswordService(PasswordService):
+    """The pre-offload behaviour: bcrypt runs on the event loop thread"""
+
+    async def _run(self, fn, *args):
+        return fn(*args)
+
+
+def seed_users(SessionFactory, users: int, password_hash: str):
+    db = SessionFactory()
+    db.add_all([
+        User(email=f"user{i}@bench.ng", password_hash=password_hash, name=f"User {i}")
+        for i in range(users)
+    ])
+    db.commit()
+    db.close()
+
+
+async def paced(count: int, interval: float, fn):
+    """Start fn(i, scheduled) every interval seconds and wait for all of them"""
+    tasks = []
+    base = time.perf_counter()
+    for i in range(count):
+        scheduled = base + i * interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        tasks.append(asyncio.create_task(fn(i, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+async def run(app, logins: int, login_interval: float, lists: int, list_interval: float, users: int):
+    transport = httpx.ASGITransport(app=app)
+    list_samples, login_samples = [], []
+    statuses = {}
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def login(i: int, start: float):
+            response = await client.post("/api/auth/login", data={
+                "username": f"user{i % users}@bench.ng",
+                "password": PASSWORD
+            })
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            login_samples.append(time.perf_counter() - start)
+
+        async def list_petitions(i: int, start: float):
+            response = await client.get("/api/petitions/", params={"cursor": "", "limit": 20})
+            response.raise_for_status()
+            list_samples.append(time.perf_counter() - start)
+
+        # Latency counts from the scheduled send time, so time spent
+        # waiting for a blocked loop is not hidden
+        start = time.perf_counter()
+        await asyncio.gather(
+            paced(lists, list_interval, list_petitions),
+            paced(logins, login_interval, login)
+        )
+        elapsed = time.perf_counter() - start
+
+    return list_samples, login_samples, statuses, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Petitions to seed")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--login-interval-ms", type=float, default=150.0)
+    parser.add_argument("--lists", type=int, default=300)
+    parser.add_argument("--list-interval-ms", type=float, default=20.0)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-queue", type=int, default=64)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    seed(engine, SessionFactory, args.rows)
+    offloaded = PasswordService(rounds=args.rounds, workers=args.workers, max_queue=args.max_queue)
+    seed_users(SessionFactory, args.users, offloaded.context.hash(PASSWORD))
+    app = override_get_db(SessionFactory)
+
+    for label, service in (
+        ("inline bcrypt", InlinePasswordService(rounds=args.rounds)),
+        ("offloaded bcrypt", offloaded),
+    ):
+        auth_router.password_service = service
+        list_samples, login_samples, statuses, elapsed = asyncio.run(
+            run(app, args.logins, args.login_interval_ms / 1000, args.lists, args.list_interval_ms / 1000, args.users)
+        )
+        print(f"{label}: {elapsed:.2f}s, login statuses {dict(sorted(statuses.items()))}")
+        print(format_latency("  petition list", list_samples))
+        print(format_latency("  login", login_samples))
+        asyncio.run(service.stop())
+
+
+if __name__ == "__main__":
+    main()
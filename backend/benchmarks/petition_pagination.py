@@ -0,0 +1,112 @@
+"""
+Page 1 vs page 500 latency for GET /api/petitions/ (OFFSET vs keyset cursor)
+
+Builds a synthetic petitions table (1M rows by default) and times the
+first and 500th page in both pagination modes.
+
+Usage (from backend/):
+    python -m benchmarks.petition_pagination --rows 1000000 --repeat 20
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.models.petition import Petition, PetitionCategory, PetitionStatus
+from app.models.representative import Representative, State, Chamber
+from app.models.user import User
+from app.pagination import encode_cursor
+from .common import make_engine, make_session_factory, reset_schema, make_client, format_latency, Timer
+
+TABLES = ["states", "lgas", "users", "representatives", "petitions", "petition_counter_shards"]
+LIMIT = 20
+CHUNK = 50000
+
+
+def seed(engine, SessionFactory, rows: int):
+    db = SessionFactory()
+    state = State(name="Lagos", code="LA")
+    db.add(state)
+    db.flush()
+    rep = Representative(name="Bench Rep", chamber=Chamber.SENATE, state_id=state.id)
+    user = User(email="creator@bench.ng", password_hash="x", name="Creator")
+    db.add_all([rep, user])
+    db.commit()
+    rep_id, user_id = rep.id, user.id
+    db.close()
+
+    base = datetime(2024, 1, 1)
+    categories = list(PetitionCategory)
+    with engine.begin() as conn:
+        for start in range(0, rows, CHUNK):
+            conn.execute(Petition.__table__.insert(), [
+                {
+                    "title": f"Petition {i}",
+                    "description": "Synthetic petition",
+                    "category": categories[i % len(categories)].name,
+                    "target_representative_id": rep_id,
+                    "creator_id": user_id,
+                    "status": PetitionStatus.ACTIVE.name,
+                    "signature_count": 0,
+                    "signature_goal": 1000,
+                    # Three petitions per second so ties exercise the id tiebreak
+                    "created_at": base + timedelta(seconds=i // 3)
+                }
+                for i in range(start, min(start + CHUNK, rows))
+            ])
+
+
+def time_requests(client, params, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get("/api/petitions/", params=params)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the table from a previous run")
+    args = parser.parse_args()
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    if not args.skip_seed:
+        reset_schema(engine, TABLES)
+        with Timer() as timer:
+            seed(engine, SessionFactory, args.rows)
+        print(f"seeded {args.rows} petitions in {timer.elapsed:.1f}s")
+
+    client = make_client(SessionFactory)
+
+    # Cursor pointing just before page 500, found once outside the timed loop
+    db = SessionFactory()
+    anchor = (
+        db.query(Petition.created_at, Petition.id)
+        .order_by(Petition.created_at.desc(), Petition.id.desc())
+        .offset(499 * LIMIT - 1)
+        .first()
+    )
+    db.close()
+    page_500_cursor = encode_cursor([anchor.created_at, anchor.id])
+
+    results = [
+        ("offset page 1", {"page": 1, "limit": LIMIT}),
+        ("offset page 500", {"page": 500, "limit": LIMIT}),
+        ("cursor page 1", {"cursor": "", "limit": LIMIT}),
+        ("cursor page 500", {"cursor": page_500_cursor, "limit": LIMIT}),
+    ]
+    for label, params in results:
+        print(format_latency(label, time_requests(client, params, args.repeat)))
+
+    offset_ids = [p["id"] for p in client.get("/api/petitions/", params={"page": 500, "limit": LIMIT}).json()["petitions"]]
+    cursor_ids = [p["id"] for p in client.get("/api/petitions/", params={"cursor": page_500_cursor, "limit": LIMIT}).json()["petitions"]]
+    print(f"page 500 identical in both modes: {offset_ids == cursor_ids}")
+
+
+if __name__ == "__main__":
+    main()
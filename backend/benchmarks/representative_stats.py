@@ -0,0 +1,89 @@
+"""
+Queries and latency for GET /api/representatives/ with cached chamber stats
+
+Seeds a synthetic set of representatives, then reports SQL statements per
+request and latency for a cold cache (stats computed) and warm cache (hit).
+--legacy adds the previous per-chamber COUNT(*) queries for comparison.
+
+Usage (from backend/):
+    python -m benchmarks.representative_stats --representatives 20000 --requests 200
+"""
+
+import argparse
+import random
+import time
+
+from app.models.representative import Representative, State, Chamber
+from app.services.representative_stats import representative_stats
+from .common import make_engine, make_session_factory, reset_schema, make_client, QueryCounter, format_latency
+
+TABLES = ["states", "lgas", "representatives"]
+
+
+def seed(SessionFactory, count: int):
+    db = SessionFactory()
+    state = State(name="Lagos", code="LA")
+    db.add(state)
+    db.flush()
+    chambers = list(Chamber)
+    db.bulk_insert_mappings(Representative, [
+        {
+            "name": f"Representative {i:06d}",
+            "chamber": random.choice(chambers),
+            "state_id": state.id,
+            "is_active": True
+        }
+        for i in range(count)
+    ])
+    db.commit()
+    db.close()
+
+
+def legacy_stats(db):
+    all_reps = db.query(Representative).filter(Representative.is_active == True)
+    stats = {"total": all_reps.count()}
+    for chamber in Chamber:
+        stats[chamber.value] = all_reps.filter(Representative.chamber == chamber).count()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--representatives", type=int, default=20000)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    seed(SessionFactory, args.representatives)
+    client = make_client(SessionFactory)
+
+    # Legacy: the previous seven per-chamber COUNT(*) queries
+    db = SessionFactory()
+    samples = []
+    with QueryCounter(engine) as counter:
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            legacy_stats(db)
+            samples.append(time.perf_counter() - start)
+    db.close()
+    print(f"legacy stats: {counter.count / args.requests:.1f} queries")
+    print(format_latency("legacy stats only", samples))
+
+    for label, invalidate in (("cold cache", True), ("warm cache", False)):
+        samples = []
+        with QueryCounter(engine) as counter:
+            for _ in range(args.requests):
+                if invalidate:
+                    representative_stats.invalidate()
+                start = time.perf_counter()
+                response = client.get("/api/representatives/", params={"limit": 50})
+                samples.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.text
+        print(f"{label}: {counter.count / args.requests:.1f} queries/request")
+        print(format_latency(f"{label} list request", samples))
+
+
+if __name__ == "__main__":
+    main()
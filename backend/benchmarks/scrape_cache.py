@@ -0,0 +1,123 @@
+"""
+Re-running the full scrape sweep against the on-disk page cache
+
+Builds the same fixture sites as benchmarks.scrape_crawl (NASS listings and
+all 37 state government sites), with validators on every host except a few
+that never send ETag / Last-Modified, and runs
+ScraperService.run_full_scrape three times through one PageCache file:
+  cold:    empty cache, everything downloaded and parsed
+  warm:    nothing changed; validating hosts answer 304, the others resend
+           bodies that hash the same, and no page is parsed again
+  changed: a few listing and state pages edited between runs
+Each run reports time, bytes the server sent, 304s, unchanged hashes,
+pages parsed vs reused, and checks the records match the cold run. A last
+pass with a tiny --max-bytes shows LRU eviction keeping the file bounded.
+
+Usage (from backend/):
+    python -m benchmarks.scrape_cache --latency-ms 100 --no-validators 6 --changed 5
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.services.crawler import Crawler
+from app.services.page_cache import PageCache
+from app.services.scraper_service import ScraperService, STATE_GOVERNMENT_SITES
+from .scrape_crawl import build_sites
+from .stub_server import FixtureSites, LocalTransport, StubServer, stub_sites_app
+
+
+def sweep(server: StubServer, cache: PageCache, delay: float):
+    async def run():
+        async with httpx.AsyncClient(transport=LocalTransport(server.base_url), follow_redirects=True) as client:
+            service = ScraperService()
+            service.crawler = Crawler(client=client, per_host_delay=delay, cache=cache)
+            return await service.run_full_scrape()
+    return asyncio.run(run())
+
+
+def records(results):
+    return (
+        sorted(p["name"] for p in results["senators"]),
+        sorted(p["name"] for p in results["house_reps"]),
+        sorted((e["state"], tuple(e["emails"]), tuple(e["phones"])) for e in results["lga_chairmen"])
+    )
+
+
+def change_pages(sites: FixtureSites, count: int, rng: random.Random):
+    """Edit count pages in place; returns the (host, path) keys touched"""
+    keys = rng.sample(sorted((host, path) for host, pages in sites.pages.items() for path in pages), count)
+    for host, path in keys:
+        sites.add_page(host, path, sites.pages[host][path].replace("</body>", "<p>Updated this week</p></body>"))
+    return keys
+
+
+def report(label: str, sites: FixtureSites, results, sent_before: int, not_modified_before: int):
+    crawl = results["crawl"]
+    print(
+        f"{label}: {crawl['seconds']:.1f}s, {crawl['fetched']} pages; server sent {(sites.bytes_sent - sent_before) / 1024:.0f} KiB, "
+        f"{sites.not_modified - not_modified_before} x 304, {crawl['unchanged']} unchanged by hash; "
+        f"{crawl['pages_parsed']} parsed, {crawl['fetched'] - crawl['pages_parsed']} reused"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between request starts on one host")
+    parser.add_argument("--no-validators", type=int, default=6, help="State hosts that send no ETag / Last-Modified")
+    parser.add_argument("--changed", type=int, default=5, help="Pages edited before the third run")
+    parser.add_argument("--max-bytes", type=int, default=20000, help="Cache size for the eviction pass")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    rng = random.Random(21)
+    sites = FixtureSites(latency_ms=args.latency_ms)
+    build_sites(sites, random.Random(20))
+    sites.flaky.clear()
+    hosts = [urlsplit(base).netloc for base in STATE_GOVERNMENT_SITES.values()]
+    sites.no_validators.update(rng.sample(hosts, args.no_validators))
+
+    with tempfile.TemporaryDirectory() as directory, StubServer(stub_sites_app(sites)) as server:
+        cache = PageCache(os.path.join(directory, "pages.sqlite"))
+        cold = sweep(server, cache, args.delay)
+        report("cold", sites, cold, 0, 0)
+        baseline = records(cold)
+
+        sent, not_modified = sites.bytes_sent, sites.not_modified
+        warm = sweep(server, cache, args.delay)
+        report("warm", sites, warm, sent, not_modified)
+        print(f"warm records match cold run: {records(warm) == baseline}")
+
+        touched = change_pages(sites, args.changed, rng)
+        sent, not_modified = sites.bytes_sent, sites.not_modified
+        changed = sweep(server, cache, args.delay)
+        report(f"changed ({len(touched)} pages edited)", sites, changed, sent, not_modified)
+        print(f"changed records match cold run: {records(changed) == baseline}")
+        stats = cache.report()
+        print(
+            f"cache: {stats['entries']} entries, {stats['bytes_on_disk'] / 1024:.0f} KiB on disk, "
+            f"{stats['unchanged_ratio']:.0%} of revalidations unchanged, {stats['parses_skipped']} parses skipped, "
+            f"{stats['bytes_saved'] / 1024:.0f} KiB not re-sent"
+        )
+        cache.close()
+
+        small = PageCache(os.path.join(directory, "small.sqlite"), max_bytes=args.max_bytes)
+        sweep(server, small, args.delay)
+        stats = small.report()
+        print(
+            f"max_bytes={args.max_bytes}: {stats['entries']} entries, {stats['bytes_on_disk']} bytes kept, "
+            f"{stats['evictions']} evictions"
+        )
+        small.close()
+
+
+if __name__ == "__main__":
+    main()
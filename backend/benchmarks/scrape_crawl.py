@@ -0,0 +1,147 @@
+"""
+Full scrape sweep (NASS + 36 states + FCT): serial vs the concurrent crawler
+
+Serves generated copies of the NASS listings (paginated senators and House
+members) and every state government site (home page, LGA page, chairmen
+page, robots.txt) from one local fixture server with injected latency and
+a few flaky pages. ScraperService.run_full_scrape is pointed at it through
+an httpx transport that keeps the real host names, and run twice:
+  serial:     one request at a time (what the previous code amounted to,
+              had it known every state)
+  concurrent: the configured crawler limits
+Each run reports wall-clock time, pages, retries and records found, and
+checks politeness: per-host in-flight peak, spacing between request starts
+on a host, and that no robots.txt-disallowed path was requested.
+
+Usage (from backend/):
+    python -m benchmarks.scrape_crawl --latency-ms 500 --concurrency 16 --per-host 2 --delay 0.5
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.services.crawler import Crawler
+from app.services.scraper_service import ScraperService, STATE_GOVERNMENT_SITES
+from .stub_server import FixtureSites, LocalTransport, StubServer, stub_sites_app
+
+SENATORS = 109
+HOUSE_MEMBERS = 360
+PER_PAGE = 20
+PARTIES = ["APC", "PDP", "LP", "NNPP", "APGA"]
+
+
+def listing(kind: str, people: list, page: int, pages: int) -> str:
+    cards = "".join(
+        f'<div class="{kind}-profile"><h3 class="name">{name}</h3><p>{party} &middot; {email} &middot; 0803 {i:04d} {i:04d}</p></div>'
+        for i, (name, party, email) in enumerate(people)
+    )
+    nav = f'<a href="?page={page + 1}">Next</a>' if page < pages else ""
+    return f"<html><body><h1>{kind.title()}s</h1>{cards}<nav>{nav}</nav></body></html>"
+
+
+def build_sites(sites: FixtureSites, rng: random.Random):
+    for kind, host, path, count in (("senator", "nass.gov.ng", "/senators", SENATORS), ("member", "nassnig.org", "/members", HOUSE_MEMBERS)):
+        people = [(f"Hon. {kind.title()} {i}", rng.choice(PARTIES), f"{kind}{i}@nass.gov.ng") for i in range(count)]
+        pages = (count + PER_PAGE - 1) // PER_PAGE
+        for page in range(1, pages + 1):
+            html = listing(kind, people[(page - 1) * PER_PAGE:page * PER_PAGE], page, pages)
+            sites.add_page(host, path if page == 1 else f"{path}?page={page}", html)
+        sites.robots[host] = "User-agent: *\nDisallow: /admin\n"
+
+    for index, (state, base) in enumerate(STATE_GOVERNMENT_SITES.items()):
+        host = urlsplit(base).netloc
+        slug = state.lower().replace(" ", "")
+        sites.add_page(host, "/", (
+            f"<html><body><h1>{state} State Government</h1>"
+            f'<a href="/local-government">Local Governments</a> <a href="/news">News</a> '
+            f'<a href="/admin/local-government-login">Staff</a></body></html>'
+        ))
+        sites.add_page(host, "/local-government", (
+            f"<html><body><h2>LGAs of {state}</h2>"
+            + "".join(f"<li>{state} LGA {i}</li>" for i in range(rng.randint(8, 30)))
+            + '<a href="/local-government/chairmen">LGA chairmen contacts</a></body></html>'
+        ))
+        sites.add_page(host, "/local-government/chairmen", (
+            "<html><body>"
+            + "".join(
+                f"<p>Chairman {i}: chairman{i}@{slug}.gov.ng, +234 80{i % 10} {rng.randint(100, 999)} {rng.randint(1000, 9999)}</p>"
+                for i in range(5)
+            )
+            + "</body></html>"
+        ))
+        robots = "User-agent: *\nDisallow: /admin\n"
+        if index % 9 == 0:
+            robots += "Crawl-delay: 1\n"
+        sites.robots[host] = robots
+        if index % 6 == 0:
+            sites.flaky[(host, "/local-government")] = 2
+
+
+def politeness(sites: FixtureSites, hosts_robots_disallow: str = "/admin"):
+    peak = max(sites.max_in_flight.values())
+    gaps = []
+    for starts in sites.starts.values():
+        # Skip robots.txt, which is fetched before the host's first page
+        starts = sorted(starts)[1:]
+        gaps += [b - a for a, b in zip(starts, starts[1:])]
+    blocked = sum(1 for _, path in sites.fetched if path.startswith(hosts_robots_disallow))
+    return peak, min(gaps) if gaps else 0.0, blocked
+
+
+async def run(crawler: Crawler):
+    service = ScraperService()
+    service.crawler = crawler
+    return await service.run_full_scrape()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds between request starts on one host")
+    parser.add_argument("--skip-serial", action="store_true")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    modes = [("concurrent", args.concurrency, args.per_host)]
+    if not args.skip_serial:
+        modes.insert(0, ("serial", 1, 1))
+    for label, concurrency, per_host in modes:
+        sites = FixtureSites(latency_ms=args.latency_ms)
+        build_sites(sites, random.Random(20))
+        with StubServer(stub_sites_app(sites)) as server:
+            async def sweep():
+                async with httpx.AsyncClient(transport=LocalTransport(server.base_url), follow_redirects=True) as client:
+                    crawler = Crawler(
+                        client=client,
+                        user_agent="Voice2Gov Bot/1.0",
+                        max_concurrency=concurrency,
+                        per_host_concurrency=per_host,
+                        per_host_delay=args.delay
+                    )
+                    return await run(crawler)
+            results = asyncio.run(sweep())
+
+        crawl = results["crawl"]
+        peak, min_gap, disallowed = politeness(sites)
+        states_with_contacts = sum(1 for entry in results["lga_chairmen"] if entry["emails"])
+        print(
+            f"{label}: {crawl['seconds']:.1f}s, {crawl['fetched']} pages fetched ({crawl['failed']} failed, "
+            f"{crawl['retries']} retries, {crawl['robots_blocked']} blocked by robots.txt) across {crawl['hosts']} hosts; "
+            f"{len(results['senators'])} senators, {len(results['house_reps'])} house members, "
+            f"{states_with_contacts}/{len(STATE_GOVERNMENT_SITES)} states with LGA contacts"
+        )
+        print(
+            f"{label} politeness: peak {peak} in flight per host, min {min_gap:.2f}s between starts on a host, "
+            f"{disallowed} disallowed paths requested"
+        )
+
+
+if __name__ == "__main__":
+    main()
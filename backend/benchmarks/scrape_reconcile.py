@@ -0,0 +1,224 @@
+"""
+Reconciling a large synthetic scrape into representatives
+
+Seeds --representatives senators and House members across all 37 states,
+with contacts stored the way people typed them (local phone formats,
+"@handles"), then builds a --records scrape of them as the listing parsers
+return it: titles ("Hon.", "Distinguished Senator"), names reordered, a
+middle name dropped or a letter mistyped, phones in E.164, a --changed
+share of people with a new party or phone, and some people not in the
+database. Reports:
+  matching: records/s with (state, chamber) blocking and exact-key lookup,
+            vs fuzzy comparison against the whole chamber (timed on a
+            sample); precision and recall against the generator's truth
+  reconcile: ScrapeReconciler.reconcile twice over the same scrape - SQL
+            statements, rows written and rows whose updated_at moved; the
+            second run must write nothing
+
+Usage (from backend/):
+    python -m benchmarks.scrape_reconcile --representatives 5000 --records 50000 --changed 0.02
+"""
+
+import argparse
+import random
+import time
+
+from sqlalchemy import func, select
+
+from app.models.representative import Representative, ContactInfo, State, Chamber, ContactType
+from app.services.contact_extractor import STATE_NAMES, PARTIES
+from app.services.scrape_reconciler import ScrapeReconciler, SCRAPED_CHAMBERS
+from app.services.name_matching import name_tokens, name_similarity
+from .common import make_engine, reset_schema, QueryCounter
+
+TABLES = ["states", "lgas", "representatives", "contact_info"]
+FIRST = ["Ade", "Musa", "Chika", "Ngozi", "Bello", "Emeka", "Aisha", "Tunde", "Ifeanyi", "Halima", "Yakubu", "Funmi",
+         "Godswill", "Oluremi", "Abdul", "Ireti", "Barau", "Kingsley", "Tajudeen", "Nnamdi", "Zainab", "Uche"]
+MIDDLE = ["Obot", "Olusola", "Danladi", "Chukwuma", "Adebayo", "Ibrahim", "Nkechi", "Garba", "Ebere", "Kayode"]
+SYLLABLES = ["ba", "de", "ko", "la", "mi", "chu", "nwa", "olu", "ye", "ji", "ka", "ru", "so", "ze", "ga", "ni", "di", "fu", "ta", "we"]
+TITLES = {Chamber.SENATE: ["Sen.", "Senator", "Distinguished Senator", ""], Chamber.HOUSE_OF_REPS: ["Hon.", "Rt. Hon.", "Hon. Dr.", ""]}
+PARTY_NAMES = [acronym for acronym in PARTIES if len(acronym) > 2]
+
+
+def surname(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def local_phone(rng: random.Random) -> str:
+    return f"0{rng.choice(['803', '805', '806', '813', '816', '703', '706', '813', '903'])} {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+
+
+def e164(phone: str) -> str:
+    return "+234" + phone.replace(" ", "")[1:]
+
+
+def seed(engine, count: int, rng: random.Random):
+    """Representatives with contacts; returns {id: person} for the scrape generator"""
+    people = {}
+    with engine.begin() as connection:
+        connection.execute(State.__table__.insert(), [{"name": name, "code": f"S{i:02d}"} for i, name in enumerate(STATE_NAMES)])
+        state_ids = dict(connection.execute(select(State.__table__.c.name, State.__table__.c.id)).all())
+        reps, contacts = [], []
+        for i in range(1, count + 1):
+            chamber = Chamber.SENATE if i % 4 == 0 else Chamber.HOUSE_OF_REPS
+            state = rng.choice(STATE_NAMES)
+            middle = rng.choice(MIDDLE) if rng.random() < 0.4 else None
+            name = " ".join(part for part in (rng.choice(FIRST), middle, surname(rng)) if part)
+            person = {
+                "id": i, "name": name, "middle": middle, "chamber": chamber, "state": state, "party": rng.choice(PARTY_NAMES),
+                "place": f"{state} {'Central' if chamber == Chamber.SENATE else 'North'} {i}",
+                "photo_url": f"https://nass.gov.ng/photos/{i}.jpg", "email": f"member{i}@nass.gov.ng",
+                "phone": local_phone(rng), "twitter": f"member_{i}"
+            }
+            people[i] = person
+            reps.append({
+                "id": i, "name": name, "title": None, "chamber": chamber, "party": person["party"],
+                "state_id": state_ids[state], "photo_url": person["photo_url"], "is_active": True,
+                "senatorial_district": person["place"] if chamber == Chamber.SENATE else None,
+                "constituency": person["place"] if chamber == Chamber.HOUSE_OF_REPS else None,
+            })
+            contacts += [
+                {"representative_id": i, "contact_type": ContactType.EMAIL, "value": person["email"], "is_primary": True},
+                {"representative_id": i, "contact_type": ContactType.PHONE, "value": person["phone"], "is_primary": True},
+                {"representative_id": i, "contact_type": ContactType.TWITTER, "value": "@" + person["twitter"], "is_primary": True},
+            ]
+        connection.execute(Representative.__table__.insert(), reps)
+        connection.execute(ContactInfo.__table__.insert(), contacts)
+    return people
+
+
+def variant(person, rng: random.Random) -> str:
+    """How a listing page might spell the name"""
+    parts = person["name"].split()
+    roll = rng.random()
+    if roll < 0.15:
+        parts = parts[-1:] + parts[:-1]  # surname first
+    elif roll < 0.25 and person["middle"]:
+        parts.remove(person["middle"])
+    elif roll < 0.35:
+        word = rng.randrange(len(parts))
+        if len(parts[word]) > 4:
+            letter = rng.randrange(1, len(parts[word]))
+            parts[word] = parts[word][:letter] + rng.choice("aeiou") + parts[word][letter + 1:]
+    elif roll < 0.40:
+        parts = [part.upper() for part in parts]
+    return " ".join(part for part in (rng.choice(TITLES[person["chamber"]]), *parts) if part)
+
+
+def make_scrape(people, records: int, changed: float, unknown: float, rng: random.Random):
+    """Scrape results plus the representative id each record should match (None for new people)"""
+    for person in rng.sample(list(people.values()), int(len(people) * changed)):
+        if rng.random() < 0.5:
+            person["party"] = rng.choice([p for p in PARTY_NAMES if p != person["party"]])
+        else:
+            person["phone"] = local_phone(rng)
+
+    results = {"senators": [], "house_reps": [], "lga_chairmen": []}
+    truth = {"senators": [], "house_reps": []}
+    ids = list(people)
+    for n in range(records):
+        if rng.random() < unknown:
+            chamber = rng.choice([Chamber.SENATE, Chamber.HOUSE_OF_REPS])
+            person = {
+                "id": None, "name": f"{rng.choice(FIRST)} {surname(rng)}", "middle": None, "chamber": chamber,
+                "state": rng.choice(STATE_NAMES), "party": rng.choice(PARTY_NAMES), "place": None, "photo_url": None,
+                "email": f"new{n}@nass.gov.ng", "phone": local_phone(rng), "twitter": None
+            }
+        else:
+            person = people[rng.choice(ids)]
+        record = {
+            "name": variant(person, rng), "state": person["state"], "party": person["party"],
+            "email": person["email"], "phone": e164(person["phone"]), "twitter": person["twitter"],
+            "photo_url": person["photo_url"], "source_url": "https://nass.gov.ng/listing"
+        }
+        if person["chamber"] == Chamber.SENATE:
+            results["senators"].append({**record, "district": person["place"]})
+            truth["senators"].append(person["id"])
+        else:
+            results["house_reps"].append({**record, "constituency": person["place"]})
+            truth["house_reps"].append(person["id"])
+    return results, truth["senators"] + truth["house_reps"]
+
+
+def match_all(reconciler: ScrapeReconciler, blocks, results):
+    """Matched representative id (or None) for every scraped record, senators first"""
+    matches = []
+    for kind, chamber in SCRAPED_CHAMBERS.items():
+        for record in results[kind]:
+            candidate, _, _ = reconciler.match(blocks[(record["state"], chamber)], name_tokens(record["name"]))
+            matches.append(candidate.id if candidate else None)
+    return matches
+
+
+def match_unblocked(reconciler: ScrapeReconciler, blocks, records):
+    """Baseline: fuzzy comparison against every candidate in the chamber, no exact-key lookup"""
+    matches = []
+    for chamber, record in records:
+        tokens = name_tokens(record["name"])
+        floor = reconciler.threshold - reconciler.margin
+        score, best = max((name_similarity(tokens, candidate.tokens, floor), candidate.id) for candidate in blocks[(None, chamber)].candidates)
+        matches.append(best if score >= reconciler.threshold else None)
+    return matches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--representatives", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--changed", type=float, default=0.02, help="Share of people with a new party or phone")
+    parser.add_argument("--unknown", type=float, default=0.03, help="Share of records for people not in the database")
+    parser.add_argument("--baseline-sample", type=int, default=100, help="Records timed for the unblocked baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(24)
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    people = seed(engine, args.representatives, rng)
+    results, truth = make_scrape(people, args.records, args.changed, args.unknown, rng)
+    print(f"seeded {args.representatives} representatives; scrape of {args.records} records ({args.unknown:.0%} new people)")
+
+    reconciler = ScrapeReconciler()
+    with engine.connect() as connection:
+        blocks = reconciler._load(connection)
+
+    start = time.perf_counter()
+    matches = match_all(reconciler, blocks, results)
+    elapsed = time.perf_counter() - start
+    records = [(chamber, record) for kind, chamber in SCRAPED_CHAMBERS.items() for record in results[kind]]
+    correct = sum(1 for got, want in zip(matches, truth) if got is not None and got == want)
+    wrong = sum(1 for got, want in zip(matches, truth) if got is not None and got != want)
+    matchable = sum(1 for want in truth if want is not None)
+    print(
+        f"blocked: {elapsed * 1000:.0f}ms, {len(records) / elapsed:.0f} records/s; precision {correct / max(1, correct + wrong):.4f}, "
+        f"recall {correct / max(1, matchable):.4f} ({wrong} wrong, {matchable - correct} missed)"
+    )
+
+    sample = random.Random(1).sample(records, min(args.baseline_sample, len(records)))
+    start = time.perf_counter()
+    match_unblocked(reconciler, blocks, sample)
+    per_record = (time.perf_counter() - start) / len(sample)
+    print(
+        f"unblocked fuzzy: {1 / per_record:.0f} records/s on {len(sample)} sampled records "
+        f"(~{per_record * len(records):.0f}s for the full scrape); blocking speed-up {per_record * len(records) / elapsed:.0f}x"
+    )
+
+    for label in ("first run", "second run, same scrape"):
+        with engine.begin() as connection:
+            connection.execute(Representative.__table__.update().values(updated_at=None))
+        with QueryCounter(engine) as counter:
+            report = reconciler.reconcile(results, engine=engine)
+        with engine.connect() as connection:
+            touched = connection.scalar(select(func.count()).where(Representative.__table__.c.updated_at.isnot(None)))
+        print(
+            f"{label}: {report.seconds * 1000:.0f}ms ({report.matched_per_second:.0f} records/s matched), {counter.count} statements; matched {report.matched} "
+            f"({report.exact} exact, {report.fuzzy} fuzzy, {report.merged} repeats merged), {report.unmatched} unmatched, "
+            f"{report.ambiguous} ambiguous; {report.unchanged} unchanged, {report.profiles_updated} profiles updated, "
+            f"{report.contacts_added} contacts added; updated_at moved on {touched} of {args.representatives} rows; "
+            f"{len(report.changes)} changes reported"
+        )
+        if report.changes:
+            print(f"  e.g. {report.changes[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Query plans and timings for petition/representative search, before and after
+
+Seeds synthetic representatives with Nigerian names and petitions, then for
+each search term prints the plan of the legacy ILIKE query and of the
+SearchService query, and times both. On PostgreSQL the plans come from
+EXPLAIN ANALYZE (trigram GIN indexes are created first); elsewhere the
+in-memory index is timed against a SQLite ILIKE scan.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.search_plans --representatives 200000 --petitions 1000000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import or_, select, text
+
+from app.models.petition import Petition, PetitionCategory, PetitionStatus
+from app.models.representative import Representative, State, Chamber
+from app.database import SyncSessionAdapter
+from app.models.user import User
+from app.services.search_service import SearchService
+from .common import make_engine, make_session_factory, reset_schema, format_latency, Timer
+
+TABLES = ["states", "lgas", "users", "representatives", "petitions"]
+CHUNK = 50000
+
+FIRST_NAMES = ["Oluwaseun", "Chukwuemeka", "Ngozi", "Abubakar", "Adebayo", "Oluremi", "Ifeanyi",
+               "Aishatu", "Babajide", "Nnamdi", "Folasade", "Yakubu", "Chinwe", "Godswill", "Tokunbo"]
+LAST_NAMES = ["Akpabio", "Okonkwo", "Adeyemi", "Ibrahim", "Nwosu", "Oshiomhole", "Ekwunife",
+              "Abaribe", "Sanwo-Olu", "Danjuma", "Obiano", "Uzodimma", "Ndume", "Abiru", "Tinubu"]
+PLACES = ["Ikeja", "Alimosho", "Obio/Akpor", "Ungogo", "Zaria", "Bende", "Egbeda", "Surulere",
+          "Port Harcourt", "Kano Municipal", "Gwagwalada", "Badagry", "Epe", "Nsukka", "Owerri"]
+TOPICS = ["road repair", "water supply", "school renovation", "hospital equipment",
+          "security patrol", "electricity", "flood control", "youth employment"]
+
+# Exact, partial and misspelt terms
+TERMS = ["Akpabio", "Akpabbio", "Oshiomole", "Alimosho", "Obio Akpor", "water supply", "hospitl equipment"]
+
+
+def seed(engine, SessionFactory, representatives: int, petitions: int):
+    rng = random.Random(7)
+    db = SessionFactory()
+    state = State(name="Lagos", code="LA")
+    db.add(state)
+    db.flush()
+    user = User(email="creator@bench.ng", password_hash="x", name="Creator")
+    db.add(user)
+    db.commit()
+    state_id, user_id = state.id, user.id
+    db.close()
+
+    with engine.begin() as conn:
+        for start in range(0, representatives, CHUNK):
+            conn.execute(Representative.__table__.insert(), [
+                {
+                    "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+                    "chamber": rng.choice(list(Chamber)).name,
+                    "state_id": state_id,
+                    "constituency": f"{rng.choice(PLACES)} Federal Constituency",
+                    "senatorial_district": f"{rng.choice(PLACES)} District",
+                    "is_active": True
+                }
+                for i in range(start, min(start + CHUNK, representatives))
+            ])
+        for start in range(0, petitions, CHUNK):
+            conn.execute(Petition.__table__.insert(), [
+                {
+                    "title": f"Urgent {rng.choice(TOPICS)} needed in {rng.choice(PLACES)} #{i}",
+                    "description": "Synthetic petition",
+                    "category": rng.choice(list(PetitionCategory)).name,
+                    "target_representative_id": 1,
+                    "creator_id": user_id,
+                    "status": PetitionStatus.ACTIVE.name,
+                    "signature_count": 0,
+                    "signature_goal": 1000
+                }
+                for i in range(start, min(start + CHUNK, petitions))
+            ])
+
+
+def explain(db, stmt) -> str:
+    statement = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+    if db.get_bind().dialect.name == "postgresql":
+        rows = db.execute(text(f"EXPLAIN ANALYZE {statement}")).all()
+        return "\n".join(f"    {r[0]}" for r in rows)
+    rows = db.execute(text(f"EXPLAIN QUERY PLAN {statement}")).all()
+    return "\n".join(f"    {r[-1]}" for r in rows)
+
+
+def timed(fn, repeat: int):
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--representatives", type=int, default=200000)
+    parser.add_argument("--petitions", type=int, default=500000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--plans", action="store_true", help="Print query plans")
+    args = parser.parse_args()
+
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    with Timer() as timer:
+        seed(engine, SessionFactory, args.representatives, args.petitions)
+    print(f"seeded {args.representatives} representatives, {args.petitions} petitions in {timer.elapsed:.1f}s")
+
+    service = SearchService()
+    service.create_indexes(engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE representatives; ANALYZE petitions"))
+
+    db = SessionFactory()
+    adapter = SyncSessionAdapter(db)
+    loop = asyncio.new_event_loop()
+    with Timer() as timer:
+        service.build_index(db, "petitions")
+        service.build_index(db, "representatives")
+    if engine.dialect.name != "postgresql":
+        print(f"built in-memory indexes in {timer.elapsed:.1f}s")
+
+    for term in TERMS:
+        print(f"\n=== {term!r}")
+
+        legacy_reps = select(Representative.id).where(or_(
+            Representative.name.ilike(f"%{term}%"),
+            Representative.constituency.ilike(f"%{term}%"),
+            Representative.senatorial_district.ilike(f"%{term}%")
+        )).limit(50)
+        new_reps, rank = loop.run_until_complete(
+            service.filter_representatives(adapter, select(Representative.id), term)
+        )
+        if rank is not None:
+            new_reps = new_reps.order_by(rank.desc())
+        new_reps = new_reps.limit(50)
+
+        legacy_petitions = select(Petition.id).where(Petition.title.ilike(f"%{term}%")).limit(20)
+
+        def new_petitions():
+            stmt, rank = loop.run_until_complete(service.filter_petitions(adapter, select(Petition.id), term))
+            if rank is not None:
+                stmt = stmt.order_by(rank.desc())
+            return db.execute(stmt.limit(20)).all()
+
+        for label, legacy, new in (
+            ("representatives", lambda: db.execute(legacy_reps).all(), lambda: db.execute(new_reps).all()),
+            ("petitions", lambda: db.execute(legacy_petitions).all(), new_petitions),
+        ):
+            before, before_rows = timed(legacy, args.repeat)
+            after, after_rows = timed(new, args.repeat)
+            print(format_latency(f"  {label} ILIKE ({len(before_rows)} rows)", before))
+            print(format_latency(f"  {label} search ({len(after_rows)} rows)", after))
+
+        if args.plans:
+            print("  legacy representatives plan:")
+            print(explain(db, legacy_reps))
+            print("  search representatives plan:")
+            print(explain(db, new_reps))
+
+    loop.close()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
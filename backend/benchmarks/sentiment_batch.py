@@ -0,0 +1,159 @@
+"""
+Batched sentiment analysis vs one chat completion per post, on a stub LLM
+
+Seeds unanalysed social posts and scores them two ways against a local
+OpenAI-compatible stub with per-request latency plus per-output-token
+generation time:
+  one-at-a-time: OpenAIService.analyze_sentiment per post, ORM update per post
+  batched:       SentimentBatchAnalyzer.analyze_pending (many posts per
+                 prompt, concurrent batches, bulk write-back)
+--corrupt-every N makes every Nth batch answer unparseable to exercise
+split-and-retry. Rollups are checked against a backfill afterwards.
+
+Usage (from backend/):
+    python -m benchmarks.sentiment_batch --posts 2000 --baseline-posts 200 --batch-size 25 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.social import SocialPost, Sentiment, Platform
+from app.services.openai_service import openai_service
+from app.services.sentiment_batch import SentimentBatchAnalyzer
+from app.services.social_rollup import social_rollups
+from .common import make_engine, make_session_factory, reset_schema
+from .social_stats import TABLES, rollup_snapshot
+from .stub_server import StubServer, stub_llm_app
+
+PHRASES = [
+    "The new road in our LGA is finally done, well done",
+    "No light for two weeks, this government don fail us",
+    "Please fix the borehole in ward 3, we suggest using local contractors",
+    "Senate sitting today on the budget",
+    "Our rep never show face since election",
+]
+SENTIMENTS = [s.value for s in Sentiment]
+
+
+def fake_analysis(post_id, text: str) -> dict:
+    digest = hashlib.md5(text.encode()).digest()
+    return {
+        "id": post_id,
+        "sentiment": SENTIMENTS[digest[0] % len(SENTIMENTS)],
+        "score": round((digest[1] - 128) / 128, 2),
+        "topics": ["infrastructure", "governance"][: 1 + digest[2] % 2]
+    }
+
+
+def make_responder(corrupt_every: int):
+    calls = {"batches": 0}
+
+    def respond(messages):
+        user = messages[-1]["content"]
+        if user.startswith("["):
+            calls["batches"] += 1
+            answer = json.dumps([fake_analysis(item["id"], item["text"]) for item in json.loads(user)])
+            if corrupt_every and calls["batches"] % corrupt_every == 0:
+                # A truncated answer, as when the model runs out of output tokens
+                return answer[: len(answer) // 2]
+            return answer
+        analysis = fake_analysis(None, user)
+        analysis.pop("id")
+        return json.dumps({**analysis, "is_constructive": False, "summary": user[:100]})
+
+    return respond
+
+
+def seed(engine, posts: int):
+    rng = random.Random(8)
+    now = datetime.utcnow()
+    rows = [{
+        "platform": Platform.TWITTER.name,
+        "platform_id": f"sent-{i}",
+        "author_handle": f"citizen{i % 500}",
+        "content": f"{rng.choice(PHRASES)} #{i}",
+        "representative_id": rng.choice([None, 1, 2, 3]),
+        "posted_at": now - timedelta(seconds=rng.randint(0, 7 * 86400))
+    } for i in range(posts)]
+    with engine.begin() as conn:
+        conn.execute(SocialPost.__table__.insert(), rows)
+    with engine.begin() as conn:
+        social_rollups.backfill(conn)
+
+
+async def one_at_a_time(SessionFactory, limit: int):
+    db = SessionFactory()
+    posts = db.scalars(select(SocialPost).where(SocialPost.sentiment.is_(None)).order_by(SocialPost.id).limit(limit)).all()
+    for post in posts:
+        analysis = await openai_service.analyze_sentiment(post.content)
+        post.sentiment = Sentiment(analysis["sentiment"])
+        post.sentiment_score = analysis["score"]
+        post.topics = json.dumps(analysis["topics"])
+        db.commit()
+    db.close()
+    return len(posts)
+
+
+def usage():
+    return openai_service.requests, openai_service.prompt_tokens + openai_service.completion_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--baseline-posts", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--per-token-ms", type=float, default=2.0)
+    parser.add_argument("--corrupt-every", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    app = stub_llm_app(args.latency_ms, make_responder(args.corrupt_every), per_token_ms=args.per_token_ms)
+    with StubServer(app) as server:
+        openai_service.api_key = "bench"
+        openai_service.base_url = f"{server.base_url}/v1"
+
+        reset_schema(engine, TABLES)
+        seed(engine, args.baseline_posts)
+        requests, tokens = usage()
+        start = time.perf_counter()
+        done = asyncio.run(one_at_a_time(SessionFactory, args.baseline_posts))
+        elapsed = time.perf_counter() - start
+        requests, tokens = usage()[0] - requests, usage()[1] - tokens
+        print(
+            f"one-at-a-time: {done} posts in {elapsed:.1f}s ({done / elapsed:.1f} posts/s), "
+            f"{requests} requests, {tokens / done:.0f} tokens/post"
+        )
+
+        reset_schema(engine, TABLES)
+        seed(engine, args.posts)
+        analyzer = SentimentBatchAnalyzer(openai_service, batch_size=args.batch_size, concurrency=args.concurrency)
+        stats = asyncio.run(analyzer.analyze_pending(limit=args.posts, engine=engine))
+        print(
+            f"batched x{args.batch_size}, {args.concurrency} concurrent: {stats.analysed}/{stats.posts} posts in "
+            f"{stats.seconds:.1f}s ({stats.posts_per_second:.1f} posts/s), {stats.requests} requests "
+            f"({stats.retries} split/retries), {stats.tokens_per_post:.0f} tokens/post, {stats.failed} failed"
+        )
+
+    db = SessionFactory()
+    incremental = rollup_snapshot(db)
+    with engine.begin() as conn:
+        social_rollups.backfill(conn)
+    print(f"rollups match backfill: {incremental == rollup_snapshot(db)}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
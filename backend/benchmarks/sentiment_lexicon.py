@@ -0,0 +1,151 @@
+"""
+Lexicon pre-classifier: throughput and agreement with LLM labels
+
+Reports posts/sec for LexiconClassifier on one core, then, for a range of
+confidence thresholds, the share of posts labelled locally (LLM calls
+avoided) and how often those local labels agree with the LLM's.
+
+Labelled posts come from one of:
+  --labels FILE     JSON lines {"text": ..., "sentiment": ...}
+  --from-db N       up to N analysed posts from the application database
+                    (labels written by the LLM analyzer)
+  (default)         a synthetic English/Pidgin corpus whose labels stand in
+                    for LLM output, including sarcasm and mixed posts
+
+Usage (from backend/):
+    python -m benchmarks.sentiment_lexicon --throughput-posts 100000
+    python -m benchmarks.sentiment_lexicon --from-db 20000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import List, Tuple
+
+from app.services.sentiment_lexicon import LexiconClassifier
+
+PLACES = ["Kano", "Ikeja", "Port Harcourt", "Enugu", "Abuja", "Ibadan", "ward 4", "our LGA", "Aba", "Jos"]
+THINGS = ["the new road", "the borehole", "the health centre", "the school roof", "street lights", "the bridge"]
+
+TEMPLATES = {
+    "POSITIVE": [
+        "Well done to our rep, {thing} in {place} is finally completed",
+        "Thank you sir, {thing} don finish. More grease to your elbow",
+        "Kudos to the governor, {thing} in {place} e choke!",
+        "We thank you for {thing}, God bless you",
+        "Impressive work on {thing} in {place}, keep it up",
+        "This one sweet me, {thing} for {place} don come",
+    ],
+    "NEGATIVE": [
+        "No light for two weeks in {place}, this government don fail us",
+        "Our rep never show face since election, useless people",
+        "{thing} in {place} abandoned again. Shameful corruption",
+        "Una no get shame, {thing} money don chop",
+        "Bandits everywhere in {place} and nobody cares, terrible",
+        "Wetin una dey do? We dey suffer for {place}",
+    ],
+    "CONSTRUCTIVE": [
+        "Please fix {thing} in {place}, we suggest using local contractors",
+        "Kindly look into {thing} for {place}, it needs maintenance",
+        "I recommend the LGA should consider solar for {thing}",
+        "Abeg fix {thing} for {place}, we need am before rainy season",
+        "Could you publish the budget for {thing} in {place}?",
+    ],
+    "NEUTRAL": [
+        "Senate sitting today on {thing} budget",
+        "Town hall meeting in {place} on Thursday about {thing}",
+        "Reps committee visits {place} to inspect {thing}",
+        "Report on {thing} in {place} to be presented next week",
+    ],
+}
+# Posts a lexicon reads one way and an LLM another
+HARD = [
+    ("Well done o, no light for three months in {place}", "NEGATIVE"),
+    ("Great job, another pothole on {thing} in {place}", "NEGATIVE"),
+    ("Not bad, {thing} in {place} is working now", "POSITIVE"),
+    ("Thank God the corruption case in {place} was finally dropped", "NEGATIVE"),
+    ("The failed bridge in {place} has been fixed, well done", "POSITIVE"),
+    ("Thank you so much for the great job, another year without light in {place}", "NEGATIVE"),
+    ("Good morning {place}, town hall on {thing} starts 10am", "NEUTRAL"),
+]
+
+
+def synthetic(posts: int, seed: int = 17) -> List[Tuple[str, str]]:
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(posts):
+        if rng.random() < 0.08:
+            template, label = rng.choice(HARD)
+        else:
+            label = rng.choices(list(TEMPLATES), weights=[3, 4, 2, 3])[0]
+            template = rng.choice(TEMPLATES[label])
+        text = template.format(place=rng.choice(PLACES), thing=rng.choice(THINGS))
+        corpus.append((f"{text} #{rng.randint(1, 9999)}", label))
+    return corpus
+
+
+def from_file(path: str) -> List[Tuple[str, str]]:
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return [(row["text"], str(row["sentiment"]).upper()) for row in rows]
+
+
+def from_db(limit: int) -> List[Tuple[str, str]]:
+    from sqlalchemy import select
+    from app.database import engine
+    from app.models.social import SocialPost
+
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(SocialPost.content, SocialPost.sentiment)
+            .where(SocialPost.sentiment.is_not(None))
+            .order_by(SocialPost.id.desc())
+            .limit(limit)
+        ).all()
+    return [(content, sentiment.value) for content, sentiment in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--throughput-posts", type=int, default=100000)
+    parser.add_argument("--posts", type=int, default=20000, help="Synthetic labelled posts")
+    parser.add_argument("--labels", help="JSON lines file of LLM-labelled posts")
+    parser.add_argument("--from-db", type=int, default=0, help="Use this many LLM-labelled posts from the app database")
+    parser.add_argument("--thresholds", default="0.5,0.6,0.7,0.75,0.8,0.9")
+    args = parser.parse_args()
+
+    classifier = LexiconClassifier()
+
+    texts = [text for text, _ in synthetic(args.throughput_posts, seed=3)]
+    start = time.perf_counter()
+    classifier.classify_many(texts)
+    elapsed = time.perf_counter() - start
+    print(f"throughput: {len(texts)} posts in {elapsed:.2f}s ({len(texts) / elapsed:,.0f} posts/s)")
+
+    if args.labels:
+        corpus, source = from_file(args.labels), args.labels
+    elif args.from_db:
+        corpus, source = from_db(args.from_db), "application database"
+    else:
+        corpus, source = synthetic(args.posts), "synthetic corpus"
+    labels = classifier.classify_many([text for text, _ in corpus])
+
+    print(f"\n{len(corpus)} labelled posts from {source}")
+    print("threshold  local share  agreement (local)  agreement (overall)")
+    for threshold in (float(t) for t in args.thresholds.split(",")):
+        local = agree = 0
+        for (_, expected), label in zip(corpus, labels):
+            if label is not None and label.confidence >= threshold:
+                local += 1
+                agree += label.sentiment.value == expected
+        # Escalated posts get the LLM's own label
+        overall = (agree + len(corpus) - local) / len(corpus) if corpus else 0.0
+        print(
+            f"{threshold:>9.2f}  {local / len(corpus):>11.1%}  "
+            f"{(agree / local if local else 0.0):>17.1%}  {overall:>19.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Load test for POST /api/petitions/{id}/sign
+
+Runs N concurrent signers against one petition and checks that the final
+signature_count equals the number of signature rows (no lost increments).
+Compare with --legacy, which replays the old read-modify-write path.
+
+Usage (from backend/):
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.signing_load --signers 2000 --concurrency 64
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.petition import Petition, Signature, PetitionTimeline, PetitionStatus, PetitionCategory
+from app.models.representative import Representative, State, Chamber
+from app.models.user import User
+from app.services.signing_service import signing_service
+from .common import make_engine, make_session_factory, reset_schema, format_latency, Timer
+
+TABLES = ["states", "lgas", "users", "representatives", "petitions", "signatures", "petition_timeline"]
+
+
+def setup(SessionFactory, signers: int, goal: int) -> int:
+    db = SessionFactory()
+    try:
+        state = State(name="Lagos", code="LA")
+        db.add(state)
+        db.flush()
+        rep = Representative(name="Bench Rep", chamber=Chamber.SENATE, state_id=state.id)
+        creator = User(email="creator@bench.ng", password_hash="x", name="Creator")
+        db.add_all([rep, creator])
+        db.flush()
+        db.bulk_insert_mappings(User, [
+            {"email": f"signer{i}@bench.ng", "password_hash": "x", "name": f"Signer {i}"}
+            for i in range(signers)
+        ])
+        petition = Petition(
+            title="Fix the Third Mainland Bridge",
+            description="Load test petition",
+            category=PetitionCategory.INFRASTRUCTURE,
+            target_representative_id=rep.id,
+            creator_id=creator.id,
+            status=PetitionStatus.ACTIVE,
+            signature_count=0,
+            signature_goal=goal
+        )
+        db.add(petition)
+        db.commit()
+        return petition.id
+    finally:
+        db.close()
+
+
+def legacy_sign(db, petition_id: int, user_id: int):
+    """The previous SELECT + SELECT + read-modify-write path"""
+    petition = db.query(Petition).filter(Petition.id == petition_id).first()
+    existing = db.query(Signature).filter(
+        Signature.petition_id == petition_id,
+        Signature.user_id == user_id
+    ).first()
+    if existing:
+        return
+    db.add(Signature(petition_id=petition_id, user_id=user_id))
+    petition.signature_count += 1
+    db.commit()
+
+
+def run(signers: int, concurrency: int, goal: int, legacy: bool):
+    engine = make_engine(pool_size=concurrency)
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    petition_id = setup(SessionFactory, signers, goal)
+
+    db = SessionFactory()
+    user_ids = [u.id for u in db.query(User.id).filter(User.email.like("signer%")).all()]
+    db.close()
+
+    latencies = []
+    errors = []
+
+    def sign(user_id: int):
+        session = SessionFactory()
+        start = time.perf_counter()
+        try:
+            if legacy:
+                legacy_sign(session, petition_id, user_id)
+            else:
+                signing_service.sign(session, petition_id, user_id)
+            latencies.append(time.perf_counter() - start)
+        except Exception as e:
+            session.rollback()
+            errors.append(str(e))
+        finally:
+            session.close()
+
+    with Timer() as timer:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(sign, user_ids))
+
+    db = SessionFactory()
+    count = db.query(Petition.signature_count).filter(Petition.id == petition_id).scalar()
+    rows = db.query(Signature).filter(Signature.petition_id == petition_id).count()
+    events = db.query(PetitionTimeline).filter(PetitionTimeline.petition_id == petition_id).count()
+    status = db.query(Petition.status).filter(Petition.id == petition_id).scalar()
+    db.close()
+
+    mode = "legacy" if legacy else "atomic"
+    print(f"mode={mode} backend={engine.dialect.name} signers={signers} concurrency={concurrency}")
+    print(f"elapsed={timer.elapsed:.2f}s throughput={len(latencies) / timer.elapsed:.0f} signatures/s errors={len(errors)}")
+    print(format_latency("sign latency", latencies))
+    print(f"signature_count={count} signature_rows={rows} lost_increments={rows - count}")
+    print(f"status={status.value if status else None} timeline_events={events}")
+    if errors:
+        print(f"first error: {errors[0][:200]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--signers", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--goal", type=int, default=500)
+    parser.add_argument("--legacy", action="store_true", help="Use the old read-modify-write path")
+    args = parser.parse_args()
+    run(args.signers, args.concurrency, args.goal, args.legacy)
+
+
+if __name__ == "__main__":
+    main()
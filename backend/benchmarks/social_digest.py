@@ -0,0 +1,169 @@
+"""
+Weekly digest generation: first-20-posts prompt vs map-reduce, on a stub LLM
+
+Seeds a week of posts for one representative, a share of them copies of
+campaign posts (retweets, pasted text with different tags), and builds
+the digest two ways against a local OpenAI-compatible stub with
+per-request latency plus per-output-token generation time:
+  first-20:   the previous generate_digest_summary (20 posts x 200 chars,
+              one request)
+  map-reduce: DigestBuilder.build_digest (cluster, concurrent chunk
+              summaries, reduce), stored with its post ids
+Each reports posts covered, requests, tokens and wall-clock time; the
+stored digest is checked against the posts it was built from.
+
+Usage (from backend/):
+    python -m benchmarks.social_digest --posts 10000 --campaign-share 0.4 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.social import SocialPost, SocialDigest, Sentiment, Platform
+from app.services.openai_service import openai_service, DIGEST_SYSTEM_PROMPT
+from app.services.social_digest import DigestBuilder
+from .common import make_engine, make_session_factory, reset_schema
+from .stub_server import StubServer, stub_llm_app
+
+TABLES = ["states", "lgas", "representatives", "social_posts", "social_post_rollups", "social_digests", "social_digest_posts"]
+REPRESENTATIVE_ID = 1
+
+ISSUES = [
+    "no light for {n} days", "the {place} road is full of potholes", "the borehole in {place} is broken",
+    "teachers in {place} have not been paid", "kidnapping on the {place} highway", "flooding in {place} again",
+    "well done on the {place} clinic", "please fix the {place} bridge before the rains",
+    "the {place} market fire victims need help", "thank you for the {place} scholarship scheme"
+]
+PLACES = ["Kano", "Ikeja", "Aba", "Jos", "Enugu", "Ibadan", "Owerri", "Bauchi", "Lokoja", "Yola", "Warri", "Makurdi"]
+OPENERS = ["Honourable,", "Sir,", "Abeg", "Our rep,", "Dear senator,", "Oga,", ""]
+CLOSERS = ["We are watching.", "God bless Nigeria.", "Do something.", "Thank you.", "Una well done.", ""]
+
+
+def make_posts(posts: int, campaign_share: float, rng: random.Random):
+    campaigns = [
+        f"{rng.choice(OPENERS)} {rng.choice(ISSUES).format(n=rng.randint(2, 30), place=rng.choice(PLACES))}. {rng.choice(CLOSERS)}"
+        for _ in range(40)
+    ]
+    for i in range(posts):
+        if rng.random() < campaign_share:
+            text = rng.choice(campaigns)
+            if rng.random() < 0.5:
+                text = f"RT @citizen{rng.randint(0, 999)}: {text}"
+            text = f"{text} #{rng.choice(['EndBadRoads', 'PowerNow', 'Naija', 'Vote2027'])} https://t.co/{rng.randint(0, 10**8):x}"
+        else:
+            issues = rng.sample(ISSUES, 2)
+            text = " and ".join(issue.format(n=rng.randint(2, 30), place=rng.choice(PLACES)) for issue in issues)
+            text = f"{rng.choice(OPENERS)} {text}. Ward {rng.randint(1, 400)}. {rng.choice(CLOSERS)}"
+        yield i, text.strip()
+
+
+def seed(engine, posts: int, campaign_share: float, period_start: datetime):
+    rng = random.Random(18)
+    sentiments = [s.name for s in Sentiment]
+    rows = [{
+        "platform": Platform.TWITTER.name,
+        "platform_id": f"digest-{i}",
+        "author_handle": f"citizen{rng.randint(0, 4000)}",
+        "content": text,
+        "likes": rng.randint(0, 50),
+        "shares": rng.randint(0, 10),
+        "comments": rng.randint(0, 10),
+        "sentiment": rng.choice(sentiments),
+        "representative_id": REPRESENTATIVE_ID,
+        "posted_at": period_start + timedelta(seconds=rng.randint(0, 7 * 86400 - 1))
+    } for i, text in make_posts(posts, campaign_share, rng)]
+    with engine.begin() as conn:
+        conn.execute(SocialPost.__table__.insert(), rows)
+
+
+def respond(messages):
+    """A summary-sized answer naming a few of the input lines"""
+    lines = [line for line in messages[-1]["content"].splitlines() if line.strip()]
+    picked = " ".join(line[:60] for line in lines[:4])
+    return f"Citizens raised {len(lines)} items, chiefly: {picked}. " + "Further detail on local issues. " * 12
+
+
+async def first_twenty(posts):
+    """The previous generate_digest_summary prompt"""
+    posts_text = "\n\n".join([
+        f"- {p.get('author', 'Unknown')}: {p.get('content', '')[:200]}"
+        for p in posts[:20]
+    ])
+    messages = [
+        {"role": "system", "content": DIGEST_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Create a digest summary of these citizen posts:\n\n{posts_text}"}
+    ]
+    return await openai_service._make_request(messages, temperature=0.5)
+
+
+def usage():
+    return openai_service.requests, openai_service.prompt_tokens + openai_service.completion_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--campaign-share", type=float, default=0.4)
+    parser.add_argument("--chunk-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-clusters", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=500.0)
+    parser.add_argument("--per-token-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    reset_schema(engine, TABLES)
+    period_end = datetime.utcnow()
+    period_start = period_end - timedelta(days=7)
+    seed(engine, args.posts, args.campaign_share, period_start)
+    builder = DigestBuilder(
+        openai_service,
+        chunk_size=args.chunk_size,
+        concurrency=args.concurrency,
+        max_clusters=args.max_clusters
+    )
+
+    with StubServer(stub_llm_app(args.latency_ms, respond, per_token_ms=args.per_token_ms)) as server:
+        openai_service.api_key = "bench"
+        openai_service.base_url = f"{server.base_url}/v1"
+
+        posts = builder.load_posts(REPRESENTATIVE_ID, period_start, period_end, engine)
+        requests, tokens = usage()
+        start = time.perf_counter()
+        asyncio.run(first_twenty(posts))
+        elapsed = time.perf_counter() - start
+        requests, tokens = usage()[0] - requests, usage()[1] - tokens
+        print(
+            f"first-20: {min(20, len(posts))}/{len(posts)} posts covered in {elapsed:.1f}s, "
+            f"{requests} request, {tokens} tokens"
+        )
+
+        result = asyncio.run(builder.build_digest(REPRESENTATIVE_ID, period_start, period_end, engine=engine))
+        stats = result.stats
+        print(
+            f"map-reduce x{args.chunk_size}, {args.concurrency} concurrent: {stats.posts_covered}/{stats.posts} posts "
+            f"covered ({stats.coverage:.0%}) in {stats.seconds:.1f}s; {stats.clusters} clusters, "
+            f"{stats.clusters_summarised} summarised in {stats.chunks} chunks ({stats.chunks_failed} failed); "
+            f"{stats.requests} requests ({stats.reduce_requests} reduce), "
+            f"{stats.prompt_tokens + stats.completion_tokens} tokens"
+        )
+
+    db = SessionFactory()
+    digest = db.get(SocialDigest, result.digest_id)
+    stored = json.loads(digest.post_ids)
+    flagged = set(db.scalars(select(SocialPost.id).where(SocialPost.is_included_in_digest == True)))
+    print(f"stored post_ids match covered posts: {stored == result.post_ids and flagged == set(stored)}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
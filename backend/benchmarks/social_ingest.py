@@ -0,0 +1,128 @@
+"""
+Bulk upsert ingestion vs per-row ORM add()
+
+Generates TwitterService-shaped post dicts (with repeats inside each poll)
+and stores them twice: first as new posts, then as a re-poll of the same
+ids with some engagement counters changed. The per-row baseline looks up
+each platform_id and then updates the row or calls Session.add(), with one
+commit per batch. The bulk path is SocialIngestService. Both report rows
+per second, and the bulk path's rollups are checked against a backfill.
+
+Usage (from backend/):
+    python -m benchmarks.social_ingest --posts 50000 --batch-size 1000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.models.social import SocialPost, Platform
+from app.services.social_ingest import SocialIngestService
+from app.services.social_rollup import social_rollups
+from .common import make_engine, make_session_factory, reset_schema, Timer
+from .social_stats import TABLES, rollup_snapshot
+
+DUPLICATE_RATE = 0.1
+
+
+def make_polls(posts: int, seed: int = 11):
+    """First poll and a re-poll of the same ids with some counters moved"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    first = []
+    for i in range(posts):
+        handle = f"citizen{i % 5000}"
+        first.append({
+            "platform_id": str(1800000000000000000 + i),
+            "author_handle": handle,
+            "author_name": f"Citizen {i % 5000}",
+            "content": f"Synthetic governance post {i} #Nigeria",
+            "url": f"https://twitter.com/{handle}/status/{i}",
+            "likes": rng.randint(0, 500),
+            "shares": rng.randint(0, 100),
+            "comments": rng.randint(0, 50),
+            "posted_at": now - timedelta(seconds=rng.randint(0, 7 * 86400)),
+            "language": "en"
+        })
+    # Overlapping search topics return the same tweet more than once
+    first += [dict(post) for post in rng.sample(first, int(posts * DUPLICATE_RATE))]
+
+    second = []
+    for post in first[:posts]:
+        post = dict(post)
+        if rng.random() < 0.3:
+            post["likes"] += rng.randint(1, 50)
+        second.append(post)
+    return first, second
+
+
+def orm_ingest(SessionFactory, posts, batch_size: int) -> int:
+    """Baseline: per-row lookup, then update or Session.add()"""
+    written = 0
+    for offset in range(0, len(posts), batch_size):
+        db = SessionFactory()
+        for post in posts[offset:offset + batch_size]:
+            existing = db.scalar(select(SocialPost).where(SocialPost.platform_id == post["platform_id"]))
+            if existing:
+                existing.likes = post["likes"]
+                existing.shares = post["shares"]
+                existing.comments = post["comments"]
+            else:
+                db.add(SocialPost(
+                    platform=Platform.TWITTER,
+                    platform_id=post["platform_id"],
+                    author_handle=post["author_handle"],
+                    author_name=post["author_name"],
+                    content=post["content"],
+                    url=post["url"],
+                    likes=post["likes"],
+                    shares=post["shares"],
+                    comments=post["comments"],
+                    posted_at=post["posted_at"]
+                ))
+            # The lookup above must see rows added earlier in this batch
+            db.flush()
+            written += 1
+        db.commit()
+        db.close()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    first, second = make_polls(args.posts)
+
+    reset_schema(engine, TABLES)
+    for label, posts in (("new posts", first), ("re-poll", second)):
+        with Timer() as timer:
+            written = orm_ingest(SessionFactory, posts, args.batch_size)
+        print(f"ORM add() {label}: {written} rows in {timer.elapsed:.2f}s ({written / timer.elapsed:.0f} rows/s)")
+
+    reset_schema(engine, TABLES)
+    service = SocialIngestService(batch_size=args.batch_size)
+    for label, posts in (("new posts", first), ("re-poll", second)):
+        stats = service.ingest(posts, engine=engine)
+        print(
+            f"bulk upsert {label}: {stats.received} rows ({stats.duplicates} duplicates) in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/s); inserted {stats.inserted} ({stats.inserted_per_second:.0f}/s), "
+            f"updated {stats.updated} ({stats.updated_per_second:.0f}/s), unchanged {stats.unchanged}"
+        )
+
+    db = SessionFactory()
+    incremental = rollup_snapshot(db)
+    with engine.begin() as conn:
+        social_rollups.backfill(conn)
+    print(f"rollups match backfill: {incremental == rollup_snapshot(db)}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+GET /api/social/stats from hourly rollups vs eight COUNT(*) queries
+
+Seeds synthetic posts over the last 30 days (5M by default), backfills the
+rollup table, then times the previous per-sentiment/per-platform COUNT(*)
+queries against the rollup-backed endpoint, with and without ?bucket=day.
+A short ORM ingest afterwards checks that the incremental rollups still
+match a fresh backfill.
+
+Usage (from backend/):
+    python -m benchmarks.social_stats --posts 5000000 --requests 20
+"""
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models.social import SocialPost, SocialRollup, Platform, Sentiment
+from app.services.social_rollup import social_rollups
+from .common import make_engine, make_session_factory, reset_schema, make_client, format_latency, Timer
+
+TABLES = ["states", "lgas", "representatives", "social_posts", "social_post_rollups"]
+CHUNK = 50000
+DAYS = 30
+
+
+def post_row(rng, i: int, now: datetime) -> dict:
+    return {
+        "platform": rng.choice(list(Platform)).name,
+        "platform_id": f"bench-{i}",
+        "author_handle": f"citizen{i % 5000}",
+        "content": "Synthetic post",
+        "sentiment": rng.choice([None, *Sentiment]),
+        "representative_id": rng.choice([None, 1, 2, 3, 4, 5]),
+        "posted_at": now - timedelta(seconds=rng.randint(0, DAYS * 86400))
+    }
+
+
+def seed(engine, posts: int):
+    rng = random.Random(5)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        for start in range(0, posts, CHUNK):
+            rows = [post_row(rng, i, now) for i in range(start, min(start + CHUNK, posts))]
+            for row in rows:
+                row["sentiment"] = row["sentiment"].name if row["sentiment"] else None
+            conn.execute(SocialPost.__table__.insert(), rows)
+
+
+def legacy_stats(db, days: int):
+    since = datetime.utcnow() - timedelta(days=days)
+    query = db.query(SocialPost).filter(SocialPost.posted_at >= since)
+    stats = {"totalPosts": query.count()}
+    for sentiment in Sentiment:
+        stats[sentiment.value] = query.filter(SocialPost.sentiment == sentiment).count()
+    for platform in Platform:
+        stats[platform.value] = query.filter(SocialPost.platform == platform).count()
+    return stats
+
+
+def rollup_snapshot(db):
+    return sorted(
+        (row.hour, row.representative_id, row.platform, row.sentiment, row.post_count)
+        for row in db.scalars(select(SocialRollup).where(SocialRollup.post_count != 0))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000000)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--days", type=int, default=7)
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    engine = make_engine()
+    reset_schema(engine, TABLES)
+    SessionFactory = make_session_factory(engine)
+    with Timer() as timer:
+        seed(engine, args.posts)
+    print(f"seeded {args.posts} posts in {timer.elapsed:.1f}s")
+
+    with Timer() as timer, engine.begin() as conn:
+        rows = social_rollups.backfill(conn)
+    print(f"backfilled {rows} rollup rows in {timer.elapsed:.1f}s")
+
+    db = SessionFactory()
+    samples = []
+    for _ in range(args.requests):
+        start = time.perf_counter()
+        legacy = legacy_stats(db, args.days)
+        samples.append(time.perf_counter() - start)
+    print(format_latency("legacy 8x COUNT(*)", samples))
+
+    client = make_client(SessionFactory)
+    for label, params in (("rollup stats", {}), ("rollup stats + day series", {"bucket": "day"})):
+        samples = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            response = client.get("/api/social/stats", params={"days": args.days, **params})
+            samples.append(time.perf_counter() - start)
+        print(format_latency(label, samples))
+    # The rollup window starts on the hour, so it can include up to an hour more
+    print(f"totals: legacy={legacy['totalPosts']} rollup={response.json()['totalPosts']}")
+
+    # Incremental maintenance through the ORM must agree with a full rebuild
+    rng = random.Random(9)
+    now = datetime.utcnow()
+    posts = [SocialPost(**post_row(rng, args.posts + i, now)) for i in range(2000)]
+    db.add_all(posts)
+    db.commit()
+    for post in posts[:500]:
+        post.sentiment = rng.choice(list(Sentiment))
+        post.representative_id = rng.choice([None, 1, 2])
+    for post in posts[500:700]:
+        db.delete(post)
+    db.commit()
+    incremental = rollup_snapshot(db)
+    with engine.begin() as conn:
+        social_rollups.backfill(conn)
+    print(f"incremental rollups match backfill: {incremental == rollup_snapshot(db)}")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,353 @@
+"""
+Local stub servers for benchmarks
+- Runs any ASGI app with uvicorn on a background thread
+- Optional TLS with a throwaway self-signed certificate
+- A stub OpenAI-compatible chat completions app with injected latency
+- A fake Twitter API v2 (search, user lookup, timelines) with rate limits
+- Saved pages for many websites behind one app, with latency and flaky pages
+  and ETag / Last-Modified validators (304 on a matching conditional GET)
+"""
+
+import asyncio
+import datetime
+import email.utils
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _self_signed_cert() -> Tuple[str, str]:
+    """Write a localhost certificate and key to a temp dir"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.utcnow()
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    directory = tempfile.mkdtemp(prefix="voice2gov-bench-")
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption()
+        ))
+    return cert_path, key_path
+
+
+class StubServer:
+    """Serve an ASGI app on 127.0.0.1 from a background thread"""
+
+    def __init__(self, app, tls: bool = False):
+        self.port = _free_port()
+        options = {"host": "127.0.0.1", "port": self.port, "log_level": "warning"}
+        if tls:
+            options["ssl_certfile"], options["ssl_keyfile"] = _self_signed_cert()
+        self.server = uvicorn.Server(uvicorn.Config(app, **options))
+        self.base_url = f"{'https' if tls else 'http'}://localhost:{self.port}"
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+        self._thread.start()
+        deadline = time.time() + 10
+        while not self.server.started:
+            if time.time() > deadline:
+                raise RuntimeError("stub server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def stub_llm_app(
+    latency_ms: float = 0.0,
+    responder: Optional[Callable[[list], str]] = None,
+    per_token_ms: float = 0.0
+) -> FastAPI:
+    """OpenAI-compatible /chat/completions that answers after a fixed delay.
+
+    responder receives the request messages and returns the completion text.
+    Token usage is approximated as characters / 4; per_token_ms adds
+    generation time for each completion token.
+    """
+    app = FastAPI()
+    app.state.requests = 0
+    app.state.prompt_tokens = 0
+    app.state.completion_tokens = 0
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        content = responder(messages) if responder else "ok"
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        completion_tokens = len(content) // 4
+        if latency_ms or per_token_ms:
+            await asyncio.sleep((latency_ms + per_token_ms * completion_tokens) / 1000)
+        app.state.requests += 1
+        app.state.prompt_tokens += prompt_tokens
+        app.state.completion_tokens += completion_tokens
+        return {
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+        }
+
+    return app
+
+
+class FakeTwitter:
+    """In-memory tweets and users behind a subset of the Twitter API v2.
+
+    Each endpoint has its own rate-limit window, reported in
+    x-rate-limit-* headers; requests over the limit get a 429.
+    """
+
+    def __init__(
+        self,
+        limit: int = 450,
+        window_seconds: float = 900.0,
+        latency_ms: float = 0.0,
+        limits: Optional[dict] = None
+    ):
+        self.limit = limit
+        self.limits = limits or {}  # per-endpoint overrides of limit
+        self.window_seconds = window_seconds
+        self.latency_ms = latency_ms
+        self.users = {}  # username -> {"id", "name", "username"}
+        self.tweets = []  # ascending id
+        self.windows = {}  # endpoint -> [reset_at, used]
+        self.requests = 0
+        self.rejected = 0
+        self._next_id = 1500000000000000000
+
+    def add_user(self, username: str, name: Optional[str] = None) -> dict:
+        user = {"id": str(len(self.users) + 1000), "name": name or username.title(), "username": username}
+        self.users[username] = user
+        return user
+
+    def add_tweet(self, username: str, text: str, created_at: Optional[datetime.datetime] = None, likes: int = 0) -> dict:
+        user = self.users.get(username) or self.add_user(username)
+        self._next_id += 1
+        created_at = created_at or datetime.datetime.now(datetime.timezone.utc)
+        tweet = {
+            "id": str(self._next_id),
+            "text": text,
+            "author_id": user["id"],
+            "created_at": created_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            "lang": "en",
+            "public_metrics": {"like_count": likes, "retweet_count": 0, "reply_count": 0, "quote_count": 0}
+        }
+        self.tweets.append(tweet)
+        return tweet
+
+    def take(self, endpoint: str) -> Tuple[bool, dict]:
+        """Count a request against endpoint's window; (allowed, headers)"""
+        now = time.time()
+        window = self.windows.get(endpoint)
+        if window is None or now >= window[0]:
+            window = self.windows[endpoint] = [now + self.window_seconds, 0]
+        limit = self.limits.get(endpoint, self.limit)
+        allowed = window[1] < limit
+        if allowed:
+            window[1] += 1
+        headers = {
+            "x-rate-limit-limit": str(limit),
+            "x-rate-limit-remaining": str(limit - window[1]),
+            # Real resets are whole epoch seconds; fractions keep short test windows exact
+            "x-rate-limit-reset": f"{window[0]:.3f}"
+        }
+        return allowed, headers
+
+    @staticmethod
+    def matches(query: str, text: str) -> bool:
+        """Every plain term of the query appears in the text (operators are ignored)"""
+        terms = [t.lower() for t in query.split() if ":" not in t and not t.startswith("-")]
+        text = text.lower()
+        return all(term in text for term in terms)
+
+    def page(self, tweets: list, params, users: bool) -> dict:
+        """Newest first, honouring since_id, start_time, max_results and pagination_token"""
+        since_id = int(params.get("since_id") or 0)
+        tweets = [t for t in reversed(tweets) if int(t["id"]) > since_id]
+        if params.get("start_time"):
+            # Both formats sort lexically once the fractional part is dropped
+            start_time = params["start_time"][:19]
+            tweets = [t for t in tweets if t["created_at"][:19] >= start_time]
+        start = int(params.get("pagination_token") or 0)
+        size = int(params.get("max_results") or 10)
+        data = tweets[start:start + size]
+        body = {"meta": {"result_count": len(data)}}
+        if data:
+            body["data"] = data
+            body["meta"]["newest_id"] = data[0]["id"]
+            body["meta"]["oldest_id"] = data[-1]["id"]
+            if users:
+                ids = {t["author_id"] for t in data}
+                body["includes"] = {"users": [u for u in self.users.values() if u["id"] in ids]}
+        if start + size < len(tweets):
+            body["meta"]["next_token"] = str(start + size)
+        return body
+
+
+def stub_twitter_app(fake: FakeTwitter) -> FastAPI:
+    """FastAPI app serving fake's tweets at /2/... with per-endpoint rate limits"""
+    from fastapi.responses import JSONResponse
+
+    app = FastAPI()
+
+    async def respond(endpoint: str, build: Callable[[], dict]):
+        fake.requests += 1
+        if fake.latency_ms:
+            await asyncio.sleep(fake.latency_ms / 1000)
+        allowed, headers = fake.take(endpoint)
+        if not allowed:
+            fake.rejected += 1
+            return JSONResponse({"title": "Too Many Requests", "status": 429}, status_code=429, headers=headers)
+        return JSONResponse(build(), headers=headers)
+
+    @app.get("/2/tweets/search/recent")
+    async def search_recent(request: Request):
+        params = request.query_params
+        query = params.get("query", "")
+        return await respond("tweets/search/recent", lambda: fake.page(
+            [t for t in fake.tweets if fake.matches(query, t["text"])], params, users=True
+        ))
+
+    @app.get("/2/users/by/username/{username}")
+    async def user_by_username(username: str):
+        def build():
+            user = fake.users.get(username)
+            return {"data": user} if user else {"errors": [{"title": "Not Found Error"}]}
+        return await respond("users/by/username", build)
+
+    @app.get("/2/users/{user_id}/tweets")
+    async def users_tweets(user_id: str, request: Request):
+        return await respond("users/tweets", lambda: fake.page(
+            [t for t in fake.tweets if t["author_id"] == user_id], request.query_params, users=False
+        ))
+
+    return app
+
+
+class FixtureSites:
+    """Saved pages for many hosts, served from one app by Host header.
+
+    Every response waits latency_ms. flaky maps (host, path) to the number
+    of 503s returned before the page is served. Per-host in-flight counts
+    and request start times are recorded so politeness can be checked.
+    Pages carry an ETag (md5 of the html) and a Last-Modified date unless
+    their host is in no_validators; matching conditional GETs get a 304.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.pages = {}  # host -> {path (with ?query): html}
+        self.robots = {}  # host -> robots.txt body
+        self.flaky = {}  # (host, path) -> 503s still to return
+        self.requests = 0
+        self.fetched = []  # (host, path) in arrival order
+        self.starts = {}  # host -> [monotonic start times]
+        self.in_flight = {}
+        self.max_in_flight = {}
+        self.no_validators = set()  # hosts that never send ETag / Last-Modified
+        self.modified = {}  # (host, path) -> HTTP date the page last changed
+        self.not_modified = 0
+        self.bytes_sent = 0
+
+    def add_page(self, host: str, path: str, html: str):
+        if self.pages.get(host, {}).get(path) != html:
+            self.modified[(host, path)] = email.utils.formatdate(time.time(), usegmt=True)
+        self.pages.setdefault(host, {})[path] = html
+
+
+def stub_sites_app(sites: FixtureSites) -> FastAPI:
+    """FastAPI app serving sites' pages for whichever host is asked for"""
+    from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+
+    app = FastAPI()
+
+    @app.get("/{path:path}")
+    async def page(path: str, request: Request):
+        host = request.headers.get("host", "").split(":")[0]
+        path = "/" + path + (f"?{request.url.query}" if request.url.query else "")
+        sites.requests += 1
+        sites.fetched.append((host, path))
+        sites.starts.setdefault(host, []).append(time.monotonic())
+        sites.in_flight[host] = sites.in_flight.get(host, 0) + 1
+        sites.max_in_flight[host] = max(sites.max_in_flight.get(host, 0), sites.in_flight[host])
+        try:
+            if sites.latency_ms:
+                await asyncio.sleep(sites.latency_ms / 1000)
+            if path == "/robots.txt":
+                if host in sites.robots:
+                    return PlainTextResponse(sites.robots[host])
+                return PlainTextResponse("not found", status_code=404)
+            if sites.flaky.get((host, path)):
+                sites.flaky[(host, path)] -= 1
+                return PlainTextResponse("busy", status_code=503)
+            html = sites.pages.get(host, {}).get(path)
+            if html is None:
+                return PlainTextResponse("not found", status_code=404)
+            headers = {}
+            if host not in sites.no_validators:
+                headers = {"ETag": f'"{hashlib.md5(html.encode()).hexdigest()}"', "Last-Modified": sites.modified[(host, path)]}
+                etag, since = request.headers.get("if-none-match"), request.headers.get("if-modified-since")
+                if (etag and etag == headers["ETag"]) or (not etag and since and since == headers["Last-Modified"]):
+                    sites.not_modified += 1
+                    return Response(status_code=304, headers=headers)
+            sites.bytes_sent += len(html.encode())
+            return HTMLResponse(html, headers=headers)
+        finally:
+            sites.in_flight[host] -= 1
+
+    return app
+
+
+class LocalTransport(httpx.AsyncBaseTransport):
+    """Send requests for any host to a local server, keeping the original Host header"""
+
+    def __init__(self, base_url: str):
+        self.target = httpx.URL(base_url)
+        self.inner = httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        url = request.url.copy_with(scheme=self.target.scheme, host=self.target.host, port=self.target.port)
+        local = httpx.Request(request.method, url, headers=request.headers, stream=request.stream, extensions=request.extensions)
+        return await self.inner.handle_async_request(local)
+
+    async def aclose(self):
+        await self.inner.aclose()
@@ -0,0 +1,133 @@
+"""
+Twitter topic fan-out against a local fake API v2 with rate limits
+
+1. Latency: search_governance_topics with one request at a time (the old
+   loop) vs concurrent fan-out, with --latency-ms per request.
+2. Rate limits: more topics than the search window allows. The blocking
+   baseline mimics tweepy.Client(wait_on_rate_limit=True) called from
+   async code: sync requests that time.sleep() until the reset. The async
+   client parks only the search tasks, so user timeline fetches (a
+   separate endpoint) and an event-loop ticker keep running.
+
+Usage (from backend/):
+    python -m benchmarks.twitter_fanout --topics 12 --latency-ms 100 --limit 5 --window 3
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.services.twitter_api import TwitterAPI
+from app.services.twitter_service import TwitterService
+from .async_db_concurrency import LoopMonitor
+from .common import format_latency
+from .login_mixed_traffic import paced
+from .stub_server import FakeTwitter, StubServer, stub_twitter_app
+
+HANDLES = [f"rep_{i}" for i in range(10)]
+
+
+def make_fake(topics, search_limit: int, window: float, latency_ms: float) -> FakeTwitter:
+    # Only search is tight; user lookups and timelines have their own, roomy windows
+    fake = FakeTwitter(
+        limit=10000, window_seconds=window, latency_ms=latency_ms,
+        limits={"tweets/search/recent": search_limit}
+    )
+    for i, topic in enumerate(topics):
+        for j in range(20):
+            fake.add_tweet(HANDLES[(i + j) % len(HANDLES)], f"{topic} update {j} from the constituency", likes=j)
+    return fake
+
+
+def make_service(base_url: str, concurrency: int, client: httpx.AsyncClient) -> TwitterService:
+    service = TwitterService()
+    service.client = TwitterAPI("bench", base_url=f"{base_url}/2", max_concurrency=concurrency, client=client)
+    return service
+
+
+class BlockingSearch:
+    """tweepy.Client(wait_on_rate_limit=True) behaviour: sync calls that sleep through 429s"""
+
+    def __init__(self, base_url: str):
+        self.client = httpx.Client(base_url=base_url)
+
+    async def search_governance_topics(self, topics, max_results: int = 100):
+        tweets = []
+        for topic in topics:
+            while True:
+                response = self.client.get("/2/tweets/search/recent", params={
+                    "query": f"{topic} lang:en -is:retweet", "max_results": max(10, max_results // len(topics))
+                })
+                if response.status_code == 429:
+                    time.sleep(max(0.0, float(response.headers["x-rate-limit-reset"]) - time.time()) + 0.05)
+                    continue
+                tweets.extend(response.json().get("data", []))
+                break
+        return tweets
+
+
+async def timed_fanout(base_url: str, topics, concurrency: int):
+    async with httpx.AsyncClient() as client:
+        service = make_service(base_url, concurrency, client)
+        start = time.perf_counter()
+        tweets = await service.search_governance_topics(topics, max_results=len(topics) * 20)
+        return time.perf_counter() - start, len(tweets), service.client
+
+
+async def rate_limited(base_url: str, topics, searcher_factory, concurrency: int):
+    """Search every topic while timelines are fetched on the side; returns timings"""
+    timeline_samples = []
+    async with httpx.AsyncClient() as client:
+        timelines = make_service(base_url, concurrency, client)
+        searcher = searcher_factory(client)
+
+        async def fetch_timeline(i: int, scheduled: float):
+            await timelines.get_user_tweets(HANDLES[i], max_results=20)
+            # From the scheduled start, so time spent behind a blocked loop counts
+            timeline_samples.append(time.perf_counter() - scheduled)
+
+        with LoopMonitor(0.01) as monitor:
+            start = time.perf_counter()
+            search = asyncio.ensure_future(searcher.search_governance_topics(topics, max_results=len(topics) * 20))
+            await paced(len(HANDLES), 0.5, fetch_timeline)
+            tweets = await search
+            elapsed = time.perf_counter() - start
+    return elapsed, len(tweets), timeline_samples, monitor.lags
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--topics", type=int, default=12)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    parser.add_argument("--concurrency", type=int, default=6)
+    parser.add_argument("--limit", type=int, default=5, help="Search requests per window in part 2")
+    parser.add_argument("--window", type=float, default=3.0, help="Rate-limit window seconds in part 2")
+    args = parser.parse_args()
+
+    topics = [f"topic{i:03d}x" for i in range(args.topics)]
+
+    fake = make_fake(topics, search_limit=10000, window=900, latency_ms=args.latency_ms)
+    with StubServer(stub_twitter_app(fake)) as server:
+        for label, concurrency in (("one at a time", 1), (f"fan-out x{args.concurrency}", args.concurrency)):
+            elapsed, count, _ = asyncio.run(timed_fanout(server.base_url, topics, concurrency))
+            print(f"{label}: {args.topics} topics, {count} tweets in {elapsed:.2f}s")
+
+    print(f"\n{args.topics} searches, {args.limit} per {args.window:.0f}s window:")
+    for label, factory in (
+        ("blocking wait_on_rate_limit", lambda client: BlockingSearch(server.base_url)),
+        ("async token bucket", lambda client: make_service(server.base_url, args.concurrency, client)),
+    ):
+        fake = make_fake(topics, search_limit=args.limit, window=args.window, latency_ms=args.latency_ms)
+        with StubServer(stub_twitter_app(fake)) as server:
+            elapsed, count, timeline_samples, lags = asyncio.run(
+                rate_limited(server.base_url, topics, factory, args.concurrency)
+            )
+        print(f"{label}: {count} tweets in {elapsed:.2f}s, {fake.rejected} requests rejected with 429")
+        print(format_latency("  user timeline fetch", timeline_samples))
+        print(format_latency("  event loop lag", lags))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Replay of a steady-state Twitter poll loop: 24h window vs since_id checkpoints
+
+A fake API v2 holds a day of tweets for the governance topics and a set of
+representative handles, and gains a few new tweets before every poll.
+"window" mode is the previous behaviour: search the last 24 hours and look
+up each handle, then fetch its latest tweets. "checkpoint" mode polls via
+SocialIngestService.poll_query / poll_handle. Both store into social_posts.
+Each mode reports API calls, tweets fetched (each fetched tweet is one
+sentiment analysis downstream) and new tweets that never got stored.
+
+Usage (from backend/):
+    python -m benchmarks.twitter_polling --polls 10 --new-per-topic 5 --new-per-handle 2
+"""
+
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import select
+
+from app.models.social import SocialPost
+from app.services.social_ingest import SocialIngestService
+from app.services.twitter_api import TwitterAPI
+from app.services.twitter_service import twitter_service, governance_query, GOVERNANCE_TOPICS
+from .common import make_engine, make_session_factory, reset_schema
+from .stub_server import FakeTwitter, StubServer, stub_twitter_app
+
+TABLES = ["states", "lgas", "representatives", "social_posts", "social_post_rollups", "social_poll_checkpoints"]
+HANDLES = [f"hon_member_{i}" for i in range(10)]
+
+
+def seed_fake(fake: FakeTwitter, per_topic: int, per_handle: int, rng: random.Random):
+    """A day of history, oldest first so ids increase with time"""
+    now = datetime.now(timezone.utc)
+    history = []
+    for topic in GOVERNANCE_TOPICS:
+        history += [("citizen", f"{topic} thread {i}", now - timedelta(seconds=rng.randint(600, 86000))) for i in range(per_topic)]
+    for handle in HANDLES:
+        history += [(handle, f"Constituency update {i}", now - timedelta(seconds=rng.randint(600, 86000))) for i in range(per_handle)]
+    for author, text, created_at in sorted(history, key=lambda item: item[2]):
+        fake.add_tweet(author if author != "citizen" else f"citizen{rng.randint(0, 999)}", text, created_at=created_at)
+
+
+def add_new(fake: FakeTwitter, per_topic: int, per_handle: int, rng: random.Random, poll: int) -> set:
+    ids = set()
+    for topic in GOVERNANCE_TOPICS:
+        for i in range(per_topic):
+            ids.add(fake.add_tweet(f"citizen{rng.randint(0, 999)}", f"{topic} poll {poll} news {i}")["id"])
+    for handle in HANDLES:
+        for i in range(per_handle):
+            ids.add(fake.add_tweet(handle, f"Poll {poll} constituency update {i}")["id"])
+    return ids
+
+
+async def poll_window(service: SocialIngestService, engine) -> int:
+    """Previous behaviour: last 24h per topic, username lookup + latest tweets per handle"""
+    fetched = 0
+    for topic in GOVERNANCE_TOPICS:
+        tweets = await twitter_service.search_tweets(governance_query(topic), max_results=100)
+        fetched += len(tweets)
+        await service.ingest_async(tweets, engine=engine)
+    for handle in HANDLES:
+        tweets = await twitter_service.get_user_tweets(handle, max_results=50)
+        fetched += len(tweets)
+        await service.ingest_async(tweets, engine=engine)
+    return fetched
+
+
+async def poll_checkpoints(service: SocialIngestService, engine) -> int:
+    stats = await service.poll_governance_topics(max_results=100 * len(GOVERNANCE_TOPICS), engine=engine)
+    fetched = stats.received
+    for handle in HANDLES:
+        fetched += (await service.poll_handle(handle, max_results=50, engine=engine)).received
+    return fetched
+
+
+async def replay(mode: str, base_url: str, fake: FakeTwitter, engine, args, rng: random.Random):
+    service = SocialIngestService()
+    calls = fetched = 0
+    expected = set()
+    async with httpx.AsyncClient() as client:
+        twitter_service.client = TwitterAPI("bench", base_url=f"{base_url}/2", client=client)
+        for poll in range(args.polls):
+            if poll:
+                expected |= add_new(fake, args.new_per_topic, args.new_per_handle, rng, poll)
+            requests_before = fake.requests
+            count = await (poll_window if mode == "window" else poll_checkpoints)(service, engine)
+            # The first poll is the cold start; count the steady state
+            if poll:
+                calls += fake.requests - requests_before
+                fetched += count
+    return calls, fetched, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--polls", type=int, default=10)
+    parser.add_argument("--history-per-topic", type=int, default=150)
+    parser.add_argument("--history-per-handle", type=int, default=60)
+    parser.add_argument("--new-per-topic", type=int, default=5)
+    parser.add_argument("--new-per-handle", type=int, default=2)
+    args = parser.parse_args()
+
+    engine = make_engine()
+    SessionFactory = make_session_factory(engine)
+    steady = args.polls - 1
+    for mode in ("window", "checkpoint"):
+        reset_schema(engine, TABLES)
+        rng = random.Random(21)
+        fake = FakeTwitter()
+        seed_fake(fake, args.history_per_topic, args.history_per_handle, rng)
+        with StubServer(stub_twitter_app(fake)) as server:
+            calls, fetched, expected = asyncio.run(replay(mode, server.base_url, fake, engine, args, rng))
+
+        db = SessionFactory()
+        stored = set(db.scalars(select(SocialPost.platform_id)))
+        db.close()
+        missed = len(expected - stored)
+        print(
+            f"{mode}: {steady} steady-state polls, {calls} API calls ({calls / steady:.1f}/poll), "
+            f"{fetched} tweets fetched ({fetched / steady:.1f}/poll), {missed} of {len(expected)} new tweets missed"
+        )
+
+
+if __name__ == "__main__":
+    main()